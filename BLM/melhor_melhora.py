@@ -1,10 +1,35 @@
+import argparse
 import os
-import random
+import sys
 import time
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Alignment, Font
-from openpyxl.utils import get_column_letter
-from collections import defaultdict
+from contextlib import nullcontext
+
+# permite rodar "python BLM/melhor_melhora.py" a partir de qualquer pasta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from busca_local import (  # noqa: E402
+    BLM,
+    abrir_experimento,
+    derivar_semente,
+    especificacoes_grade,
+    executar_grade,
+    filtrar_pendentes,
+    garantir_suite,
+    salvar_experimento,
+    separar_rastro,
+)
+from busca_local.instancias import CAMINHO_SUITE_PADRAO  # noqa: E402
+from busca_local.resultados import ArquivoResultados, GravadorResultados  # noqa: E402
+from busca_local.colunar import ARROW_DISPONIVEL, exportar_arrow  # noqa: E402
+from busca_local.cubo import CAMPOS_CUBO, CATEGORIAS_CUBO, calcular_cubo, exportar_cubo  # noqa: E402
+from busca_local.parada import contar_motivos, descrever_parada  # noqa: E402
+from busca_local.exportacao import (  # noqa: E402
+    colunas_resultados,
+    estatisticas,
+    exportar_txt,
+    exportar_xlsx,
+    medias_por,
+)
 
 # ============================================================
 # BLM = Busca Local Monótona (Best Improvement / Melhor Melhora)
@@ -12,351 +37,194 @@ from collections import defaultdict
 # Objetivo: minimizar makespan (maior carga entre as máquinas)
 # Parada: 1000 iterações sem melhorar o BEST-SO-FAR
 #
+# A heurística em si está em busca_local/blm.py; aqui fica só
+# a grade do experimento e as exportações.
+#
 # Saídas geradas em: BLM\Resultados\
-#   - resultados_blm.txt
-#   - resultados_blm.xlsx (com 2 abas: resultados + resumo)
+#   - resultados_blm_<id>.jsonl (gravado execução a execução, à prova de queda)
+#   - resultados_blm_<id>.txt
+#   - resultados_blm_<id>.xlsx (com 2 abas: resultados + resumo)
+#   - resultados_blm_<id>.arrow (colunar, lido pelo dashboard; requer pyarrow)
+#   - resultados_blm_<id>.cubo.json (agregados por m, n, parametro; usados pelo dashboard)
+#   - resultados_blm_<id>.meta.json (semente e suíte, para --retomar)
+#   - resultados_blm_<id>.rastro.jsonl (convergência de cada execução; só com rastrear = True)
+#
+# <id> é o timestamp do início ou o valor de --experimento.
 # ============================================================
 
 
-def construir_solucao_inicial(n, m, tempos):
-    """Gera solução inicial aleatória e cargas por máquina."""
-    sol = [random.randrange(m) for _ in range(n)]
-    cargas = [0] * m
-    for i, maq in enumerate(sol):
-        cargas[maq] += tempos[i]
-    return sol, cargas
-
-
-def makespan(cargas):
-    """Retorna o maior tempo (carga) dentre as máquinas."""
-    return max(cargas)
-
-
-# ===== Otimização (igual ao BLNM): top3 para calcular makespan do vizinho rápido =====
-
-def top3_cargas(cargas):
-    """Retorna até os 3 maiores pares (carga, idx_maquina) em ordem decrescente."""
-    pares = [(c, i) for i, c in enumerate(cargas)]
-    pares.sort(reverse=True)
-    return pares[:3]
-
-
-def maior_excluindo(top3, a, b):
-    """Maior carga excluindo máquinas a e b, olhando apenas o top3."""
-    for c, i in top3:
-        if i != a and i != b:
-            return c
-    return 0
-
-
-def avaliar_melhor_melhora(sol, cargas, tempos, m):
-    """
-    Varre toda a vizinhança "mover 1 tarefa de máquina"
-    e retorna o melhor movimento que MELHORA o makespan.
-
-    Otimização:
-    novo makespan = max(nova_carga_origem, nova_carga_dest, maior_carga_das_outras)
-    onde "maior_carga_das_outras" vem do top3 (sem loop em m para cada vizinho).
-    """
-    valor_atual = makespan(cargas)
-    n = len(tempos)
-
-    melhor_valor = valor_atual
-    melhor_tarefa = None
-    melhor_origem = None
-    melhor_destino = None
-
-    t3 = top3_cargas(cargas)
-
-    for tarefa in range(n):
-        origem = sol[tarefa]
-        p = tempos[tarefa]
-
-        for destino in range(m):
-            if destino == origem:
-                continue
-
-            nova_origem = cargas[origem] - p
-            nova_dest = cargas[destino] + p
-
-            outras = maior_excluindo(t3, origem, destino)
-            novo_ms = max(nova_origem, nova_dest, outras)
-
-            if novo_ms < melhor_valor:
-                melhor_valor = novo_ms
-                melhor_tarefa = tarefa
-                melhor_origem = origem
-                melhor_destino = destino
-
-    return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
-
-
-def blm_melhor_melhora(tempos, m, max_sem_melhora=1000):
-    """
-    Executa a Busca Local Monótona (Best Improvement):
-    - Aplica sempre o melhor movimento que melhora.
-    - Para após 1000 iterações sem melhorar o best-so-far.
-    """
-    n = len(tempos)
-    sol, cargas = construir_solucao_inicial(n, m, tempos)
-
-    best = makespan(cargas)
-    sem_melhora = 0
-    it = 0
-    inicio = time.time()
-
-    while sem_melhora < max_sem_melhora:
-        it += 1
-
-        tarefa, origem, destino, novo_valor = avaliar_melhor_melhora(sol, cargas, tempos, m)
-
-        if tarefa is not None:
-            p = tempos[tarefa]
-            sol[tarefa] = destino
-            cargas[origem] -= p
-            cargas[destino] += p
-
-            best = novo_valor
-            sem_melhora = 0
-        else:
-            sem_melhora += 1
-
-    tempo_exec = time.time() - inicio
-    return best, it, tempo_exec
-
-
-# ===== Exportações (TXT + XLSX) =====
-
-def exportar_txt(caminho, linhas):
-    """Exporta no formato CSV-like (TXT) exigido."""
-    with open(caminho, "w", encoding="utf-8") as f:
-        f.write("heuristica,n,m,replicacao,tempo,iteracoes,valor,parametro\n")
-        for heur, n, m, rep, tempo, it, val, param in linhas:
-            f.write(f"{heur},{n},{m},{rep},{tempo:.4f},{it},{val},{param}\n")
-
-
-def formatar_tempo_min_seg(segundos):
-    """Converte segundos (float) para string 'Xm Ys'."""
-    total = int(round(segundos))
-    mm = total // 60
-    ss = total % 60
-    return f"{mm}m {ss}s"
-
-
-def estilizar_cabecalho(ws, num_cols):
-    """Cabeçalho cinza claro, negrito, centralizado e congelado."""
-    cinza_claro = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    fonte = Font(bold=True)
-    alinhamento = Alignment(horizontal="center", vertical="center")
-
-    ws.freeze_panes = "A2"
-
-    for col in range(1, num_cols + 1):
-        cell = ws.cell(row=1, column=col)
-        cell.fill = cinza_claro
-        cell.font = fonte
-        cell.alignment = alinhamento
-
-    ws.auto_filter.ref = ws.dimensions
-
-
-def ajustar_largura_colunas(ws):
-    """Ajusta largura das colunas com base no maior conteúdo."""
-    for col_idx in range(1, ws.max_column + 1):
-        col_letter = get_column_letter(col_idx)
-        max_len = 0
-
-        for row_idx in range(1, ws.max_row + 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            value = cell.value
-            if value is None:
-                continue
-            max_len = max(max_len, len(str(value)))
-
-        ws.column_dimensions[col_letter].width = min(max_len + 2, 35)
-
-
-def criar_aba_resumo(wb, linhas, tempo_total_script, config):
-    """
-    Aba resumo:
-    - tempo total (m/s + segundos)
-    - contagens e parâmetros do experimento
-    - estatísticas rápidas
-    - médias por (m,n)
-    """
-    ws = wb.create_sheet("resumo")
-
-    titulo_font = Font(bold=True, size=13)
-    key_font = Font(bold=True)
-    cinza_claro = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    center = Alignment(horizontal="center", vertical="center")
-
-    ws["A1"] = "Resumo de Execução - BLM (Melhor Melhora)"
-    ws["A1"].font = titulo_font
-    ws.merge_cells("A1:D1")
-    ws["A1"].alignment = center
-
-    ws["A2"] = "Item"
-    ws["B2"] = "Valor"
-    ws["A2"].font = key_font
-    ws["B2"].font = key_font
-    ws["A2"].fill = cinza_claro
-    ws["B2"].fill = cinza_claro
-    ws["A2"].alignment = center
-    ws["B2"].alignment = center
-
-    total_registros = len(linhas)
-    tempos = [t for (_, _, _, _, t, _, _, _) in linhas]
-    iteracoes = [it for (_, _, _, _, _, it, _, _) in linhas]
-    valores = [v for (_, _, _, _, _, _, v, _) in linhas]
-
-    ws.append(["Tempo total do script", formatar_tempo_min_seg(tempo_total_script)])
-    ws.append(["Tempo total do script (s)", f"{tempo_total_script:.2f}"])
-
-    ws.append(["Total de registros", total_registros])
-    ws.append(["Registros esperados", config["esperado_registros"]])
-    ws.append(["m utilizados", str(config["maquinas"])])
-    ws.append(["r utilizados (n = m*r)", str(config["rs"])])
-    ws.append(["Repetições", config["repeticoes"]])
-    ws.append(["Parada (sem melhora)", config["max_sem_melhora"]])
-    ws.append(["Parâmetro (BLM)", "NA"])
-
-    ws.append(["Tempo médio por execução (s)", f"{(sum(tempos) / total_registros):.4f}"])
-    ws.append(["Tempo mínimo por execução (s)", f"{min(tempos):.4f}"])
-    ws.append(["Tempo máximo por execução (s)", f"{max(tempos):.4f}"])
-
-    ws.append(["Iterações médias", int(sum(iteracoes) / total_registros)])
-    ws.append(["Iterações mínimas", min(iteracoes)])
-    ws.append(["Iterações máximas", max(iteracoes)])
-
-    ws.append(["Melhor valor (menor makespan)", min(valores)])
-    ws.append(["Pior valor (maior makespan)", max(valores)])
-
-    for row in range(3, ws.max_row + 1):
-        ws.cell(row=row, column=1).font = key_font
-
-    # Seção: médias por instância (m,n)
-    ws["A20"] = "Médias por instância (m,n)"
-    ws["A20"].font = titulo_font
-    ws.merge_cells("A20:D20")
-    ws["A20"].alignment = center
-
-    ws.append(["m", "n", "valor médio", "tempo médio (s)"])
-    header_row = ws.max_row
-    for col in range(1, 5):
-        c = ws.cell(row=header_row, column=col)
-        c.fill = cinza_claro
-        c.font = key_font
-        c.alignment = center
-
-    por_inst = defaultdict(lambda: {"val": 0, "tempo": 0, "count": 0})
-    for (_, n, m, _, tempo, _, val, _) in linhas:
-        por_inst[(m, n)]["val"] += val
-        por_inst[(m, n)]["tempo"] += tempo
-        por_inst[(m, n)]["count"] += 1
-
-    for (m, n) in sorted(por_inst.keys()):
-        c = por_inst[(m, n)]["count"]
-        ws.append([
-            m,
-            n,
-            por_inst[(m, n)]["val"] / c,
-            por_inst[(m, n)]["tempo"] / c
-        ])
-
-    ajustar_largura_colunas(ws)
-
-
-def exportar_xlsx(caminho, linhas, tempo_total_script, config):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "resultados"
-
-    headers = ["heuristica", "n", "m", "replicacao", "tempo", "iteracoes", "valor", "parametro"]
-    ws.append(headers)
-
-    for heur, n, m, rep, tempo, it, val, param in linhas:
-        ws.append([heur, int(n), int(m), int(rep), float(tempo), int(it), int(val), param])
-
-    estilizar_cabecalho(ws, num_cols=len(headers))
-
-    for row in range(2, ws.max_row + 1):
-        ws.cell(row=row, column=5).number_format = "0.0000"  # tempo
-
-    ajustar_largura_colunas(ws)
-
-    criar_aba_resumo(wb, linhas, tempo_total_script, config)
-
-    wb.save(caminho)
-
+def montar_resumo(linhas, config):
+    """Conteúdo da aba resumo do BLM: configuração + médias por instância (m,n)."""
+    est = estatisticas(linhas, ["iteracoes_efetivas"])
+
+    por_inst = medias_por(linhas, ["m", "n"], ["valor", "tempo"])
+
+    return {
+        "titulo": "Resumo de Execução - BLM (Melhor Melhora)",
+        "esperado_registros": config["esperado_registros"],
+        "itens": [
+            ("m utilizados", str(config["maquinas"])),
+            ("r utilizados (n = m*r)", str(config["rs"])),
+            ("Repetições", config["repeticoes"]),
+            ("Parada (sem melhora)", config["max_sem_melhora"]),
+            ("Vizinhança", config["vizinhanca"]),
+            ("Estratégia de melhora", config["estrategia"]),
+            ("Armazenamento", config["armazenamento"]),
+            ("Construção inicial", config["construcao"]),
+            ("Parada (critérios extras)", config["parada"]),
+            ("Parâmetro (BLM)", "NA"),
+            ("Semente base", str(config["semente"])),
+            ("Suíte de instâncias", config["instancias"]),
+            ("Semente da suíte", str(config["semente_suite"])),
+        ],
+        "itens_estatisticas": [
+            ("Iterações efetivas médias", int(est["iteracoes_efetivas"]["soma"] / est["registros"])),
+            ("Motivos de parada", contar_motivos(linhas)),
+        ],
+        "secao": (
+            "Médias por instância (m,n)",
+            ["m", "n", "valor médio", "tempo médio (s)"],
+            [(m, n, med["valor"], med["tempo"]) for (m, n), med in por_inst],
+        ),
+    }
 
-def main():
-    random.seed()
 
+def main(workers=None, semente=None, instancias=None, experimento=None, retomar=False):
     inicio_script = time.time()
 
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     OUT_DIR = os.path.join(BASE_DIR, "Resultados")
     os.makedirs(OUT_DIR, exist_ok=True)
-    
-    timestamp = time.strftime("%d-%m-%Y_%H-%M-%S")
 
-    TXT_PATH = os.path.join(OUT_DIR, f"resultados_blm_{timestamp}.txt")
-    XLSX_PATH = os.path.join(OUT_DIR, f"resultados_blm_{timestamp}.xlsx")
+    # ao retomar, semente e suíte vêm dos metadados do experimento
+    exp = abrir_experimento(OUT_DIR, "resultados_blm", experimento, retomar, semente, instancias)
+    semente = exp["semente"]
+    instancias = os.path.abspath(exp["instancias"] or CAMINHO_SUITE_PADRAO)
+    exp["instancias"] = instancias
+
+    JSONL_PATH = exp["jsonl"]
+    TXT_PATH = exp["txt"]
+    XLSX_PATH = exp["xlsx"]
+    ARROW_PATH = exp["arrow"]
+    CUBO_PATH = exp["cubo"]
+    RASTRO_PATH = exp["rastro"]
 
     maquinas = [10, 20, 50]
     rs = [1.5, 2.0]  # n = m * r
     repeticoes = 10
     max_sem_melhora = 1000
-    parametro = "NA"
-
-    linhas = []
-
-    total = len(maquinas) * len(rs) * repeticoes
-    done = 0
-
-    for m in maquinas:
-        for r in rs:
-            n = int(m * r)
-
-            for rep in range(1, repeticoes + 1):
-                tempos = [random.randint(1, 100) for _ in range(n)]
-
-                valor, it, tempo_exec = blm_melhor_melhora(
-                    tempos, m, max_sem_melhora=max_sem_melhora
-                )
-
-                linhas.append((
-                    "blm_melhor_melhora",
-                    n, m, rep,
-                    tempo_exec,
-                    it,
-                    valor,
-                    parametro
-                ))
-
-                done += 1
-                if done % 10 == 0 or done == total:
-                    print(f"[BLM] {done}/{total} (parcial)")
-
-    tempo_total_script = time.time() - inicio_script
-
-    exportar_txt(TXT_PATH, linhas)
+    avaliador = "python"  # "numpy": vetorizado (mesmos movimentos); "critica": só máquinas críticas
+    vizinhanca = "mover"  # "trocar": troca 2 tarefas; "mover+trocar": o melhor dos dois
+    estrategia = "melhor"  # "primeira": primeira melhora (ignora avaliador; só com vizinhanca "mover")
+    ordem = "aleatoria"  # ordem de varredura da primeira melhora: "aleatoria" ou "rotativa"
+    rastrear = False  # True: grava (iteração, tempo, best) a cada melhora em .rastro.jsonl
+    armazenamento = "listas"  # "arrays": arrays tipados p/ instâncias grandes (só "mover" + "melhor"; use "critica")
+    construcao = "aleatoria"  # solução inicial: "lista", "lpt" (maior tempo primeiro) ou "grasp" (LPT randomizado)
+    rcl = 0.3  # só "grasp": máquinas com carga <= menor + rcl * (maior - menor) entram na lista restrita
+    # critérios de parada extras (combinados com max_sem_melhora: para no primeiro que disparar)
+    parar_no_limite = False  # True: para ao atingir o limite inferior (ótimo provado)
+    alvo = None  # makespan alvo: para quando best <= alvo
+    tempo_maximo = None  # orçamento de relógio por execução (s)
+    tempo_cpu_maximo = None  # orçamento de CPU por execução (s)
+
+    params = {"max_sem_melhora": max_sem_melhora, "avaliador": avaliador, "vizinhanca": vizinhanca,
+              "estrategia": estrategia, "ordem": ordem, "rastrear": rastrear, "armazenamento": armazenamento,
+              "construcao": construcao, "rcl": rcl,
+              "parar_no_limite": parar_no_limite, "alvo": alvo, "tempo_maximo": tempo_maximo,
+              "tempo_cpu_maximo": tempo_cpu_maximo}
+
+    # Instâncias lidas da suíte compartilhada com o BLNM (mesmos IDs)
+    especificacoes = especificacoes_grade(maquinas, rs, repeticoes)
+    suite, ids = garantir_suite(instancias, especificacoes)
+
+    jobs = []
+    for (n, m, rep), id_inst in zip(especificacoes, ids):
+        semente_job = derivar_semente(semente, n, m, rep)
+        jobs.append((BLM.nome, (instancias, id_inst), rep, params, semente_job))
+
+    total = len(jobs)
+    pendentes = filtrar_pendentes(jobs, JSONL_PATH)
+    done = total - len(pendentes)
+    if done:
+        print(f"[BLM] retomando {exp['id']}: {done}/{total} já concluídas")
+
+    salvar_experimento(exp, exp["tempo_anterior"])
+
+    # cada resultado vai para o JSONL assim que chega; os relatórios
+    # abaixo são gerados relendo o arquivo, sem acumular linhas em memória
+    # o rastro vai antes da linha: se cair entre os dois, a execução roda de
+    # novo ao retomar e o rastro repetido é descartado na leitura
+    with (GravadorResultados(JSONL_PATH) as gravador,
+          GravadorResultados(RASTRO_PATH) if rastrear else nullcontext() as gravador_rastro):
+        for linha in executar_grade(pendentes, workers):
+            rastro = separar_rastro(linha)
+            if rastro is not None:
+                gravador_rastro.gravar(rastro)
+            gravador.gravar(linha)
+
+            done += 1
+            if done % 10 == 0 or done == total:
+                print(f"[BLM] {done}/{total} (parcial)")
+
+    tempo_total_script = exp["tempo_anterior"] + (time.time() - inicio_script)
+    salvar_experimento(exp, tempo_total_script)
+
+    linhas = ArquivoResultados(JSONL_PATH)
+
+    colunas = colunas_resultados(BLM)
+    exportar_txt(TXT_PATH, linhas, colunas)
 
     config = {
         "maquinas": maquinas,
         "rs": rs,
         "repeticoes": repeticoes,
         "max_sem_melhora": max_sem_melhora,
-        "esperado_registros": total
+        "vizinhanca": vizinhanca,
+        "estrategia": estrategia if estrategia == "melhor" else f"{estrategia} ({ordem})",
+        "armazenamento": armazenamento,
+        "construcao": construcao if construcao != "grasp" else f"grasp (rcl = {rcl})",
+        "parada": descrever_parada(params),
+        "esperado_registros": total,
+        "semente": semente,
+        "instancias": os.path.basename(instancias),
+        "semente_suite": suite.semente
     }
 
-    exportar_xlsx(XLSX_PATH, linhas, tempo_total_script, config)
+    resumo = montar_resumo(linhas, config)
+    exportar_xlsx(XLSX_PATH, linhas, colunas, tempo_total_script, resumo)
+
+    campos_cubo = CAMPOS_CUBO + [c for c in BLM.colunas_extras if c not in CATEGORIAS_CUBO]  # inclui a instrumentação
+    exportar_cubo(CUBO_PATH, calcular_cubo(linhas, campos_cubo, CATEGORIAS_CUBO), tempo_total_script,
+                  campos_cubo, CATEGORIAS_CUBO)
+
+    gerados = [JSONL_PATH, TXT_PATH, XLSX_PATH, CUBO_PATH]
+    if rastrear:
+        gerados.append(RASTRO_PATH)
+    if ARROW_DISPONIVEL:
+        exportar_arrow(ARROW_PATH, linhas, colunas, tempo_total_script, resumo)
+        gerados.append(ARROW_PATH)
 
-    print(f"\nGerado:\n- {TXT_PATH}\n- {XLSX_PATH}")
-    print(f"Total de registros (esperado {total}): {len(linhas)}")
+    print("\nGerado:\n" + "\n".join(f"- {p}" for p in gerados))
+    print(f"Total de registros (esperado {total}): {done}")
     print(f"Tempo total do script: {tempo_total_script:.2f}s")
+    print(f"Semente base: {semente}")
+    print(f"Experimento: {exp['id']} (retome com --experimento {exp['id']} --retomar)")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Experimentos BLM (Melhor Melhora)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos em paralelo (padrão: número de CPUs; 1 = serial)")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="semente base para reproduzir um experimento (padrão: aleatória)")
+    parser.add_argument("--instancias", default=None,
+                        help="arquivo da suíte de instâncias (padrão: Instancias/suite_padrao.bin, "
+                             "gerado na primeira execução)")
+    parser.add_argument("--experimento", default=None,
+                        help="ID do experimento, usado nos nomes dos arquivos (padrão: timestamp)")
+    parser.add_argument("--retomar", action="store_true",
+                        help="continua o experimento --experimento, rodando só as execuções que faltam")
+    args = parser.parse_args()
+
+    main(workers=args.workers, semente=args.semente, instancias=args.instancias,
+         experimento=args.experimento, retomar=args.retomar)
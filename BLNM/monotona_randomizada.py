@@ -1,10 +1,39 @@
+import argparse
 import os
 import random
+import sys
 import time
-from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Alignment, Font
-from collections import defaultdict
-from openpyxl.utils import get_column_letter
+from contextlib import nullcontext
+
+# permite rodar "python BLNM/monotona_randomizada.py" a partir de qualquer pasta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from busca_local import (  # noqa: E402
+    BLNM,
+    Corrida,
+    abrir_experimento,
+    chave_job,
+    chave_resultado,
+    construir_solucao_inicial,
+    derivar_semente,
+    especificacoes_grade,
+    executar_grade,
+    garantir_suite,
+    ler_resultados,
+    salvar_experimento,
+    separar_rastro,
+)
+from busca_local.instancias import CAMINHO_SUITE_PADRAO  # noqa: E402
+from busca_local.resultados import ArquivoResultados, GravadorResultados  # noqa: E402
+from busca_local.colunar import ARROW_DISPONIVEL, exportar_arrow  # noqa: E402
+from busca_local.cubo import CAMPOS_CUBO, CATEGORIAS_CUBO, calcular_cubo, exportar_cubo  # noqa: E402
+from busca_local.parada import contar_motivos, descrever_parada  # noqa: E402
+from busca_local.exportacao import (  # noqa: E402
+    colunas_resultados,
+    exportar_txt,
+    exportar_xlsx,
+    medias_por,
+)
 
 # ============================================================
 # BLNM = Busca Local Monótona Randomizada
@@ -14,369 +43,234 @@ from openpyxl.utils import get_column_letter
 # Monotonia: medida pelo BEST-SO-FAR (melhor valor encontrado)
 # Parada: 1000 iterações sem melhorar o best-so-far
 #
+# A heurística em si está em busca_local/blnm.py; aqui fica só
+# a grade do experimento e as exportações.
+#
+# Varredura "corrida": em vez de rodar os 9 alphas em todas as
+# instâncias, cada replicação é uma rodada (todas as instâncias daquela
+# replicação) e, ao fim dela, a corrida (busca_local/corrida.py) descarta
+# os alphas perdedores; as rodadas seguintes só rodam os vivos. As
+# execuções feitas são as mesmas da varredura completa (mesmas sementes),
+# e quem saiu em que rodada vai para o .meta.json e para o resumo.
+#
+# alpha_adaptativo: acrescenta, por instância, uma execução em que o
+# alpha muda durante a busca (busca_local/adaptacao.py), com parametro
+# "adaptativo"; com alphas = [] só ela roda (1 execução no lugar de 9).
+# O dashboard compara essa execução com os alphas fixos da mesma grade.
+#
 # Saídas geradas em: BLNM\Resultados\
-#   - resultados_blnm.txt
-#   - resultados_blnm.xlsx (com 2 abas: resultados + resumo)
+#   - resultados_blnm_<id>.jsonl (gravado execução a execução, à prova de queda)
+#   - resultados_blnm_<id>.txt
+#   - resultados_blnm_<id>.xlsx (com 2 abas: resultados + resumo)
+#   - resultados_blnm_<id>.arrow (colunar, lido pelo dashboard; requer pyarrow)
+#   - resultados_blnm_<id>.cubo.json (agregados por m, n, parametro; usados pelo dashboard)
+#   - resultados_blnm_<id>.meta.json (semente e suíte, para --retomar)
+#   - resultados_blnm_<id>.rastro.jsonl (convergência de cada execução; só com rastrear = True)
+#
+# <id> é o timestamp do início ou o valor de --experimento.
 # ============================================================
 
 
-def construir_solucao_inicial(n, m, tempos):
-    """Solução inicial aleatória + cargas."""
-    sol = [random.randrange(m) for _ in range(n)]
-    cargas = [0] * m
-    for i, maq in enumerate(sol):
-        cargas[maq] += tempos[i]
-    return sol, cargas
-
-
-def makespan(cargas):
-    return max(cargas)
-
-
-def passo_aleatorio(sol, cargas, tempos, m):
-    """Move uma tarefa para outra máquina aleatória e atualiza cargas."""
-    n = len(sol)
-    tarefa = random.randrange(n)
-    origem = sol[tarefa]
-
-    destino = random.randrange(m)
-    while destino == origem:
-        destino = random.randrange(m)
-
-    p = tempos[tarefa]
-    sol[tarefa] = destino
-    cargas[origem] -= p
-    cargas[destino] += p
-
-
-def top3_cargas(cargas):
-    """
-    Retorna uma lista com até os 3 maiores pares (carga, idx_maquina),
-    em ordem decrescente.
-    """
-    pares = [(c, i) for i, c in enumerate(cargas)]
-    pares.sort(reverse=True)
-    return pares[:3]
-
-
-def maior_excluindo(top3, a, b):
-    """
-    Retorna a maior carga entre as máquinas, excluindo a e b, usando apenas o top3.
-    """
-    for c, i in top3:
-        if i != a and i != b:
-            return c
-    return 0
-
-
-def avaliar_melhor_melhora(sol, cargas, tempos, m):
-    """
-    Best improvement (melhor melhora) em toda a vizinhança.
-
-    Otimização:
-    novo makespan = max(nova_carga_origem, nova_carga_destino, maior_carga_das_outras)
-    onde "maior_carga_das_outras" é obtida por top3, evitando loop em m.
-    """
-    valor_atual = makespan(cargas)
-    n = len(tempos)
-
-    melhor_valor = valor_atual
-    melhor_tarefa = None
-    melhor_origem = None
-    melhor_destino = None
-
-    t3 = top3_cargas(cargas)
-
-    for tarefa in range(n):
-        origem = sol[tarefa]
-        p = tempos[tarefa]
-
-        for destino in range(m):
-            if destino == origem:
-                continue
-
-            nova_origem = cargas[origem] - p
-            nova_dest = cargas[destino] + p
-
-            outras = maior_excluindo(t3, origem, destino)
-            novo_ms = max(nova_origem, nova_dest, outras)
-
-            if novo_ms < melhor_valor:
-                melhor_valor = novo_ms
-                melhor_tarefa = tarefa
-                melhor_origem = origem
-                melhor_destino = destino
-
-    return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
-
-
-def blnm_monotona_randomizada(tempos, m, alpha, max_sem_melhora=1000):
-    """
-    Busca Local Monótona Randomizada:
-    - alpha: frequência de caminhada aleatória
-    - best-so-far é o que conta para o contador sem melhora
-    """
-    n = len(tempos)
-    sol, cargas = construir_solucao_inicial(n, m, tempos)
-
-    best = makespan(cargas)
-    sem_melhora = 0
-    it = 0
-    inicio = time.time()
-
-    while sem_melhora < max_sem_melhora:
-        it += 1
-
-        if random.random() < alpha:
-            passo_aleatorio(sol, cargas, tempos, m)
-            valor_atual = makespan(cargas)
-        else:
-            tarefa, origem, destino, novo_valor = avaliar_melhor_melhora(sol, cargas, tempos, m)
-
-            if tarefa is not None:
-                p = tempos[tarefa]
-                sol[tarefa] = destino
-                cargas[origem] -= p
-                cargas[destino] += p
-                valor_atual = novo_valor
-            else:
-                valor_atual = best
-
-        if valor_atual < best:
-            best = valor_atual
-            sem_melhora = 0
-        else:
-            sem_melhora += 1
-
-    tempo_exec = time.time() - inicio
-    return best, it, tempo_exec
-
-
-def exportar_txt(caminho, linhas):
-    with open(caminho, "w", encoding="utf-8") as f:
-        f.write("heuristica,n,m,replicacao,tempo,iteracoes,valor,parametro\n")
-        for heur, n, m, rep, tempo, it, val, alpha in linhas:
-            f.write(f"{heur},{n},{m},{rep},{tempo:.4f},{it},{val},{alpha:.1f}\n")
-
-
-def formatar_tempo_min_seg(segundos):
-    """Converte segundos (float) para string 'Xm Ys'."""
-    total = int(round(segundos))
-    m = total // 60
-    s = total % 60
-    return f"{m}m {s}s"
-
-
-def estilizar_cabecalho(ws, num_cols):
-    """Cabeçalho cinza claro, negrito, centralizado e congelado."""
-    cinza_claro = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    fonte = Font(bold=True)
-    alinhamento = Alignment(horizontal="center", vertical="center")
-
-    ws.freeze_panes = "A2"
-
-    for col in range(1, num_cols + 1):
-        cell = ws.cell(row=1, column=col)
-        cell.fill = cinza_claro
-        cell.font = fonte
-        cell.alignment = alinhamento
-
-    ws.auto_filter.ref = ws.dimensions
-
+def montar_resumo(linhas, config):
+    """Conteúdo da aba resumo do BLNM: configuração + médias por alpha (e do alpha adaptativo)."""
+    campos = ["valor", "tempo", "iteracoes", "passos_aleatorios"]
+    por_alpha = medias_por((linha for linha in linhas if linha["parametro"] != "adaptativo"), ["parametro"], campos)
+    adaptativo = medias_por((linha for linha in linhas if linha["parametro"] == "adaptativo"), [], campos)
+
+    return {
+        "titulo": "Resumo de Execução - BLNM (Monótona Randomizada)",
+        "esperado_registros": config["esperado_registros"],
+        "itens": [
+            ("m utilizados", str(config["maquinas"])),
+            ("r utilizados (n = m*r)", str(config["rs"])),
+            ("Repetições", config["repeticoes"]),
+            ("Alphas", str(config["alphas"])),
+            ("Parada (sem melhora)", config["max_sem_melhora"]),
+            ("Vizinhança", config["vizinhanca"]),
+            ("Estratégia de melhora", config["estrategia"]),
+            ("Motor", config["motor"]),
+            ("Armazenamento", config["armazenamento"]),
+            ("Construção inicial", config["construcao"]),
+            ("Parada (critérios extras)", config["parada"]),
+            ("Números aleatórios comuns", config["crn"]),
+            ("Varredura de alphas", config["varredura"]),
+            ("Alpha adaptativo", config["alpha_adaptativo"]),
+            ("Semente base", str(config["semente"])),
+            ("Suíte de instâncias", config["instancias"]),
+            ("Semente da suíte", str(config["semente_suite"])),
+        ],
+        "itens_estatisticas": [
+            ("Motivos de parada", contar_motivos(linhas)),
+            *config["itens_corrida"],
+        ],
+        "secao": (
+            "Médias por alpha (parametro)",
+            ["alpha", "valor médio", "tempo médio (s)", "iterações médias", "alpha efetivo"],
+            [(f"{a:.1f}", med["valor"], med["tempo"], int(med["iteracoes"]), med["passos_aleatorios"] / med["iteracoes"])
+             for (a,), med in por_alpha]
+            + [("adaptativo", med["valor"], med["tempo"], int(med["iteracoes"]),
+                med["passos_aleatorios"] / med["iteracoes"]) for _, med in adaptativo],
+        ),
+    }
 
-def ajustar_largura_colunas(ws):
-    """Ajusta largura das colunas com base no maior conteúdo."""
-    for col_idx in range(1, ws.max_column + 1):
-        col_letter = get_column_letter(col_idx)
-        max_len = 0
-
-        for row_idx in range(1, ws.max_row + 1):
-            cell = ws.cell(row=row_idx, column=col_idx)
-            value = cell.value
-            if value is None:
-                continue
-            max_len = max(max_len, len(str(value)))
-
-        ws.column_dimensions[col_letter].width = min(max_len + 2, 35)
-
-
-def criar_aba_resumo(wb, linhas, tempo_total_script, config):
-    """
-    Cria uma segunda aba 'resumo' com:
-    - tempo total do script
-    - contagens e parâmetros do experimento
-    - estatísticas rápidas
-    - médias por alpha (opcional e útil)
-    """
-    ws = wb.create_sheet("resumo")
-
-    # Estilo de título e chave/valor
-    titulo_font = Font(bold=True, size=13)
-    key_font = Font(bold=True)
-    cinza_claro = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-    center = Alignment(horizontal="center", vertical="center")
-
-    # Título
-    ws["A1"] = "Resumo de Execução - BLNM (Monótona Randomizada)"
-    ws["A1"].font = titulo_font
-    ws.merge_cells("A1:D1") 
-    ws["A1"].alignment = Alignment(horizontal="center", vertical="center")
-
-    # Linha 2 como “cabeçalho” da seção
-    ws["A2"] = "Item"
-    ws["B2"] = "Valor"
-    ws["A2"].font = key_font
-    ws["B2"].font = key_font
-    ws["A2"].fill = cinza_claro
-    ws["B2"].fill = cinza_claro
-    ws["A2"].alignment = center
-    ws["B2"].alignment = center
-
-    # Dados básicos
-    total_registros = len(linhas)
-    tempos = [t for (_, _, _, _, t, _, _, _) in linhas]
-    iteracoes = [it for (_, _, _, _, _, it, _, _) in linhas]
-    valores = [v for (_, _, _, _, _, _, v, _) in linhas]
-
-    ws.append(["Tempo total do script", formatar_tempo_min_seg(tempo_total_script)])
-    ws.append(["Tempo total do script (s)", f"{tempo_total_script:.2f}"])
-
-    ws.append(["Total de registros", total_registros])
-    ws.append(["Registros esperados", config["esperado_registros"]])
-    ws.append(["m utilizados", str(config["maquinas"])])
-    ws.append(["r utilizados (n = m*r)", str(config["rs"])])
-    ws.append(["Repetições", config["repeticoes"]])
-    ws.append(["Alphas", str(config["alphas"])])
-    ws.append(["Parada (sem melhora)", config["max_sem_melhora"]])
-
-    # Stats rápidas
-    ws.append(["Tempo médio por execução (s)", f"{(sum(tempos) / total_registros):.4f}"])
-    ws.append(["Tempo mínimo por execução (s)", f"{min(tempos):.4f}"])
-    ws.append(["Tempo máximo por execução (s)", f"{max(tempos):.4f}"])
-
-    ws.append(["Iterações médias", int(sum(iteracoes) / total_registros)])
-    ws.append(["Iterações mínimas", min(iteracoes)])
-    ws.append(["Iterações máximas", max(iteracoes)])
-
-    ws.append(["Melhor valor (menor makespan)", min(valores)])
-    ws.append(["Pior valor (maior makespan)", max(valores)])
-
-    # Ajusta estilo na coluna A (chaves)
-    for row in range(3, ws.max_row + 1):
-        ws.cell(row=row, column=1).font = key_font
-
-    # Seção extra: médias por alpha
-    ws["A20"] = "Médias por alpha (parametro)"
-    ws["A20"].font = titulo_font
-    ws.merge_cells("A20:D20")
-    ws["A20"].alignment = Alignment(horizontal="center", vertical="center")
-
-    ws.append(["alpha", "valor médio", "tempo médio (s)", "iterações médias"])
-    header_row = ws.max_row
-    for col in range(1, 5):
-        c = ws.cell(row=header_row, column=col)
-        c.fill = cinza_claro
-        c.font = key_font
-        c.alignment = center
-
-    por_alpha = defaultdict(lambda: {"val": 0, "tempo": 0, "it": 0, "count": 0})
-    for (_, _, _, _, tempo, it, val, alpha) in linhas:
-        a = round(float(alpha), 1)
-        por_alpha[a]["val"] += val
-        por_alpha[a]["tempo"] += tempo
-        por_alpha[a]["it"] += it
-        por_alpha[a]["count"] += 1
-
-    for a in sorted(por_alpha.keys()):
-        c = por_alpha[a]["count"]
-        ws.append([
-            f"{a:.1f}",
-            por_alpha[a]["val"] / c,
-            por_alpha[a]["tempo"] / c,
-            int(por_alpha[a]["it"] / c)
-        ])
-
-    ajustar_largura_colunas(ws)
-
-
-def exportar_xlsx(caminho, linhas, tempo_total_script, config):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "resultados"
-
-    headers = ["heuristica", "n", "m", "replicacao", "tempo", "iteracoes", "valor", "parametro"]
-    ws.append(headers)
-
-    for heur, n, m, rep, tempo, it, val, alpha in linhas:
-        ws.append([heur, int(n), int(m), int(rep), float(tempo), int(it), int(val), float(alpha)])
-
-    estilizar_cabecalho(ws, num_cols=len(headers))
-
-    for row in range(2, ws.max_row + 1):
-        ws.cell(row=row, column=5).number_format = "0.0000"  # tempo
-        ws.cell(row=row, column=8).number_format = "0.0"     # alpha
-
-    ajustar_largura_colunas(ws)
-
-    # Aba extra com resumo
-    criar_aba_resumo(wb, linhas, tempo_total_script, config)
-
-    wb.save(caminho)
-
-
-def main():
-    random.seed()
 
+def main(workers=None, semente=None, instancias=None, experimento=None, retomar=False):
     inicio_script = time.time()
 
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     OUT_DIR = os.path.join(BASE_DIR, "Resultados")
     os.makedirs(OUT_DIR, exist_ok=True)
-    
-    timestamp = time.strftime("%d-%m-%Y_%H-%M-%S")
-    
-    TXT_PATH = os.path.join(OUT_DIR, f"resultados_blnm_{timestamp}.txt")
-    XLSX_PATH = os.path.join(OUT_DIR, f"resultados_blnm_{timestamp}.xlsx")
-    
+
+    # ao retomar, semente e suíte vêm dos metadados do experimento
+    exp = abrir_experimento(OUT_DIR, "resultados_blnm", experimento, retomar, semente, instancias)
+    semente = exp["semente"]
+    instancias = os.path.abspath(exp["instancias"] or CAMINHO_SUITE_PADRAO)
+    exp["instancias"] = instancias
+
+    JSONL_PATH = exp["jsonl"]
+    TXT_PATH = exp["txt"]
+    XLSX_PATH = exp["xlsx"]
+    ARROW_PATH = exp["arrow"]
+    CUBO_PATH = exp["cubo"]
+    RASTRO_PATH = exp["rastro"]
+
     maquinas = [10, 20, 50]
     rs = [1.5, 2.0]
     repeticoes = 10
     alphas = [i / 10 for i in range(1, 10)]  # 0.1..0.9
     max_sem_melhora = 1000
-
-    linhas = []
-
-    total = len(maquinas) * len(rs) * repeticoes * len(alphas)
+    avaliador = "python"  # "numpy": vetorizado (mesmos movimentos); "critica": só máquinas críticas
+    vizinhanca = "mover"  # "trocar": troca 2 tarefas; "mover+trocar": o melhor dos dois
+    estrategia = "melhor"  # "primeira": primeira melhora (ignora avaliador; só com vizinhanca "mover")
+    ordem = "aleatoria"  # ordem de varredura da primeira melhora: "aleatoria" ou "rotativa"
+    motor = "escalar"  # "lote": execuções de mesmo (n, m) juntas em arrays NumPy (só "mover" + "melhor")
+    crn = False  # True: alphas de uma replicação com a mesma solução inicial e os mesmos sorteios
+    rastrear = False  # True: grava (iteração, tempo, best) a cada melhora em .rastro.jsonl
+    armazenamento = "listas"  # "arrays": arrays tipados p/ instâncias grandes (só "mover" + "melhor"; use "critica")
+    construcao = "aleatoria"  # solução inicial: "lista", "lpt" (maior tempo primeiro) ou "grasp" (LPT randomizado)
+    rcl = 0.3  # só "grasp": máquinas com carga <= menor + rcl * (maior - menor) entram na lista restrita
+    # critérios de parada extras (combinados com max_sem_melhora: para no primeiro que disparar)
+    parar_no_limite = False  # True: para ao atingir o limite inferior (ótimo provado)
+    alvo = None  # makespan alvo: para quando best <= alvo
+    tempo_maximo = None  # orçamento de relógio por execução (s); no motor "lote", a parcela da réplica
+    tempo_cpu_maximo = None  # orçamento de CPU por execução (s)
+    parada = {"parar_no_limite": parar_no_limite, "alvo": alvo, "tempo_maximo": tempo_maximo,
+              "tempo_cpu_maximo": tempo_cpu_maximo}
+    varredura = "completa"  # "corrida": descarta alphas perdedores a cada replicação (ver cabeçalho)
+    metodo_corrida = "halving"  # "friedman": F-race, só elimina com diferença significativa (economiza menos)
+    nivel_corrida = 0.05  # só "friedman": nível do teste
+    alpha_adaptativo = None  # "estagnacao" ou "bandit": + 1 execução por instância com alpha ajustado na busca
+    janela_alpha = 100  # iterações entre ajustes do alpha adaptativo
+
+    # Instâncias lidas da suíte compartilhada com o BLM (mesmos IDs):
+    # as 9 execuções (alphas) de uma replicação usam a mesma instância
+    especificacoes = especificacoes_grade(maquinas, rs, repeticoes)
+    suite, ids = garantir_suite(instancias, especificacoes)
+
+    jobs = []
+    for (n, m, rep), id_inst in zip(especificacoes, ids):
+        if crn:
+            # números aleatórios comuns: solução inicial calculada uma vez e
+            # mesma semente (logo, mesmos fluxos) para todos os alphas
+            semente_rep = derivar_semente(semente, n, m, rep)
+            sol_inicial, _ = construir_solucao_inicial(n, m, suite.tempos(id_inst, armazenamento == "arrays"),
+                                                       random.Random(derivar_semente(semente_rep, "inicial")),
+                                                       armazenamento, construcao, rcl)
+
+        # alpha None: a execução com alpha adaptativo da instância
+        for alpha in alphas + ([None] if alpha_adaptativo else []):
+            params = {"alpha": alpha, "max_sem_melhora": max_sem_melhora, "avaliador": avaliador,
+                      "vizinhanca": vizinhanca, "estrategia": estrategia, "ordem": ordem, "motor": motor,
+                      "rastrear": rastrear, "armazenamento": armazenamento, "construcao": construcao, "rcl": rcl,
+                      **parada}
+            if alpha is None:
+                params.update(alpha_adaptativo=alpha_adaptativo, janela_alpha=janela_alpha)
+            if crn:
+                params.update(crn=True, sol_inicial=sol_inicial)
+                semente_job = semente_rep
+            else:
+                semente_job = derivar_semente(semente, n, m, rep, "adaptativo" if alpha is None else f"{alpha:.1f}")
+            jobs.append((BLNM.nome, (instancias, id_inst), rep, params, semente_job))
+
+    total = len(jobs)
+    if varredura == "corrida":
+        if alpha_adaptativo:
+            raise ValueError("a varredura 'corrida' compara alphas fixos; use alpha_adaptativo com a 'completa'")
+        # uma rodada por replicação; os jobs de cada uma são filtrados pelos vivos na hora
+        corrida = Corrida(alphas, metodo_corrida, nivel_corrida)
+        rodadas = [[job for job in jobs if job[2] == rep] for rep in range(1, repeticoes + 1)]
+    elif varredura == "completa":
+        corrida = None
+        rodadas = [jobs]
+    else:
+        raise ValueError(f"varredura desconhecida: {varredura!r} (opções: completa, corrida)")
+
+    # valores já gravados: ao retomar, a corrida refaz as mesmas eliminações sem rodar de novo
+    valores = {}
+    if os.path.exists(JSONL_PATH):
+        valores = {chave_resultado(linha): linha["valor"] for linha in ler_resultados(JSONL_PATH)}
     done = 0
+    puladas = 0  # execuções da grade que a corrida dispensou (alpha já eliminado)
+    if valores:
+        print(f"[BLNM] retomando {exp['id']}: {len(valores)}/{total} já concluídas")
+
+    salvar_experimento(exp, exp["tempo_anterior"])
+
+    # cada resultado vai para o JSONL assim que chega; os relatórios
+    # abaixo são gerados relendo o arquivo, sem acumular linhas em memória
+    # o rastro vai antes da linha: se cair entre os dois, a execução roda de
+    # novo ao retomar e o rastro repetido é descartado na leitura
+    with (GravadorResultados(JSONL_PATH) as gravador,
+          GravadorResultados(RASTRO_PATH) if rastrear else nullcontext() as gravador_rastro):
+        for rodada, rodada_jobs in enumerate(rodadas, start=1):
+            if corrida is not None:
+                vivos = [job for job in rodada_jobs if job[3]["alpha"] in corrida.vivos]
+                puladas += len(rodada_jobs) - len(vivos)
+                rodada_jobs = vivos
+            chaves = [chave_job(job) for job in rodada_jobs]
+            done += sum(chave in valores for chave in chaves)
+            pendentes = [job for job, chave in zip(rodada_jobs, chaves) if chave not in valores]
+
+            for linha in executar_grade(pendentes, workers):
+                rastro = separar_rastro(linha)
+                if rastro is not None:
+                    gravador_rastro.gravar(rastro)
+                gravador.gravar(linha)
+                valores[chave_resultado(linha)] = linha["valor"]
+
+                done += 1
+                if done % 20 == 0:
+                    print(f"[BLNM] {done}/{total} (parcial{f', {puladas} puladas pela corrida' if puladas else ''})")
+
+            if corrida is None:
+                continue
 
-    for m in maquinas:
-        for r in rs:
-            n = int(m * r)
-
-            for rep in range(1, repeticoes + 1):
-                tempos = [random.randint(1, 100) for _ in range(n)]
-
-                for alpha in alphas:
-                    valor, it, tempo_exec = blnm_monotona_randomizada(
-                        tempos, m, alpha, max_sem_melhora=max_sem_melhora
-                    )
-
-                    linhas.append((
-                        "blnm_monotona_randomizada",
-                        n, m, rep,
-                        tempo_exec,
-                        it,
-                        valor,
-                        alpha
-                    ))
-
-                    done += 1
-                    if done % 20 == 0:
-                        print(f"[BLNM] {done}/{total} (parcial)")
-
-    tempo_total_script = time.time() - inicio_script
-
-    exportar_txt(TXT_PATH, linhas)
+            # um bloco por instância da rodada: {alpha: makespan}
+            blocos = {}
+            for job, chave in zip(rodada_jobs, chaves):
+                blocos.setdefault(job[1], {})[job[3]["alpha"]] = valores[chave]
+            for bloco in blocos.values():
+                corrida.adicionar_bloco(bloco)
+            eliminados = corrida.testar(rodada)
+            if eliminados:
+                print(f"[BLNM] rodada {rodada}: saem os alphas {', '.join(f'{a:.1f}' for a in eliminados)}; "
+                      f"vivos {', '.join(f'{a:.1f}' for a in corrida.vivos)}")
+            if len(corrida.vivos) == 1:
+                # as rodadas restantes ficam inteiras de fora
+                puladas += sum(len(jobs_rodada) for jobs_rodada in rodadas[rodada:])
+                break
+
+    tempo_total_script = exp["tempo_anterior"] + (time.time() - inicio_script)
+    if corrida is not None:
+        salvar_experimento(exp, tempo_total_script,
+                           corrida={**corrida.como_dict(), "executadas": done, "puladas": puladas})
+    else:
+        salvar_experimento(exp, tempo_total_script)
+
+    linhas = ArquivoResultados(JSONL_PATH)
+
+    colunas = colunas_resultados(BLNM)
+    exportar_txt(TXT_PATH, linhas, colunas)
 
     config = {
         "maquinas": maquinas,
@@ -384,15 +278,64 @@ def main():
         "repeticoes": repeticoes,
         "alphas": [f"{a:.1f}" for a in alphas],
         "max_sem_melhora": max_sem_melhora,
-        "esperado_registros": total
+        "vizinhanca": vizinhanca,
+        "estrategia": estrategia if estrategia == "melhor" else f"{estrategia} ({ordem})",
+        "motor": motor,
+        "armazenamento": armazenamento,
+        "construcao": construcao if construcao != "grasp" else f"grasp (rcl = {rcl})",
+        "parada": descrever_parada(parada),
+        "crn": "sim" if crn else "não",
+        "varredura": varredura if corrida is None else f"corrida ({corrida.metodo})",
+        "alpha_adaptativo": f"{alpha_adaptativo} (janela {janela_alpha})" if alpha_adaptativo else "não",
+        "itens_corrida": [] if corrida is None else [
+            ("Alphas eliminados (rodada)",
+             ", ".join(f"{e['candidato']:.1f} ({e['rodada']})" for e in corrida.eliminacoes) or "nenhum"),
+            ("Alphas vencedores", ", ".join(f"{a:.1f}" for a in corrida.vencedores())),
+            ("Execuções feitas (corrida)", done),
+            ("Execuções puladas (alphas eliminados)", puladas),
+        ],
+        "esperado_registros": total,
+        "semente": semente,
+        "instancias": os.path.basename(instancias),
+        "semente_suite": suite.semente
     }
 
-    exportar_xlsx(XLSX_PATH, linhas, tempo_total_script, config)
+    resumo = montar_resumo(linhas, config)
+    exportar_xlsx(XLSX_PATH, linhas, colunas, tempo_total_script, resumo)
+
+    campos_cubo = CAMPOS_CUBO + [c for c in BLNM.colunas_extras if c not in CATEGORIAS_CUBO]  # inclui a instrumentação
+    exportar_cubo(CUBO_PATH, calcular_cubo(linhas, campos_cubo, CATEGORIAS_CUBO), tempo_total_script,
+                  campos_cubo, CATEGORIAS_CUBO)
+
+    gerados = [JSONL_PATH, TXT_PATH, XLSX_PATH, CUBO_PATH]
+    if rastrear:
+        gerados.append(RASTRO_PATH)
+    if ARROW_DISPONIVEL:
+        exportar_arrow(ARROW_PATH, linhas, colunas, tempo_total_script, resumo)
+        gerados.append(ARROW_PATH)
 
-    print(f"\nGerado:\n- {TXT_PATH}\n- {XLSX_PATH}")
-    print(f"Total de registros (esperado {total}): {len(linhas)}")
+    print("\nGerado:\n" + "\n".join(f"- {p}" for p in gerados))
+    print(f"Total de registros (esperado {total}): {done}"
+          + (f" ({puladas} puladas pela corrida)" if corrida is not None else ""))
     print(f"Tempo total do script: {tempo_total_script:.2f}s")
+    print(f"Semente base: {semente}")
+    print(f"Experimento: {exp['id']} (retome com --experimento {exp['id']} --retomar)")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Experimentos BLNM (Monótona Randomizada)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos em paralelo (padrão: número de CPUs; 1 = serial)")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="semente base para reproduzir um experimento (padrão: aleatória)")
+    parser.add_argument("--instancias", default=None,
+                        help="arquivo da suíte de instâncias (padrão: Instancias/suite_padrao.bin, "
+                             "gerado na primeira execução)")
+    parser.add_argument("--experimento", default=None,
+                        help="ID do experimento, usado nos nomes dos arquivos (padrão: timestamp)")
+    parser.add_argument("--retomar", action="store_true",
+                        help="continua o experimento --experimento, rodando só as execuções que faltam")
+    args = parser.parse_args()
+
+    main(workers=args.workers, semente=args.semente, instancias=args.instancias,
+         experimento=args.experimento, retomar=args.retomar)
@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from busca_local.benchmark import (
+    KERNELS,
+    PERFIS,
+    TAMANHOS_MEMORIA,
+    comparar,
+    formatar_duracao,
+    ler_relatorio,
+    rodar_benchmarks,
+    rodar_memoria,
+    salvar_relatorio,
+    tabela_comparacao,
+)
+from busca_local.vizinhanca import AVALIADORES
+
+# ============================================================
+# Benchmarks dos kernels e das execuções completas (ver busca_local/benchmark.py)
+#
+# Uso (na raiz do projeto):
+#   python benchmark.py rodar --perfil padrao --saida Benchmarks/base.json
+#   python benchmark.py rodar --kernels avaliar_vizinhanca_critica --tamanhos 100000x1000
+#   python benchmark.py comparar Benchmarks/base.json Benchmarks/bench_<timestamp>.json
+#   python benchmark.py rodar --comparar Benchmarks/base.json   (mede e já compara)
+#   python benchmark.py memoria --tamanhos 10000x1000 100000x1000 1000000x1000
+#
+# "comparar" sai com código 1 se algum caso regrediu ou mudou de resultado.
+# ============================================================
+
+PASTA_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Benchmarks")
+
+
+def tamanho(texto):
+    """'NxM' -> (n, m)."""
+    try:
+        n, m = (int(x) for x in texto.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tamanho deve ser NxM (ex: 1000x100), não {texto!r}")
+    return n, m
+
+
+def mostrar_caso(caso):
+    nome = f"{caso['id']:<52}"
+    if caso["status"] == "ok":
+        print(f"{nome} {formatar_duracao(caso['mediana']):>10} (mediana de {len(caso['amostras'])}, "
+              f"{caso['chamadas_por_amostra']} chamada(s) por amostra)", flush=True)
+    else:
+        print(f"{nome} pulado: {caso['motivo']}", flush=True)
+
+
+def mostrar_memoria(medida):
+    print(f"n={medida['n']:<9} m={medida['m']:<6} {medida['armazenamento']:<7} "
+          f"{medida['bytes'] / 2 ** 20:>9.1f} MiB  {medida['bytes_por_tarefa']:>7.1f} B/tarefa  "
+          f"(pico {medida['pico'] / 2 ** 20:.1f} MiB)", flush=True)
+
+
+def relatar_comparacao(base, atual, limiar):
+    """Imprime a comparação e devolve o código de saída (1 = regressão ou resultado diferente)."""
+    if base["ambiente"].get("plataforma") != atual["ambiente"].get("plataforma"):
+        print("Aviso: relatórios de máquinas/plataformas diferentes; compare só na mesma máquina.")
+
+    linhas = comparar(base, atual, limiar)
+    tabela_comparacao(linhas)
+
+    ruins = [l for l in linhas if l["status"] in ("regressao", "resultado_diferente")]
+    melhoras = sum(l["status"] == "melhora" for l in linhas)
+    print(f"\nLimiar: {limiar:.0%} | melhoras: {melhoras} | regressões/resultados diferentes: {len(ruins)}")
+    return 1 if ruins else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos kernels da busca local")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_rodar = sub.add_parser("rodar", help="mede os kernels e grava o relatório JSON")
+    p_rodar.add_argument("--perfil", choices=list(PERFIS), default="padrao")
+    p_rodar.add_argument("--tamanhos", type=tamanho, nargs="+", help="NxM (substitui o perfil)")
+    p_rodar.add_argument("--kernels", nargs="+", choices=list(KERNELS), help="padrão: todos")
+    p_rodar.add_argument("--semente", type=int, default=0)
+    p_rodar.add_argument("--repeticoes", type=int, default=7)
+    p_rodar.add_argument("--aquecimento", type=int, default=2)
+    p_rodar.add_argument("--tempo-minimo", type=float, default=0.05, help="duração mínima de uma amostra (s)")
+    p_rodar.add_argument("--sem-limites", action="store_true", help="não pula as varreduras completas grandes")
+    p_rodar.add_argument("--saida", help="padrão: Benchmarks/bench_<timestamp>.json")
+    p_rodar.add_argument("--comparar", metavar="BASE", help="compara com um relatório de base ao terminar")
+    p_rodar.add_argument("--limiar", type=float, default=0.10)
+
+    p_comparar = sub.add_parser("comparar", help="compara um relatório com uma linha de base")
+    p_comparar.add_argument("base")
+    p_comparar.add_argument("atual")
+    p_comparar.add_argument("--limiar", type=float, default=0.10,
+                            help="aumento relativo da mediana que conta como regressão")
+
+    p_memoria = sub.add_parser("memoria", help="memória do estado da busca por armazenamento (listas x arrays)")
+    p_memoria.add_argument("--tamanhos", type=tamanho, nargs="+", default=TAMANHOS_MEMORIA, help="NxM")
+    p_memoria.add_argument("--avaliador", choices=list(AVALIADORES), default="critica")
+    p_memoria.add_argument("--semente", type=int, default=0)
+    p_memoria.add_argument("--saida", help="padrão: Benchmarks/memoria_<timestamp>.json")
+
+    args = parser.parse_args()
+
+    if args.comando == "comparar":
+        sys.exit(relatar_comparacao(ler_relatorio(args.base), ler_relatorio(args.atual), args.limiar))
+
+    if args.comando == "memoria":
+        relatorio = rodar_memoria(args.tamanhos, avaliador=args.avaliador, semente=args.semente,
+                                  progresso=mostrar_memoria)
+        print()
+        for armazenamento, ajuste in relatorio["ajuste"].items():
+            print(f"{armazenamento}: {ajuste['bytes_por_tarefa']:.1f} bytes por tarefa "
+                  f"(ajuste linear; fixo {ajuste['fixo'] / 2 ** 10:.0f} KiB)")
+        saida = args.saida or os.path.join(
+            PASTA_PADRAO, f"memoria_{datetime.now().strftime('%d-%m-%Y_%H-%M-%S')}.json"
+        )
+        salvar_relatorio(saida, relatorio)
+        print(f"\nGerado: {saida}")
+        return
+
+    relatorio = rodar_benchmarks(
+        args.tamanhos or PERFIS[args.perfil],
+        kernels=args.kernels,
+        semente=args.semente,
+        repeticoes=args.repeticoes,
+        aquecimento=args.aquecimento,
+        tempo_minimo=args.tempo_minimo,
+        sem_limites=args.sem_limites,
+        progresso=mostrar_caso,
+    )
+
+    saida = args.saida or os.path.join(
+        PASTA_PADRAO, f"bench_{datetime.now().strftime('%d-%m-%Y_%H-%M-%S')}.json"
+    )
+    salvar_relatorio(saida, relatorio)
+    print(f"\nGerado: {saida}")
+
+    if args.comparar:
+        print()
+        sys.exit(relatar_comparacao(ler_relatorio(args.comparar), relatorio, args.limiar))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Núcleo compartilhado da busca local para escalonamento em máquinas paralelas.
+
+As heurísticas (BLM, BLNM, ...) implementam a interface Heuristica e se
+registram por nome; os scripts BLM/ e BLNM/ só montam a grade e exportam.
+"""
+
+from .adaptacao import POLITICAS_ALPHA, AlphaAdaptativo, AlphaBandit, AlphaEstagnacao, alpha_de_params
+from .cargas import (
+    ARMAZENAMENTOS,
+    IndiceCargas,
+    TarefasPorMaquina,
+    TarefasPorMaquinaCompacta,
+    aplicar_movimento,
+    aplicar_troca,
+    compactar_tempos,
+    construir_solucao_inicial,
+    limite_inferior,
+    maior_excluindo,
+    makespan,
+    solucao_de,
+    top3_cargas,
+)
+from .construcao import (
+    CONSTRUCOES,
+    RCL_PADRAO,
+    atribuicao_grasp,
+    atribuicao_lista,
+    atribuicao_lpt,
+    construir_atribuicao,
+    ordem_lpt,
+)
+from .corrida import METODOS_CORRIDA, Corrida, teste_friedman
+from .vizinhanca import (
+    AVALIADORES,
+    ESTRATEGIAS,
+    ORDENS,
+    VIZINHANCAS,
+    PrimeiraMelhora,
+    avaliar_melhor_melhora,
+    avaliar_melhor_melhora_numpy,
+    avaliar_trocas_criticas,
+    avaliar_vizinhanca_critica,
+    avaliar_vizinhanca_critica_compacta,
+    preparar_avaliador,
+    preparar_vizinhanca,
+    rotulo_variante,
+)
+from .convergencia import RastroConvergencia, decodificar_rastro
+from .instrumentacao import COLUNAS_INSTRUMENTACAO, Contadores
+from .parada import MOTIVOS_PARADA, CriterioParada, criterio_de_params
+from .heuristicas import HEURISTICAS, Heuristica, Instancia, Resultado, obter_heuristica, registrar
+from .blm import BLM, blm_melhor_melhora
+from .blnm import BLNM, blnm_monotona_randomizada, passo_aleatorio, sortear_passo
+from .lote import blnm_em_lote
+from .instancias import (
+    SuiteInstancias,
+    abrir_suite,
+    especificacoes_grade,
+    garantir_suite,
+    gerar_suite,
+)
+from .resultados import ArquivoResultados, GravadorResultados, gravar_metadados, ler_metadados, ler_resultados
+from .experimentos import (
+    abrir_experimento,
+    agrupar_jobs,
+    carregar_instancia,
+    chave_job,
+    chave_resultado,
+    derivar_semente,
+    executar_grade,
+    executar_job,
+    executar_lote,
+    filtrar_pendentes,
+    forma_instancia,
+    salvar_experimento,
+    separar_rastro,
+)
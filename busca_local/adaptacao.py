@@ -0,0 +1,135 @@
+import math
+from array import array
+
+# ============================================================
+# Alpha adaptativo do BLNM: a probabilidade de passo aleatório muda
+# durante a execução, a partir do que a busca vem conseguindo, em vez
+# de ficar fixa (o que exige varrer os 9 alphas por instância).
+#
+# O alpha só muda no fim de cada época de `janela` iterações (o laço
+# compara um inteiro por iteração); o sinal de cada época é se o best
+# melhorou nela. Políticas:
+#   estagnacao  época sem melhora: alpha += passo (até alpha_max, mais
+#               diversificação); época com melhora: alpha volta ao
+#               mínimo (intensifica onde está melhorando)
+#   bandit      UCB1 sobre os braços discretos (0.1..0.9): cada época
+#               joga um braço e ganha 1 se o best melhorou nela; as
+#               estatísticas são descontadas (fator `desconto` por
+#               época) porque melhorar fica mais raro com o tempo
+#
+# Nenhuma política consome o rng da busca, então a execução continua
+# reproduzível pela semente. A trajetória (iteração, alpha) de cada
+# mudança fica em arrays tipados e vai para o rastro de convergência.
+# ============================================================
+
+POLITICAS_ALPHA = ("estagnacao", "bandit")
+
+BRACOS_PADRAO = tuple(i / 10 for i in range(1, 10))
+JANELA_PADRAO = 100
+
+
+class AlphaAdaptativo:
+    """
+    Base das políticas: o laço chama iniciar() antes da primeira iteração
+    e ajustar(it, best) a cada `janela` iterações; os dois devolvem o
+    alpha a usar daí em diante.
+    """
+    politica = None
+
+    def __init__(self, janela=JANELA_PADRAO):
+        self.janela = janela
+        self.iteracao = array("I")
+        self.alpha = array("d")
+        self._best = None
+
+    def _registrar(self, it, alpha):
+        if not self.alpha or self.alpha[-1] != alpha:
+            self.iteracao.append(it)
+            self.alpha.append(alpha)
+        return alpha
+
+    def iniciar(self, best):
+        self._best = best
+        return self._registrar(0, self.primeiro())
+
+    def ajustar(self, it, best):
+        melhorou = best < self._best
+        self._best = best
+        return self._registrar(it, self.proximo(melhorou))
+
+    def primeiro(self):
+        raise NotImplementedError
+
+    def proximo(self, melhorou):
+        """Alpha da próxima época, dado se o best melhorou na que terminou."""
+        raise NotImplementedError
+
+
+class AlphaEstagnacao(AlphaAdaptativo):
+    politica = "estagnacao"
+
+    def __init__(self, alpha_min=0.1, alpha_max=0.9, passo=0.03, janela=JANELA_PADRAO):
+        super().__init__(janela)
+        self.alpha_min = alpha_min
+        self.alpha_max = alpha_max
+        self.passo = passo
+        self._atual = alpha_min
+
+    def primeiro(self):
+        return self._atual
+
+    def proximo(self, melhorou):
+        if melhorou:
+            self._atual = self.alpha_min
+        else:
+            self._atual = round(min(self.alpha_max, self._atual + self.passo), 10)
+        return self._atual
+
+
+class AlphaBandit(AlphaAdaptativo):
+    politica = "bandit"
+
+    def __init__(self, bracos=BRACOS_PADRAO, desconto=0.95, exploracao=0.5, janela=JANELA_PADRAO):
+        super().__init__(janela)
+        self.bracos = tuple(bracos)
+        self.desconto = desconto
+        self.exploracao = exploracao
+        self.jogadas = [0.0] * len(self.bracos)
+        self.ganhos = [0.0] * len(self.bracos)
+        self._braco = 0
+
+    def primeiro(self):
+        self._braco = 0
+        return self.bracos[0]
+
+    def proximo(self, melhorou):
+        d = self.desconto
+        self.jogadas = [j * d for j in self.jogadas]
+        self.ganhos = [g * d for g in self.ganhos]
+        self.jogadas[self._braco] += 1
+        self.ganhos[self._braco] += melhorou
+
+        # braço nunca jogado primeiro (na ordem); depois, o maior UCB (empate: menor alpha)
+        if 0 in self.jogadas:
+            self._braco = self.jogadas.index(0)
+        else:
+            total = math.log(max(1.0, sum(self.jogadas)))
+            self._braco = max(range(len(self.bracos)), key=lambda b: (
+                self.ganhos[b] / self.jogadas[b] + self.exploracao * math.sqrt(total / self.jogadas[b]), -b))
+        return self.bracos[self._braco]
+
+
+def alpha_de_params(params):
+    """
+    Controle de alpha dos params de um job, ou None (alpha fixo):
+      alpha_adaptativo: "estagnacao" ou "bandit"; janela_alpha: iterações por época
+    """
+    politica = params.get("alpha_adaptativo")
+    if politica is None:
+        return None
+    janela = params.get("janela_alpha", JANELA_PADRAO)
+    if politica == "estagnacao":
+        return AlphaEstagnacao(janela=janela)
+    if politica == "bandit":
+        return AlphaBandit(janela=janela)
+    raise ValueError(f"alpha adaptativo desconhecido: {politica!r} (opções: {', '.join(POLITICAS_ALPHA)})")
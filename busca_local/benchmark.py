@@ -0,0 +1,564 @@
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from array import array
+from datetime import datetime
+from functools import partial
+
+from .blm import blm_melhor_melhora
+from .blnm import blnm_monotona_randomizada, passo_aleatorio
+from .cargas import (
+    ARMAZENAMENTOS,
+    IndiceCargas,
+    TarefasPorMaquina,
+    TarefasPorMaquinaCompacta,
+    compactar_tempos,
+    construir_solucao_inicial,
+    maior_excluindo,
+    top3_cargas,
+)
+from .experimentos import derivar_semente, versao_codigo
+from .instancias import DISTRIBUICAO_PADRAO, gerar_tempos
+from .lote import blnm_em_lote
+from .vizinhanca import (
+    avaliar_melhor_melhora,
+    avaliar_melhor_melhora_numpy,
+    avaliar_vizinhanca_critica,
+    avaliar_vizinhanca_critica_compacta,
+    preparar_vizinhanca,
+)
+
+try:
+    import numpy as np
+except ImportError:  # kernels NumPy são pulados sem numpy
+    np = None
+
+# ============================================================
+# Benchmarks dos kernels da busca (micro) e de execuções completas (macro)
+#
+# Cada caso é (kernel, n, m). A instância e o estado inicial saem de
+# sementes derivadas da semente base e do caso, então duas rodadas (em
+# versões diferentes do código) medem exatamente o mesmo trabalho.
+#
+# Medição (como o timeit): aquecimento, calibração do número de chamadas
+# por amostra até a amostra durar tempo_minimo, e `repeticoes` amostras
+# com o coletor de lixo desligado. Os tempos gravados são por operação.
+#
+# Cada caso grava também o resultado do kernel (quando determinístico):
+# comparar() acusa quando uma otimização mudou o que o kernel devolve.
+#
+# Os kernels que varrem a vizinhança inteira (n*m) são pulados acima de
+# LIMITE_VIZINHOS, senão um caso de 10^5 x 10^3 levaria minutos.
+#
+# Memória (rodar_memoria): bytes do estado da busca por armazenamento
+# ("listas" x "arrays"), medidos com tracemalloc, em vários n.
+# ============================================================
+
+FORMATO_BENCHMARK = 1
+
+PERFIS = {
+    # tamanhos da grade dos scripts (m = 10, 20, 50; n = 1,5m e 2m)
+    "rapido": [(15, 10), (40, 20), (100, 50)],
+    "padrao": [(15, 10), (40, 20), (100, 50), (1000, 100), (10000, 1000)],
+    "grande": [(15, 10), (40, 20), (100, 50), (1000, 100), (10000, 1000), (100000, 1000)],
+}
+
+# n*m máximo por avaliador de varredura completa: por chamada (micro) e
+# por execução completa (macro, milhares de varreduras)
+LIMITE_VIZINHOS = {
+    "micro": {"python": 10 ** 6, "numpy": 10 ** 7},
+    "macro": {"python": 5000},
+}
+
+KERNELS = {}
+
+
+def kernel(nome, tipo, varredura=None, numpy=False):
+    """
+    Registra um kernel: preparar(tempos, m, rng) -> (fn, operacoes, resultado).
+
+    fn() é o que se mede (sem argumentos); operacoes, quantas operações
+    cada chamada faz (o tempo gravado é por operação); resultado, a saída
+    determinística do kernel (ou None). varredura: avaliador de varredura
+    completa sujeito a LIMITE_VIZINHOS[tipo]; numpy: pulado sem numpy.
+    """
+    def decorador(preparar):
+        KERNELS[nome] = {"tipo": tipo, "varredura": varredura, "numpy": numpy, "preparar": preparar}
+        return preparar
+    return decorador
+
+
+def _estado(tempos, m, rng, armazenamento="listas"):
+    if armazenamento == "arrays":
+        tempos = compactar_tempos(tempos)
+    sol, cargas = construir_solucao_inicial(len(tempos), m, tempos, rng, armazenamento)
+    return sol, cargas, IndiceCargas(cargas)
+
+
+def _jsonavel(valor):
+    return json.loads(json.dumps(valor, default=int))
+
+
+# ===== Micro: avaliadores da vizinhança "mover" =====
+
+@kernel("avaliar_melhor_melhora", "micro", varredura="python")
+def _avaliar_python(tempos, m, rng):
+    sol, cargas, indice = _estado(tempos, m, rng)
+    fn = partial(avaliar_melhor_melhora, sol, cargas, tempos, m, indice)
+    return fn, 1, list(fn())
+
+
+@kernel("avaliar_melhor_melhora_numpy", "micro", varredura="numpy", numpy=True)
+def _avaliar_numpy(tempos, m, rng):
+    sol, cargas, indice = _estado(tempos, m, rng)
+    fn = partial(avaliar_melhor_melhora_numpy, sol, cargas, tempos, m, indice)
+    return fn, 1, _jsonavel(fn())
+
+
+@kernel("avaliar_vizinhanca_critica", "micro")
+def _avaliar_critica(tempos, m, rng):
+    sol, cargas, indice = _estado(tempos, m, rng)
+    tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+    fn = partial(avaliar_vizinhanca_critica, sol, cargas, tempos, m, indice, tarefas_maq)
+    return fn, 1, list(fn())
+
+
+@kernel("avaliar_vizinhanca_critica_compacta", "micro")
+def _avaliar_critica_compacta(tempos, m, rng):
+    sol, cargas, indice = _estado(tempos, m, rng, "arrays")
+    tarefas_maq = TarefasPorMaquinaCompacta(sol, tempos, m)
+    fn = partial(avaliar_vizinhanca_critica_compacta, sol, cargas, tempos, m, indice, tarefas_maq)
+    return fn, 1, list(fn())
+
+
+# ===== Micro: cargas =====
+
+@kernel("top3_cargas", "micro")
+def _top3(tempos, m, rng):
+    _, cargas, _ = _estado(tempos, m, rng)
+    fn = partial(top3_cargas, cargas)
+    return fn, 1, [list(p) for p in fn()]
+
+
+@kernel("IndiceCargas.top3", "micro")
+def _top3_indice(tempos, m, rng):
+    _, _, indice = _estado(tempos, m, rng)
+    return indice.top3, 1, [list(p) for p in indice.top3()]
+
+
+@kernel("maior_excluindo", "micro")
+def _maior_excluindo(tempos, m, rng):
+    # 256 pares (a, b) por chamada, metade envolvendo máquinas do top3
+    _, cargas, _ = _estado(tempos, m, rng)
+    t3 = top3_cargas(cargas)
+    topo = [i for _, i in t3]
+    pares = [(rng.choice(topo) if k % 2 else rng.randrange(m), rng.randrange(m)) for k in range(256)]
+
+    def fn():
+        return [maior_excluindo(t3, a, b) for a, b in pares]
+
+    return fn, len(pares), sum(fn())
+
+
+# ===== Micro: passo aleatório (muda o estado: sem resultado fixo) =====
+
+@kernel("passo_aleatorio", "micro")
+def _passo(tempos, m, rng):
+    sol, cargas, indice = _estado(tempos, m, rng)
+    fn = partial(passo_aleatorio, sol, cargas, tempos, m, indice, rng=rng)
+    return fn, 1, None
+
+
+@kernel("passo_aleatorio_tarefas", "micro")
+def _passo_tarefas(tempos, m, rng):
+    # com as listas ordenadas por máquina, como nos avaliadores "critica"/"trocar"
+    sol, cargas, indice = _estado(tempos, m, rng)
+    tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+    fn = partial(passo_aleatorio, sol, cargas, tempos, m, indice, tarefas_maq, rng=rng)
+    return fn, 1, None
+
+
+@kernel("passo_aleatorio_compacto", "micro")
+def _passo_compacto(tempos, m, rng):
+    # armazenamento "arrays", com o índice compacto do avaliador "critica"
+    sol, cargas, indice = _estado(tempos, m, rng, "arrays")
+    tarefas_maq = TarefasPorMaquinaCompacta(sol, tempos, m)
+    fn = partial(passo_aleatorio, sol, cargas, compactar_tempos(tempos), m, indice, tarefas_maq, rng=rng)
+    return fn, 1, None
+
+
+# ===== Micro: construção da solução inicial (resultado: makespan inicial) =====
+
+def _construcao(tempos, m, rng, construcao):
+    semente = rng.getrandbits(63)
+
+    def fn():
+        return construir_solucao_inicial(len(tempos), m, tempos, random.Random(semente), construcao=construcao)
+
+    return fn, 1, max(fn()[1])
+
+
+@kernel("construcao_aleatoria", "micro")
+def _construcao_aleatoria(tempos, m, rng):
+    return _construcao(tempos, m, rng, "aleatoria")
+
+
+@kernel("construcao_lpt", "micro")
+def _construcao_lpt(tempos, m, rng):
+    return _construcao(tempos, m, rng, "lpt")
+
+
+@kernel("construcao_grasp", "micro")
+def _construcao_grasp(tempos, m, rng):
+    return _construcao(tempos, m, rng, "grasp")
+
+
+# ===== Macro: execuções completas (parada padrão, 1000 sem melhora) =====
+
+def _execucao(busca, semente):
+    # rng novo a cada chamada: toda amostra repete a mesma execução
+    def fn():
+        return busca(random.Random(semente))
+    best, it = fn()[:2]
+    return fn, 1, [best, it]
+
+
+@kernel("blm_python", "macro", varredura="python")
+def _blm_python(tempos, m, rng):
+    return _execucao(lambda r: blm_melhor_melhora(tempos, m, rng=r), rng.getrandbits(63))
+
+
+@kernel("blm_critica", "macro")
+def _blm_critica(tempos, m, rng):
+    return _execucao(lambda r: blm_melhor_melhora(tempos, m, avaliador="critica", rng=r),
+                     rng.getrandbits(63))
+
+
+@kernel("blnm_python", "macro", varredura="python")
+def _blnm_python(tempos, m, rng):
+    return _execucao(lambda r: blnm_monotona_randomizada(tempos, m, 0.5, rng=r), rng.getrandbits(63))
+
+
+@kernel("blnm_critica", "macro")
+def _blnm_critica(tempos, m, rng):
+    return _execucao(lambda r: blnm_monotona_randomizada(tempos, m, 0.5, avaliador="critica", rng=r),
+                     rng.getrandbits(63))
+
+
+@kernel("blm_critica_lpt", "macro")
+def _blm_critica_lpt(tempos, m, rng):
+    return _execucao(lambda r: blm_melhor_melhora(tempos, m, avaliador="critica", rng=r, construcao="lpt"),
+                     rng.getrandbits(63))
+
+
+@kernel("blnm_critica_lpt", "macro")
+def _blnm_critica_lpt(tempos, m, rng):
+    return _execucao(
+        lambda r: blnm_monotona_randomizada(tempos, m, 0.5, avaliador="critica", rng=r, construcao="lpt"),
+        rng.getrandbits(63),
+    )
+
+
+@kernel("blm_critica_arrays", "macro")
+def _blm_critica_arrays(tempos, m, rng):
+    return _execucao(lambda r: blm_melhor_melhora(tempos, m, avaliador="critica", rng=r, armazenamento="arrays"),
+                     rng.getrandbits(63))
+
+
+@kernel("blnm_critica_arrays", "macro")
+def _blnm_critica_arrays(tempos, m, rng):
+    return _execucao(
+        lambda r: blnm_monotona_randomizada(tempos, m, 0.5, avaliador="critica", rng=r, armazenamento="arrays"),
+        rng.getrandbits(63),
+    )
+
+
+@kernel("blnm_lote", "macro", numpy=True)
+def _blnm_lote(tempos, m, rng):
+    # 9 réplicas (alphas 0.1..0.9) num lote; operação = uma réplica
+    alphas = [round(0.1 * k, 1) for k in range(1, 10)]
+    sementes = [rng.getrandbits(63) for _ in alphas]
+    fn = partial(blnm_em_lote, tempos, m, alphas, sementes)
+    return fn, len(alphas), [[best, it] for best, it, _, _ in fn()]
+
+
+# ===== Medição =====
+
+def _cronometrar(fn, chamadas):
+    relogio = time.perf_counter
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        inicio = relogio()
+        for _ in range(chamadas):
+            fn()
+        return relogio() - inicio
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+
+def medir(fn, operacoes=1, repeticoes=7, aquecimento=2, tempo_minimo=0.05):
+    """
+    Tempos por operação de fn(): aquecimento chamadas descartadas, depois
+    `repeticoes` amostras de k chamadas, com k dobrado até a amostra durar
+    tempo_minimo. Devolve as estatísticas (s/operação) e as amostras.
+    """
+    for _ in range(aquecimento):
+        fn()
+
+    chamadas = 1
+    while True:
+        decorrido = _cronometrar(fn, chamadas)
+        if decorrido >= tempo_minimo:
+            break
+        chamadas *= 2
+
+    amostras = [_cronometrar(fn, chamadas) / (chamadas * operacoes) for _ in range(repeticoes)]
+    quartis = statistics.quantiles(amostras, n=4) if len(amostras) > 1 else [amostras[0]] * 3
+    return {
+        "chamadas_por_amostra": chamadas,
+        "operacoes_por_chamada": operacoes,
+        "min": min(amostras),
+        "mediana": statistics.median(amostras),
+        "media": statistics.fmean(amostras),
+        "desvio": statistics.stdev(amostras) if len(amostras) > 1 else 0.0,
+        "q1": quartis[0],
+        "q3": quartis[2],
+        "amostras": amostras,
+    }
+
+
+def id_caso(nome, n, m):
+    return f"{nome}[n={n},m={m}]"
+
+
+def _motivo_pular(info, n, m, sem_limites):
+    if info["numpy"] and np is None:
+        return "numpy ausente"
+    if sem_limites or info["varredura"] is None:
+        return None
+    limite = LIMITE_VIZINHOS[info["tipo"]].get(info["varredura"])
+    if limite is not None and n * m > limite:
+        return f"n*m = {n * m} acima do limite {limite} ({info['varredura']}, {info['tipo']})"
+    return None
+
+
+def rodar_benchmarks(tamanhos, kernels=None, semente=0, repeticoes=7, aquecimento=2, tempo_minimo=0.05,
+                     sem_limites=False, progresso=None):
+    """
+    Mede cada kernel em cada (n, m) de `tamanhos` e devolve o relatório
+    (dict pronto para JSON). kernels: nomes de KERNELS (padrão: todos).
+    progresso(caso): chamado depois de cada caso, medido ou pulado.
+    """
+    if kernels is None:
+        kernels = list(KERNELS)
+    desconhecidos = [k for k in kernels if k not in KERNELS]
+    if desconhecidos:
+        raise ValueError(f"kernel(s) desconhecido(s): {desconhecidos}; disponíveis: {list(KERNELS)}")
+
+    casos = []
+    for n, m in tamanhos:
+        tempos = gerar_tempos(n, DISTRIBUICAO_PADRAO, derivar_semente(semente, "tempos", n, m))
+
+        for nome in kernels:
+            info = KERNELS[nome]
+            caso = {"id": id_caso(nome, n, m), "kernel": nome, "tipo": info["tipo"], "n": n, "m": m}
+
+            motivo = _motivo_pular(info, n, m, sem_limites)
+            if motivo is not None:
+                caso.update(status="pulado", motivo=motivo)
+            else:
+                rng = random.Random(derivar_semente(semente, nome, n, m))
+                fn, operacoes, resultado = info["preparar"](tempos, m, rng)
+                # macro: cada chamada já leva de milissegundos a segundos
+                aquec = aquecimento if info["tipo"] == "micro" else min(aquecimento, 1)
+                caso.update(status="ok", resultado=resultado,
+                            **medir(fn, operacoes, repeticoes, aquec, tempo_minimo))
+
+            casos.append(caso)
+            if progresso is not None:
+                progresso(caso)
+
+    return {
+        "formato": FORMATO_BENCHMARK,
+        "criado": datetime.now().isoformat(timespec="seconds"),
+        "ambiente": ambiente(),
+        "configuracao": {
+            "semente": semente,
+            "tamanhos": [list(t) for t in tamanhos],
+            "kernels": list(kernels),
+            "repeticoes": repeticoes,
+            "aquecimento": aquecimento,
+            "tempo_minimo": tempo_minimo,
+            "sem_limites": sem_limites,
+        },
+        "casos": casos,
+    }
+
+
+def ambiente():
+    """Onde os números foram medidos: só compare relatórios da mesma máquina."""
+    return {
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__ if np is not None else None,
+        "versao": versao_codigo(),
+    }
+
+
+def salvar_relatorio(caminho, relatorio):
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=1)
+
+
+def ler_relatorio(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        relatorio = json.load(f)
+    if relatorio.get("formato") != FORMATO_BENCHMARK:
+        raise ValueError(f"{caminho}: formato de benchmark não suportado ({relatorio.get('formato')!r})")
+    return relatorio
+
+
+# ===== Memória do estado da busca =====
+
+TAMANHOS_MEMORIA = [(10 ** 4, 1000), (10 ** 5, 1000), (10 ** 6, 1000)]
+
+
+def medir_memoria(tempos, m, armazenamento, avaliador="critica", semente=0):
+    """
+    Bytes alocados (tracemalloc) para montar o estado de uma busca: tempos
+    no formato do armazenamento, atribuição, cargas, índice de cargas e o
+    que o avaliador mantém (listas por máquina, no "critica"). `tempos`
+    chega como array("i"), como sai da suíte, e é convertido dentro da medição.
+    """
+    n = len(tempos)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tempos_busca = compactar_tempos(array("i", tempos)) if armazenamento == "arrays" else tempos.tolist()
+        sol, cargas = construir_solucao_inicial(n, m, tempos_busca, random.Random(semente), armazenamento)
+        indice = IndiceCargas(cargas)
+        estado = preparar_vizinhanca("mover", avaliador, sol, tempos_busca, m, armazenamento=armazenamento)
+        atual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del tempos_busca, sol, cargas, indice, estado
+    return {"n": n, "m": m, "armazenamento": armazenamento, "avaliador": avaliador,
+            "bytes": atual, "pico": pico, "bytes_por_tarefa": atual / n}
+
+
+def _ajuste_linear(xs, ys):
+    # mínimos quadrados: y = fixo + inclinacao * x
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    inclinacao = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx if sxx else 0.0
+    return inclinacao, my - inclinacao * mx
+
+
+def rodar_memoria(tamanhos=TAMANHOS_MEMORIA, armazenamentos=ARMAZENAMENTOS, avaliador="critica", semente=0,
+                  progresso=None):
+    """
+    Memória do estado em cada (n, m) e armazenamento, mais o ajuste linear
+    bytes = fixo + bytes_por_tarefa * n por armazenamento (com o mesmo m,
+    a inclinação é o custo de cada tarefa a mais).
+    """
+    medidas = []
+    for n, m in tamanhos:
+        tempos = array("i", gerar_tempos(n, DISTRIBUICAO_PADRAO, derivar_semente(semente, "tempos", n, m)))
+        for armazenamento in armazenamentos:
+            medida = medir_memoria(tempos, m, armazenamento, avaliador, semente)
+            medidas.append(medida)
+            if progresso is not None:
+                progresso(medida)
+
+    ajuste = {}
+    for armazenamento in armazenamentos:
+        pontos = [(d["n"], d["bytes"]) for d in medidas if d["armazenamento"] == armazenamento]
+        if len({n for n, _ in pontos}) > 1:
+            inclinacao, fixo = _ajuste_linear(*zip(*pontos))
+            ajuste[armazenamento] = {"bytes_por_tarefa": inclinacao, "fixo": fixo}
+
+    return {
+        "formato": FORMATO_BENCHMARK,
+        "criado": datetime.now().isoformat(timespec="seconds"),
+        "ambiente": ambiente(),
+        "configuracao": {"semente": semente, "tamanhos": [list(t) for t in tamanhos], "avaliador": avaliador},
+        "memoria": medidas,
+        "ajuste": ajuste,
+    }
+
+
+# ===== Comparação com uma linha de base =====
+
+def comparar(base, atual, limiar=0.10):
+    """
+    Compara dois relatórios caso a caso (pelo id). Para cada caso medido
+    nos dois, razao = mediana_atual / mediana_base e o status:
+      - "regressao": mediana mais de `limiar` acima da base e intervalos
+        interquartis sem sobreposição (q1 atual > q3 base)
+      - "melhora":   o simétrico (mais de `limiar` abaixo, q3 atual < q1 base)
+      - "igual":     o resto (diferença pequena ou dentro do ruído)
+      - "resultado_diferente": o kernel devolveu outra coisa (a otimização
+        mudou o comportamento; os tempos não são comparáveis)
+    Casos só num dos lados saem como "novo" / "ausente" (ou "pulado").
+    """
+    casos_base = {c["id"]: c for c in base["casos"]}
+    casos_atual = {c["id"]: c for c in atual["casos"]}
+
+    linhas = []
+    for id_, c in casos_atual.items():
+        b = casos_base.get(id_)
+        linha = {"id": id_, "kernel": c["kernel"], "n": c["n"], "m": c["m"]}
+        if b is None:
+            linha["status"] = "novo"
+        elif c["status"] != "ok" or b["status"] != "ok":
+            linha["status"] = "pulado"
+        elif c.get("resultado") != b.get("resultado"):
+            linha["status"] = "resultado_diferente"
+        else:
+            razao = c["mediana"] / b["mediana"]
+            if razao > 1 + limiar and c["q1"] > b["q3"]:
+                status = "regressao"
+            elif razao < 1 / (1 + limiar) and c["q3"] < b["q1"]:
+                status = "melhora"
+            else:
+                status = "igual"
+            linha.update(status=status, base=b["mediana"], atual=c["mediana"], razao=razao)
+        linhas.append(linha)
+
+    for id_, b in casos_base.items():
+        if id_ not in casos_atual:
+            linhas.append({"id": id_, "kernel": b["kernel"], "n": b["n"], "m": b["m"], "status": "ausente"})
+
+    return linhas
+
+
+def formatar_duracao(segundos):
+    """Tempo por operação com unidade legível (ns, µs, ms, s)."""
+    for unidade, escala in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if segundos >= escala:
+            return f"{segundos / escala:.3g} {unidade}"
+    return f"{segundos / 1e-9:.3g} ns"
+
+
+def tabela_comparacao(linhas, arquivo=sys.stdout):
+    largura = max((len(l["id"]) for l in linhas), default=10)
+    for l in linhas:
+        if "razao" in l:
+            detalhe = f"{formatar_duracao(l['base']):>10} -> {formatar_duracao(l['atual']):>10}  x{l['razao']:.2f}"
+        else:
+            detalhe = ""
+        print(f"{l['id']:<{largura}}  {l['status']:<19} {detalhe}", file=arquivo)
@@ -0,0 +1,187 @@
+import random
+import time
+
+from .cargas import (
+    IndiceCargas,
+    aplicar_movimento,
+    aplicar_troca,
+    compactar_tempos,
+    construir_solucao_inicial,
+    limite_inferior,
+)
+from .construcao import RCL_PADRAO
+from .convergencia import RastroConvergencia
+from .heuristicas import Heuristica, Resultado, registrar
+from .instrumentacao import COLUNAS_INSTRUMENTACAO, Contadores
+from .parada import INTERVALO_CPU, criterio_de_params
+from .vizinhanca import preparar_vizinhanca, rotulo_variante
+
+# ============================================================
+# BLM = Busca Local Monótona (Best Improvement / Melhor Melhora)
+# Parada: 1000 iterações sem melhorar o BEST-SO-FAR
+# ============================================================
+
+
+def blm_melhor_melhora(tempos, m, max_sem_melhora=1000, avaliador="python", curto_circuito=True, rng=random,
+                       vizinhanca="mover", estrategia="melhor", ordem="aleatoria", contadores=None, rastro=None,
+                       armazenamento="listas", parada=None, construcao="aleatoria", rcl=RCL_PADRAO):
+    """
+    Executa a Busca Local Monótona (Best Improvement):
+    - Aplica sempre o melhor movimento que melhora.
+    - Para após 1000 iterações sem melhorar o best-so-far.
+    - avaliador: "python" (laço) ou "numpy" (vetorizado), mesmo movimento escolhido;
+      ou "critica" (só máquinas críticas), mesmo makespan com custo O(m log n).
+    - vizinhanca: "mover" (1 tarefa), "trocar" (2 tarefas entre máquinas)
+      ou "mover+trocar" (o melhor dos dois a cada iteração).
+    - estrategia: "melhor" (melhor melhora) ou "primeira" (primeira melhora,
+      varrendo em `ordem` "aleatoria" ou "rotativa"; só com vizinhanca="mover").
+
+    A busca é determinística: quando nenhum movimento melhora, a solução
+    não muda e as próximas iterações repetiriam a mesma varredura.
+    Com curto_circuito=True ela para no primeiro ótimo local certificado,
+    exceto com orçamento de tempo ou CPU em `parada`: aí as varreduras
+    repetidas gastam o orçamento como na busca sem atalho, que pode parar
+    por ele antes de max_sem_melhora.
+
+    Retorna (best, iteracoes, tempo, iteracoes_efetivas):
+    - iteracoes: contagem nominal, a mesma que a regra de parada antiga
+      produziria (comparável com resultados históricos)
+    - iteracoes_efetivas: varreduras realmente executadas
+    contadores (instrumentacao.Contadores, opcional) recebe a instrumentação;
+    rastro (convergencia.RastroConvergencia, opcional), cada melhora.
+    armazenamento: "listas" ou "arrays" (tempos, atribuição e cargas em
+    arrays tipados, para instâncias grandes; mesmos movimentos).
+    parada (parada.CriterioParada, opcional): limite inferior, alvo e
+    orçamentos de tempo; o motivo da parada fica em parada.motivo.
+    construcao: solução inicial "aleatoria", "lista", "lpt" ou "grasp" (rcl); ver construcao.py.
+    """
+    n = len(tempos)
+    if armazenamento == "arrays":
+        tempos = compactar_tempos(tempos)
+    sol, cargas = construir_solucao_inicial(n, m, tempos, rng, armazenamento, construcao, rcl)
+    indice = IndiceCargas(cargas)
+
+    if contadores is None:
+        contadores = Contadores()
+
+    avaliar, tempos_aval, tarefas_maq = preparar_vizinhanca(vizinhanca, avaliador, sol, tempos, m,
+                                                            estrategia, ordem, rng, contadores, armazenamento)
+
+    best = indice.makespan()
+    sem_melhora = 0
+    it = 0
+    it_melhor = 0
+    melhoras = sem_movimento = 0
+    t_aval = t_mov = 0.0
+    relogio = time.perf_counter
+    inicio = time.time()
+    if rastro is not None:
+        rastro.iniciar(best)
+
+    motivo = None
+    valor_parada = fim_tempo = None
+    prox_cpu = float("inf")  # marca de relógio da próxima leitura da CPU
+    t0 = relogio()
+    if parada is not None:
+        parada.iniciar(t0)
+        motivo = parada.por_valor(best)
+        valor_parada, fim_tempo = parada.valor_parada, parada.fim_tempo
+        if parada.fim_cpu is not None:
+            prox_cpu = t0 + INTERVALO_CPU
+        if parada.fim_tempo is not None or parada.fim_cpu is not None:
+            curto_circuito = False
+
+    while sem_melhora < max_sem_melhora and motivo is None:
+        it += 1
+
+        tarefa, origem, destino, novo_valor, parceira = avaliar(sol, cargas, tempos_aval, m, indice)
+        t1 = relogio()
+        t_aval += t1 - t0
+        t0 = t1
+
+        if tarefa is not None:
+            if parceira is None:
+                aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice, tarefas_maq)
+            else:
+                aplicar_troca(sol, cargas, tempos, tarefa, origem, parceira, destino, indice, tarefas_maq)
+            t0 = relogio()
+            t_mov += t0 - t1
+            melhoras += 1
+
+            best = novo_valor
+            sem_melhora = 0
+            it_melhor = it
+            if rastro is not None:
+                rastro.registrar(it, best)
+            if valor_parada is not None and best <= valor_parada:
+                motivo = parada.por_valor(best)
+        else:
+            sem_movimento += 1
+            sem_melhora += 1
+            if curto_circuito:
+                break
+
+        if fim_tempo is not None and motivo is None and t0 >= fim_tempo:
+            motivo = "tempo"
+        elif t0 >= prox_cpu and motivo is None:
+            prox_cpu = t0 + INTERVALO_CPU
+            if parada.cpu_esgotada():
+                motivo = "tempo_cpu"
+
+    tempo_exec = time.time() - inicio
+
+    contadores.passos_melhora += melhoras
+    contadores.passos_sem_melhora += sem_movimento
+    contadores.tempo_avaliacao += t_aval
+    contadores.tempo_movimento += t_mov
+    contadores.iteracao_melhor = it_melhor
+
+    if parada is not None and motivo is not None:
+        parada.motivo = motivo
+
+    it_efetivas = it
+    if motivo is None and sem_melhora > 0:
+        # as iterações restantes seriam varreduras idênticas sem melhora
+        it += max_sem_melhora - sem_melhora
+
+    return best, it, tempo_exec, it_efetivas
+
+
+# sem passo aleatório: passos_aleatorios e tempo_rng ficam de fora
+COLUNAS_BLM = tuple(c for c in COLUNAS_INSTRUMENTACAO if c not in ("passos_aleatorios", "tempo_rng"))
+
+
+@registrar
+class BLM(Heuristica):
+    """
+    params: max_sem_melhora, avaliador, curto_circuito, vizinhanca, estrategia, ordem, rastrear, armazenamento,
+    parar_no_limite, alvo, tempo_maximo, tempo_cpu_maximo (ver parada.py), construcao, rcl (ver construcao.py).
+    """
+    nome = "blm_melhor_melhora"
+    colunas_extras = ("iteracoes_efetivas", *COLUNAS_BLM, "motivo_parada")
+
+    def resolver(self, instancia, params, rng):
+        contadores = Contadores()
+        parada = criterio_de_params(params, instancia.tempos, instancia.m)
+        rastro = RastroConvergencia(limite_inferior(instancia.tempos, instancia.m)) if params.get("rastrear") else None
+        valor, it, tempo_exec, it_ef = blm_melhor_melhora(
+            instancia.tempos, instancia.m,
+            max_sem_melhora=params.get("max_sem_melhora", 1000),
+            avaliador=params.get("avaliador", "python"),
+            curto_circuito=params.get("curto_circuito", True),
+            rng=rng,
+            vizinhanca=params.get("vizinhanca", "mover"),
+            estrategia=params.get("estrategia", "melhor"),
+            ordem=params.get("ordem", "aleatoria"),
+            contadores=contadores,
+            rastro=rastro,
+            armazenamento=params.get("armazenamento", "listas"),
+            parada=parada,
+            construcao=params.get("construcao", "aleatoria"),
+            rcl=params.get("rcl", RCL_PADRAO),
+        )
+        extras = {"iteracoes_efetivas": it_ef, **contadores.como_dict(COLUNAS_BLM), "motivo_parada": parada.motivo}
+        return Resultado(valor, it, tempo_exec, extras, rastro)
+
+    def rotulo(self, params):
+        return rotulo_variante(self.nome, params)
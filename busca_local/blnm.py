@@ -0,0 +1,302 @@
+import random
+import time
+
+from .adaptacao import alpha_de_params
+from .cargas import (
+    IndiceCargas,
+    aplicar_movimento,
+    aplicar_troca,
+    compactar_tempos,
+    construir_solucao_inicial,
+    limite_inferior,
+    solucao_de,
+)
+from .construcao import RCL_PADRAO, construir_atribuicao
+from .convergencia import RastroConvergencia
+from .heuristicas import Heuristica, Resultado, registrar
+from .instrumentacao import COLUNAS_INSTRUMENTACAO, Contadores
+from .lote import blnm_em_lote
+from .parada import INTERVALO_CPU, criterio_de_params
+from .vizinhanca import preparar_vizinhanca, rotulo_variante
+
+# ============================================================
+# BLNM = Busca Local Monótona Randomizada
+# - Com probabilidade alpha: passo aleatório (caminhada aleatória)
+# - Caso contrário: melhor melhora (best improvement)
+#
+# Monotonia: medida pelo BEST-SO-FAR (melhor valor encontrado)
+# Parada: 1000 iterações sem melhorar o best-so-far
+#
+# motor "lote" (params): as execuções de mesmo n e m rodam juntas em
+# arrays NumPy (ver lote.py), só com vizinhança "mover" + melhor melhora
+#
+# crn (params): números aleatórios comuns entre os alphas de uma
+# replicação. Todos partem de params["sol_inicial"] e, com a mesma
+# semente, dividem o rng em dois fluxos: um só decide "aleatório ou
+# melhora" a cada iteração (o mesmo u_i para todo alpha) e o outro
+# sorteia o que o passo faz. Assim as diferenças entre alphas não se
+# misturam com pontos de partida e sorteios diferentes.
+#
+# alpha_adaptativo (params): alpha muda durante a execução (ver
+# adaptacao.py); a coluna parametro vira "adaptativo" e a trajetória
+# de alpha vai para o rastro de convergência.
+# ============================================================
+
+
+def sortear_passo(sol, m, rng=random):
+    """Sorteia o passo aleatório: (tarefa, origem, destino), com destino != origem."""
+    tarefa = rng.randrange(len(sol))
+    origem = sol[tarefa]
+
+    destino = rng.randrange(m)
+    while destino == origem:
+        destino = rng.randrange(m)
+
+    return tarefa, origem, destino
+
+
+def passo_aleatorio(sol, cargas, tempos, m, indice=None, tarefas_maq=None, rng=random):
+    """Move uma tarefa para outra máquina aleatória e atualiza cargas (e os índices, se houver)."""
+    tarefa, origem, destino = sortear_passo(sol, m, rng)
+    aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice, tarefas_maq)
+
+
+def blnm_monotona_randomizada(tempos, m, alpha, max_sem_melhora=1000, avaliador="python", rng=random,
+                              vizinhanca="mover", estrategia="melhor", ordem="aleatoria",
+                              sol_inicial=None, rng_passo=None, contadores=None, rastro=None,
+                              armazenamento="listas", parada=None, construcao="aleatoria", rcl=RCL_PADRAO,
+                              adaptacao=None):
+    """
+    Busca Local Monótona Randomizada:
+    - alpha: frequência de caminhada aleatória
+    - best-so-far é o que conta para o contador sem melhora
+    - avaliador: "python" (laço) ou "numpy" (vetorizado), mesmo movimento escolhido;
+      ou "critica" (só máquinas críticas), mesmo makespan com custo O(m log n)
+    - vizinhanca: "mover", "trocar" ou "mover+trocar" no passo de melhor melhora
+      (o passo aleatório continua sendo um movimento simples)
+    - estrategia: "melhor" ou "primeira" (primeira melhora em `ordem`
+      "aleatoria" ou "rotativa") no passo de melhora
+    - sol_inicial: atribuição de partida (copiada); padrão: construída via rng
+    - construcao, rcl: construção da solução inicial quando não há sol_inicial
+      ("aleatoria", "lista", "lpt" ou "grasp"; ver construcao.py)
+    - rng_passo: fluxo do passo aleatório e da vizinhança; rng fica só com
+      a escolha "aleatório ou melhora" (padrão: rng para tudo)
+    - contadores: instrumentacao.Contadores a preencher (opcional)
+    - rastro: convergencia.RastroConvergencia que recebe cada melhora (opcional)
+    - armazenamento: "listas" ou "arrays" (arrays tipados, para instâncias
+      grandes; só "mover" com melhor melhora, mesmos movimentos)
+    - parada: parada.CriterioParada (limite inferior, alvo, orçamentos de
+      tempo), opcional; o motivo da parada fica em parada.motivo
+    - adaptacao: adaptacao.AlphaAdaptativo que substitui o alpha fixo a
+      cada época (opcional); com rastro, a trajetória de alpha vai junto
+    """
+    n = len(tempos)
+    if armazenamento == "arrays":
+        tempos = compactar_tempos(tempos)
+    if sol_inicial is None:
+        sol, cargas = construir_solucao_inicial(n, m, tempos, rng, armazenamento, construcao, rcl)
+    else:
+        sol, cargas = solucao_de(sol_inicial, tempos, m, armazenamento)
+    indice = IndiceCargas(cargas)
+
+    if rng_passo is None:
+        rng_passo = rng
+
+    if contadores is None:
+        contadores = Contadores()
+
+    avaliar, tempos_aval, tarefas_maq = preparar_vizinhanca(vizinhanca, avaliador, sol, tempos, m,
+                                                            estrategia, ordem, rng_passo, contadores, armazenamento)
+
+    best = indice.makespan()
+    sem_melhora = 0
+    it = 0
+    it_melhor = 0
+    aleatorios = melhoras = sem_movimento = 0
+    t_aval = t_mov = t_rng = 0.0
+    relogio = time.perf_counter
+    inicio = time.time()
+    if rastro is not None:
+        rastro.iniciar(best)
+
+    prox_ajuste = -1  # iteração do próximo ajuste de alpha (-1: alpha fixo)
+    if adaptacao is not None:
+        alpha = adaptacao.iniciar(best)
+        prox_ajuste = adaptacao.janela
+
+    motivo = None
+    valor_parada = fim_tempo = None
+    prox_cpu = float("inf")  # marca de relógio da próxima leitura da CPU
+    # cada marca de tempo fecha uma fase e abre a seguinte (a comparação
+    # com o best entra na fase de sorteio da iteração seguinte)
+    t0 = relogio()
+    if parada is not None:
+        parada.iniciar(t0)
+        motivo = parada.por_valor(best)
+        valor_parada, fim_tempo = parada.valor_parada, parada.fim_tempo
+        if parada.fim_cpu is not None:
+            prox_cpu = t0 + INTERVALO_CPU
+
+    while sem_melhora < max_sem_melhora and motivo is None:
+        it += 1
+
+        if rng.random() < alpha:
+            tarefa, origem, destino = sortear_passo(sol, m, rng_passo)
+            t1 = relogio()
+            aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice, tarefas_maq)
+            valor_atual = indice.makespan()
+            t2 = relogio()
+
+            t_rng += t1 - t0
+            t_mov += t2 - t1
+            t0 = t2
+            aleatorios += 1
+        else:
+            t1 = relogio()
+            tarefa, origem, destino, novo_valor, parceira = avaliar(sol, cargas, tempos_aval, m, indice)
+            t2 = relogio()
+            t_rng += t1 - t0
+            t_aval += t2 - t1
+            t0 = t2
+
+            if tarefa is not None:
+                if parceira is None:
+                    aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice, tarefas_maq)
+                else:
+                    aplicar_troca(sol, cargas, tempos, tarefa, origem, parceira, destino, indice, tarefas_maq)
+                valor_atual = novo_valor
+                t0 = relogio()
+                t_mov += t0 - t2
+                melhoras += 1
+            else:
+                valor_atual = best
+                sem_movimento += 1
+
+        if valor_atual < best:
+            best = valor_atual
+            sem_melhora = 0
+            it_melhor = it
+            if rastro is not None:
+                rastro.registrar(it, best)
+            if valor_parada is not None and best <= valor_parada:
+                motivo = parada.por_valor(best)
+        else:
+            sem_melhora += 1
+
+        if it == prox_ajuste:
+            alpha = adaptacao.ajustar(it, best)
+            prox_ajuste += adaptacao.janela
+
+        if fim_tempo is not None and motivo is None and t0 >= fim_tempo:
+            motivo = "tempo"
+        elif t0 >= prox_cpu and motivo is None:
+            prox_cpu = t0 + INTERVALO_CPU
+            if parada.cpu_esgotada():
+                motivo = "tempo_cpu"
+
+    tempo_exec = time.time() - inicio
+
+    contadores.passos_aleatorios += aleatorios
+    contadores.passos_melhora += melhoras
+    contadores.passos_sem_melhora += sem_movimento
+    contadores.tempo_avaliacao += t_aval
+    contadores.tempo_movimento += t_mov
+    contadores.tempo_rng += t_rng
+    contadores.iteracao_melhor = it_melhor
+    if parada is not None and motivo is not None:
+        parada.motivo = motivo
+    if rastro is not None and adaptacao is not None:
+        rastro.registrar_alpha(adaptacao.iteracao, adaptacao.alpha)
+    return best, it, tempo_exec
+
+
+@registrar
+class BLNM(Heuristica):
+    """
+    params: alpha, max_sem_melhora, avaliador, vizinhanca, estrategia, ordem,
+    motor, crn, sol_inicial, rastrear (grava o rastro de convergência), armazenamento,
+    parar_no_limite, alvo, tempo_maximo, tempo_cpu_maximo (ver parada.py), construcao, rcl (ver construcao.py),
+    alpha_adaptativo, janela_alpha (ver adaptacao.py; alpha é ignorado).
+    """
+    nome = "blnm_monotona_randomizada"
+    colunas_extras = (*COLUNAS_INSTRUMENTACAO, "motivo_parada")
+
+    def resolver(self, instancia, params, rng):
+        if self.agrupavel(params):
+            return self.resolver_lote([instancia], [params], [rng])[0]
+
+        rng_passo = None
+        if params.get("crn"):
+            rng, rng_passo = random.Random(rng.getrandbits(63)), random.Random(rng.getrandbits(63))
+
+        contadores = Contadores()
+        parada = criterio_de_params(params, instancia.tempos, instancia.m)
+        rastro = RastroConvergencia(limite_inferior(instancia.tempos, instancia.m)) if params.get("rastrear") else None
+        valor, it, tempo_exec = blnm_monotona_randomizada(
+            instancia.tempos, instancia.m, params.get("alpha"),
+            max_sem_melhora=params.get("max_sem_melhora", 1000),
+            avaliador=params.get("avaliador", "python"),
+            rng=rng,
+            vizinhanca=params.get("vizinhanca", "mover"),
+            estrategia=params.get("estrategia", "melhor"),
+            ordem=params.get("ordem", "aleatoria"),
+            sol_inicial=params.get("sol_inicial"),
+            rng_passo=rng_passo,
+            contadores=contadores,
+            rastro=rastro,
+            armazenamento=params.get("armazenamento", "listas"),
+            parada=parada,
+            construcao=params.get("construcao", "aleatoria"),
+            rcl=params.get("rcl", RCL_PADRAO),
+            adaptacao=alpha_de_params(params),
+        )
+        return Resultado(valor, it, tempo_exec, {**contadores.como_dict(), "motivo_parada": parada.motivo}, rastro)
+
+    def agrupavel(self, params):
+        return params.get("motor", "escalar") == "lote"
+
+    def resolver_lote(self, instancias, lista_params, rngs):
+        if not all(self.agrupavel(p) for p in lista_params):
+            return super().resolver_lote(instancias, lista_params, rngs)
+
+        for params in lista_params:
+            if params.get("vizinhanca", "mover") != "mover" or params.get("estrategia", "melhor") != "melhor":
+                raise ValueError("motor 'lote' só implementa a vizinhança 'mover' com melhor melhora")
+            if params.get("alpha_adaptativo") is not None:
+                raise ValueError("motor 'lote' só implementa alpha fixo")
+
+        rastros = [
+            RastroConvergencia(limite_inferior(inst.tempos, inst.m)) if p.get("rastrear") else None
+            for inst, p in zip(instancias, lista_params)
+        ]
+        paradas = [criterio_de_params(p, inst.tempos, inst.m) for inst, p in zip(instancias, lista_params)]
+
+        # a semente NumPy de cada réplica sai do rng do job: o resultado não depende do lote;
+        # a construção não aleatória (grasp sorteia com o mesmo rng) vem depois da semente
+        sementes = [rng.getrandbits(63) for rng in rngs]
+        sol_inicial = []
+        for inst, p, rng in zip(instancias, lista_params, rngs):
+            construcao = p.get("construcao", "aleatoria")
+            if p.get("sol_inicial") is None and construcao != "aleatoria":
+                sol_inicial.append(construir_atribuicao(construcao, inst.tempos, inst.m, rng,
+                                                        p.get("rcl", RCL_PADRAO)))
+            else:
+                sol_inicial.append(p.get("sol_inicial"))
+
+        saidas = blnm_em_lote(
+            [inst.tempos for inst in instancias], instancias[0].m,
+            [p["alpha"] for p in lista_params],
+            sementes,
+            max_sem_melhora=[p.get("max_sem_melhora", 1000) for p in lista_params],
+            sol_inicial=sol_inicial,
+            rastros=rastros,
+            paradas=paradas,
+        )
+        return [Resultado(valor, it, tempo_exec, {**extras, "motivo_parada": parada.motivo}, rastro)
+                for (valor, it, tempo_exec, extras), rastro, parada in zip(saidas, rastros, paradas)]
+
+    def parametro(self, params):
+        return "adaptativo" if params.get("alpha_adaptativo") is not None else params["alpha"]
+
+    def rotulo(self, params):
+        return rotulo_variante(self.nome, params)
@@ -0,0 +1,224 @@
+import random
+from array import array
+from bisect import bisect_left, insort
+
+from .construcao import RCL_PADRAO, construir_atribuicao
+
+# ============================================================
+# Estado de uma solução: atribuição tarefa -> máquina e cargas
+# Estruturas auxiliares mantidas a cada movimento:
+#   - IndiceCargas: heap de máximo indexado sobre as cargas
+#   - TarefasPorMaquina: tarefas de cada máquina ordenadas por tempo
+#
+# Armazenamento "arrays" (instâncias grandes): tempos e atribuição em
+# array("i") (int32) e cargas em array("q") (int64), contíguos e sem um
+# objeto Python por tarefa; o índice por máquina é TarefasPorMaquinaCompacta.
+# Os laços de busca usam as mesmas operações (indexação e atribuição),
+# então escolhem os mesmos movimentos que com listas.
+# ============================================================
+
+ARMAZENAMENTOS = ("listas", "arrays")
+
+
+def validar_armazenamento(armazenamento):
+    if armazenamento not in ARMAZENAMENTOS:
+        raise ValueError(f"armazenamento desconhecido: {armazenamento!r} (opções: {', '.join(ARMAZENAMENTOS)})")
+
+
+def compactar_tempos(tempos):
+    """Tempos em array("i") (sem cópia se já estiverem assim)."""
+    if isinstance(tempos, array) and tempos.typecode == "i":
+        return tempos
+    return array("i", tempos)
+
+
+def solucao_de(atribuicao, tempos, m, armazenamento="listas"):
+    """(sol, cargas) a partir de uma atribuição tarefa -> máquina (qualquer iterável), copiada."""
+    validar_armazenamento(armazenamento)
+    if armazenamento == "arrays":
+        sol = array("i", atribuicao)
+        cargas = array("q", bytes(8 * m))
+    else:
+        sol = list(atribuicao)
+        cargas = [0] * m
+    for i, maq in enumerate(sol):
+        cargas[maq] += tempos[i]
+    return sol, cargas
+
+
+def construir_solucao_inicial(n, m, tempos, rng=random, armazenamento="listas", construcao="aleatoria",
+                              rcl=RCL_PADRAO):
+    """
+    Gera a solução inicial e as cargas por máquina (mesmos sorteios em qualquer armazenamento).
+    construcao: "aleatoria" (padrão), "lista", "lpt" ou "grasp" (com rcl); ver construcao.py.
+    """
+    if construcao == "aleatoria":
+        return solucao_de((rng.randrange(m) for _ in range(n)), tempos, m, armazenamento)
+    return solucao_de(construir_atribuicao(construcao, tempos, m, rng, rcl), tempos, m, armazenamento)
+
+
+def limite_inferior(tempos, m):
+    """Limite inferior do makespan: max(maior tarefa, teto(soma / m))."""
+    return max(max(tempos), -(-sum(tempos) // m))
+
+
+def makespan(cargas):
+    """Retorna o maior tempo (carga) dentre as máquinas."""
+    return max(cargas)
+
+
+def aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice=None, tarefas_maq=None):
+    """Move a tarefa de origem para destino, mantendo cargas e índices em dia."""
+    p = tempos[tarefa]
+    sol[tarefa] = destino
+    cargas[origem] -= p
+    cargas[destino] += p
+    if indice is not None:
+        indice.atualizar(origem)
+        indice.atualizar(destino)
+    if tarefas_maq is not None:
+        tarefas_maq.mover(tarefa, p, origem, destino)
+
+
+def aplicar_troca(sol, cargas, tempos, tarefa, origem, parceira, destino, indice=None, tarefas_maq=None):
+    """Troca tarefa (em origem) com parceira (em destino): dois movimentos em sequência."""
+    aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice, tarefas_maq)
+    aplicar_movimento(sol, cargas, tempos, parceira, destino, origem, indice, tarefas_maq)
+
+
+# ===== Otimização: top3 para calcular makespan do vizinho rápido =====
+
+def top3_cargas(cargas):
+    """Retorna até os 3 maiores pares (carga, idx_maquina) em ordem decrescente."""
+    pares = [(c, i) for i, c in enumerate(cargas)]
+    pares.sort(reverse=True)
+    return pares[:3]
+
+
+def maior_excluindo(top3, a, b):
+    """Maior carga excluindo máquinas a e b, olhando apenas o top3."""
+    for c, i in top3:
+        if i != a and i != b:
+            return c
+    return 0
+
+
+class IndiceCargas:
+    """
+    Heap de máximo indexado sobre as cargas das máquinas.
+
+    Mantém a posição de cada máquina no heap, então quando um movimento
+    altera a carga de uma máquina basta reposicioná-la em O(log m),
+    sem reordenar todas as cargas a cada iteração.
+
+    A lista `cargas` é compartilhada (não copiada): quem altera a carga
+    de uma máquina deve chamar `atualizar(maquina)` logo em seguida.
+    """
+
+    def __init__(self, cargas):
+        self.cargas = cargas
+        # uma lista ordenada de forma decrescente já é um heap de máximo válido
+        self.heap = sorted(range(len(cargas)), key=lambda i: (cargas[i], i), reverse=True)
+        self.pos = [0] * len(cargas)
+        for k, i in enumerate(self.heap):
+            self.pos[i] = k
+
+    def _chave(self, i):
+        return (self.cargas[i], i)
+
+    def _trocar(self, k1, k2):
+        heap = self.heap
+        heap[k1], heap[k2] = heap[k2], heap[k1]
+        self.pos[heap[k1]] = k1
+        self.pos[heap[k2]] = k2
+
+    def _subir(self, k):
+        while k > 0:
+            pai = (k - 1) // 2
+            if self._chave(self.heap[k]) <= self._chave(self.heap[pai]):
+                break
+            self._trocar(k, pai)
+            k = pai
+        return k
+
+    def _descer(self, k):
+        tam = len(self.heap)
+        while True:
+            maior = k
+            for filho in (2 * k + 1, 2 * k + 2):
+                if filho < tam and self._chave(self.heap[filho]) > self._chave(self.heap[maior]):
+                    maior = filho
+            if maior == k:
+                return k
+            self._trocar(k, maior)
+            k = maior
+
+    def atualizar(self, maquina):
+        """Reposiciona a máquina no heap após sua carga ter mudado."""
+        k = self.pos[maquina]
+        if self._subir(k) == k:
+            self._descer(k)
+
+    def makespan(self):
+        """Maior carga atual, em O(1)."""
+        return self.cargas[self.heap[0]]
+
+    def top3(self):
+        """
+        Mesmo resultado de top3_cargas(cargas), em O(1):
+        os 3 maiores elementos de um heap estão sempre nos 3 primeiros níveis.
+        """
+        pares = [(self.cargas[i], i) for i in self.heap[:7]]
+        pares.sort(reverse=True)
+        return pares[:3]
+
+    def maior_excluindo(self, a, b):
+        """Maior carga excluindo máquinas a e b, sem varrer as m cargas."""
+        return maior_excluindo(self.top3(), a, b)
+
+
+class TarefasPorMaquina:
+    """
+    Para cada máquina, lista de pares (tempo, tarefa) ordenada por tempo.
+
+    Mantida a cada movimento (remoção + inserção por busca binária),
+    permite achar por bisect a tarefa de tempo mais próximo de um alvo.
+    """
+
+    def __init__(self, sol, tempos, m):
+        self.listas = [[] for _ in range(m)]
+        for tarefa, maq in enumerate(sol):
+            self.listas[maq].append((tempos[tarefa], tarefa))
+        for lista in self.listas:
+            lista.sort()
+
+    def mover(self, tarefa, p, origem, destino):
+        lista = self.listas[origem]
+        del lista[bisect_left(lista, (p, tarefa))]
+        insort(self.listas[destino], (p, tarefa))
+
+
+class TarefasPorMaquinaCompacta:
+    """
+    TarefasPorMaquina sem objetos por tarefa: cada máquina guarda um
+    array("q") ordenado de chaves p * base + tarefa (base = n), que ordenam
+    exatamente como os pares (tempo, tarefa). 8 bytes por tarefa.
+
+    Mover é busca binária + remoção/inserção no array (memmove em C,
+    proporcional às tarefas da máquina, não a n).
+    """
+
+    def __init__(self, sol, tempos, m):
+        self.base = base = len(tempos)
+        self.listas = [array("q") for _ in range(m)]
+        for tarefa, maq in enumerate(sol):
+            self.listas[maq].append(tempos[tarefa] * base + tarefa)
+        # ordena uma máquina por vez: a lista temporária tem só n/m chaves
+        for maq, lista in enumerate(self.listas):
+            self.listas[maq] = array("q", sorted(lista))
+
+    def mover(self, tarefa, p, origem, destino):
+        chave = p * self.base + tarefa
+        lista = self.listas[origem]
+        del lista[bisect_left(lista, chave)]
+        insort(self.listas[destino], chave)
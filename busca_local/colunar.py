@@ -0,0 +1,133 @@
+import json
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow é opcional: sem ele, só TXT/XLSX
+    pa = None
+
+from .exportacao import formatar_tempo_min_seg, texto_parametro
+
+# ============================================================
+# Resultados em formato colunar (Arrow IPC, ".arrow")
+#
+# Mesmas colunas do TXT/XLSX, já tipadas, e o resumo do experimento
+# guardado nos metadados do schema (chave "resumo", JSON). O dashboard
+# lê o arquivo por mmap em milissegundos, sem o parse do XLSX.
+#
+# parametro vira float64 (alpha, nulo se não numérico) e, logo depois
+# dele, parametro_texto guarda o valor não numérico ("NA" no BLM,
+# "adaptativo"), nulo para alpha.
+# ============================================================
+
+CHAVE_RESUMO = b"resumo"
+LINHAS_POR_LOTE = 8192
+
+ARROW_DISPONIVEL = pa is not None
+
+# exceções do pyarrow (leitura/gravação), para um except que também roda sem ele
+ERROS_ARROW = (pa.ArrowException,) if pa is not None else ()
+
+if pa is not None:
+    TIPOS_BASE = {
+        "heuristica": pa.string(),
+        "n": pa.int64(),
+        "m": pa.int64(),
+        "replicacao": pa.int64(),
+        "tempo": pa.float64(),
+        "iteracoes": pa.int64(),
+        "valor": pa.int64(),
+        "parametro": pa.float64(),
+        "parametro_texto": pa.string(),
+        "instancia": pa.string(),
+    }
+
+
+def _exigir_pyarrow():
+    if pa is None:
+        raise ImportError("formato colunar requer pyarrow (pip install pyarrow)")
+
+
+def _lote(colunas, valores, schema=None):
+    """RecordBatch com as colunas acumuladas; sem schema, extras têm o tipo inferido."""
+    if schema is not None:
+        return pa.RecordBatch.from_pydict(valores, schema=schema)
+
+    arrays = [
+        pa.array(valores[c], type=TIPOS_BASE.get(c))
+        for c in colunas
+    ]
+    return pa.RecordBatch.from_arrays(arrays, names=colunas)
+
+
+def exportar_arrow(caminho, linhas, colunas, tempo_total_script, resumo):
+    """
+    Grava as linhas em Arrow IPC, em lotes de LINHAS_POR_LOTE (sem
+    guardar todas em memória), com o resumo nos metadados do schema.
+    """
+    _exigir_pyarrow()
+
+    if "parametro" in colunas:
+        i = colunas.index("parametro") + 1
+        colunas = [*colunas[:i], "parametro_texto", *colunas[i:]]
+
+    meta = {
+        "tempo_total_s": tempo_total_script,
+        "tempo_total_str": formatar_tempo_min_seg(tempo_total_script),
+        "titulo": resumo["titulo"],
+        "esperado_registros": resumo["esperado_registros"],
+        "itens": resumo["itens"],
+        "itens_estatisticas": resumo.get("itens_estatisticas", []),
+        "secao": resumo["secao"],
+    }
+    metadados = {CHAVE_RESUMO: json.dumps(meta, ensure_ascii=False, default=str).encode("utf-8")}
+
+    writer = None
+    schema = None
+    valores = {c: [] for c in colunas}
+    pendentes = 0
+
+    def descarregar():
+        nonlocal writer, schema, valores, pendentes
+        lote = _lote(colunas, valores, schema)
+        if writer is None:
+            schema = lote.schema.with_metadata(metadados)
+            lote = lote.replace_schema_metadata(metadados)
+            writer = pa.ipc.new_file(caminho, schema)
+        writer.write_batch(lote)
+        valores = {c: [] for c in colunas}
+        pendentes = 0
+
+    try:
+        for linha in linhas:
+            for c in colunas:
+                if c == "parametro_texto":
+                    v = texto_parametro(linha["parametro"])
+                else:
+                    v = linha[c]
+                    if c == "parametro" and not isinstance(v, (int, float)):
+                        v = None  # "NA" / "adaptativo": vai em parametro_texto
+                valores[c].append(v)
+            pendentes += 1
+            if pendentes == LINHAS_POR_LOTE:
+                descarregar()
+
+        if pendentes or writer is None:
+            descarregar()
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def ler_arrow(caminho):
+    """
+    Lê um arquivo gravado por exportar_arrow via mmap.
+    Devolve (tabela pyarrow, resumo dict).
+    """
+    _exigir_pyarrow()
+
+    with pa.memory_map(caminho, "r") as fonte:
+        tabela = pa.ipc.open_file(fonte).read_all()
+
+    bruto = (tabela.schema.metadata or {}).get(CHAVE_RESUMO)
+    resumo = json.loads(bruto) if bruto else {}
+    return tabela, resumo
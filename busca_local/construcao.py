@@ -0,0 +1,75 @@
+import random
+from bisect import bisect_right, insort
+from heapq import heapreplace
+
+# ============================================================
+# Construção da solução inicial (atribuição tarefa -> máquina)
+#
+#   aleatoria  cada tarefa numa máquina sorteada (padrão; ver cargas.py)
+#   lista      list scheduling: tarefas na ordem dada (índice), cada uma
+#              na máquina de menor carga (heap de mínimo, O(n log m))
+#   lpt        longest processing time: a mesma regra com as tarefas em
+#              ordem decrescente de tempo (makespan <= 4/3 - 1/(3m) do ótimo)
+#   grasp      LPT randomizado: cada tarefa vai para uma máquina sorteada
+#              da lista restrita de candidatas (RCL), as de carga
+#              <= menor + rcl * (maior - menor); rcl = 0 é o LPT com
+#              desempate aleatório e rcl = 1, qualquer máquina
+#
+# Empates de carga no heap vão para a máquina de menor índice, então
+# lista e lpt são determinísticas (não consomem o rng).
+# ============================================================
+
+CONSTRUCOES = ("aleatoria", "lista", "lpt", "grasp")
+
+RCL_PADRAO = 0.3
+
+
+def ordem_lpt(tempos):
+    """Índices das tarefas em ordem decrescente de tempo (empates na ordem original)."""
+    return sorted(range(len(tempos)), key=tempos.__getitem__, reverse=True)
+
+
+def atribuicao_lista(tempos, m, ordem=None):
+    """List scheduling: cada tarefa de `ordem` (padrão: 0..n-1) na máquina de menor carga."""
+    sol = [0] * len(tempos)
+    heap = [(0, i) for i in range(m)]  # já é um heap válido
+    for tarefa in range(len(tempos)) if ordem is None else ordem:
+        carga, maq = heap[0]
+        sol[tarefa] = maq
+        heapreplace(heap, (carga + tempos[tarefa], maq))
+    return sol
+
+
+def atribuicao_lpt(tempos, m):
+    """LPT: list scheduling com as tarefas da maior para a menor."""
+    return atribuicao_lista(tempos, m, ordem_lpt(tempos))
+
+
+def atribuicao_grasp(tempos, m, rcl=RCL_PADRAO, rng=random):
+    """
+    LPT randomizado (construção do GRASP). As máquinas ficam numa lista
+    ordenada de (carga, máquina): a RCL é um prefixo dela (bisect) e a
+    escolhida é reinserida com insort, O(log m) comparações por tarefa.
+    """
+    sol = [0] * len(tempos)
+    fila = [(0, i) for i in range(m)]
+    for tarefa in ordem_lpt(tempos):
+        menor, maior = fila[0][0], fila[-1][0]
+        k = bisect_right(fila, (menor + rcl * (maior - menor), m))
+        carga, maq = fila.pop(rng.randrange(k))
+        sol[tarefa] = maq
+        insort(fila, (carga + tempos[tarefa], maq))
+    return sol
+
+
+def construir_atribuicao(construcao, tempos, m, rng=random, rcl=RCL_PADRAO):
+    """Atribuição inicial de uma construção não aleatória (lista, lpt ou grasp)."""
+    if construcao == "lista":
+        return atribuicao_lista(tempos, m)
+    if construcao == "lpt":
+        return atribuicao_lpt(tempos, m)
+    if construcao == "grasp":
+        if not 0 <= rcl <= 1:
+            raise ValueError(f"rcl deve estar em [0, 1], não {rcl!r}")
+        return atribuicao_grasp(tempos, m, rcl, rng)
+    raise ValueError(f"construção desconhecida: {construcao!r} (opções: {', '.join(CONSTRUCOES)})")
@@ -0,0 +1,96 @@
+import base64
+import sys
+import time
+from array import array
+
+# ============================================================
+# Rastro de convergência: (iteração, tempo decorrido, best) a cada
+# melhora do best-so-far, mais o ponto inicial (iteração 0).
+#
+# Guardado em arrays tipados (array: uint32, float64, int64), sem
+# objetos Python por ponto. Cada execução rastreada vira uma linha do
+# arquivo "<id>.rastro.jsonl" do experimento, gravada ao lado do JSONL
+# de resultados (mesmo gravador, à prova de queda):
+#   {"chave": [heuristica, n, m, replicacao, parametro, instancia],
+#    "limite_inferior": LB, "pontos": k,
+#    "iteracao": b64, "tempo": b64, "valor": b64}
+# com os arrays em little-endian codificados em base64. Execuções com
+# alpha adaptativo (BLNM) levam também a trajetória de alpha, um ponto
+# por mudança: "alpha_iteracao": b64, "alpha": b64.
+# ============================================================
+
+TIPOS_RASTRO = {"iteracao": "I", "tempo": "d", "valor": "q"}
+TIPOS_ALPHA = {"alpha_iteracao": "I", "alpha": "d"}
+
+
+def _para_bytes(arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _de_bytes(typecode, dados):
+    arr = array(typecode)
+    arr.frombytes(dados)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class RastroConvergencia:
+    """
+    Pontos de melhora de uma execução. O laço de busca chama iniciar(best)
+    antes da primeira iteração e registrar(it, best) a cada melhora.
+    limite_inferior: LB da instância, para o dashboard calcular gaps.
+    """
+    __slots__ = ("limite_inferior", "iteracao", "tempo", "valor", "alpha_iteracao", "alpha", "_inicio")
+
+    def __init__(self, limite_inferior=None):
+        self.limite_inferior = limite_inferior
+        self.iteracao = array(TIPOS_RASTRO["iteracao"])
+        self.tempo = array(TIPOS_RASTRO["tempo"])
+        self.valor = array(TIPOS_RASTRO["valor"])
+        self.alpha_iteracao = None
+        self.alpha = None
+        self._inicio = None
+
+    def iniciar(self, valor):
+        self._inicio = time.perf_counter()
+        self.registrar(0, valor, 0.0)
+
+    def registrar(self, iteracao, valor, decorrido=None):
+        """Anota uma melhora; decorrido (s) padrão: tempo desde iniciar()."""
+        if decorrido is None:
+            decorrido = time.perf_counter() - self._inicio
+        self.iteracao.append(iteracao)
+        self.tempo.append(decorrido)
+        self.valor.append(valor)
+
+    def registrar_alpha(self, iteracao, alpha):
+        """Trajetória de alpha da execução: (iteração, alpha) a cada mudança."""
+        self.alpha_iteracao = array(TIPOS_ALPHA["alpha_iteracao"], iteracao)
+        self.alpha = array(TIPOS_ALPHA["alpha"], alpha)
+
+    def __len__(self):
+        return len(self.iteracao)
+
+    def como_registro(self):
+        """Dict serializável (arrays em base64), sem a chave da execução."""
+        reg = {"limite_inferior": self.limite_inferior, "pontos": len(self)}
+        campos = list(TIPOS_RASTRO) + (list(TIPOS_ALPHA) if self.alpha is not None else [])
+        for campo in campos:
+            reg[campo] = base64.b64encode(_para_bytes(getattr(self, campo))).decode("ascii")
+        return reg
+
+
+def decodificar_rastro(reg):
+    """
+    {iteracao, tempo, valor} como arrays tipados, a partir de uma linha do
+    .rastro.jsonl, mais {alpha_iteracao, alpha} quando a linha os tem.
+    """
+    return {
+        campo: _de_bytes(tipo, base64.b64decode(reg[campo]))
+        for campo, tipo in {**TIPOS_RASTRO, **TIPOS_ALPHA}.items()
+        if campo in reg
+    }
@@ -0,0 +1,200 @@
+import math
+from statistics import NormalDist
+
+# ============================================================
+# Corrida (racing, F-race) entre candidatos de um parâmetro (alphas do BLNM)
+#
+# Em vez de rodar todos os candidatos em todas as instâncias, a varredura
+# anda em rodadas: cada rodada roda os candidatos ainda vivos em novas
+# instâncias (blocos). Depois de cada rodada, com pelo menos
+# blocos_minimos blocos, o teste de Friedman (postos dentro de cada
+# bloco, então instâncias de escalas diferentes pesam igual) verifica se
+# algum candidato difere; se sim (p < nivel), o pós-teste de Conover
+# elimina os candidatos cuja soma de postos passa a do melhor por mais
+# que a diferença crítica. As instâncias seguintes só rodam os vivos.
+#
+# Mesmas fórmulas do F-race de Birattari et al. (e do irace):
+#   R_j = soma dos postos do candidato j, A = soma dos postos ao quadrado
+#   T = (k - 1) * soma_j (R_j - b (k + 1) / 2)^2 / (A - b k (k + 1)^2 / 4) ~ qui2(k - 1)
+#   eliminado se R_j - R_melhor > t(1 - nivel/2, (b-1)(k-1)) * sqrt(2 (b A - soma R_j^2) / ((b-1)(k-1)))
+# Sem scipy: a cauda da qui-quadrado sai da gama incompleta e o quantil
+# t, da expansão de Cornish-Fisher em torno da normal.
+#
+# O F-race só elimina com diferença significativa, e alphas vizinhos
+# (0.1..0.3) quase nunca se separam em poucas instâncias. O método
+# "halving" (successive halving) troca a garantia estatística por
+# orçamento: a cada rodada fica a metade (arredondada para cima) de
+# melhor posto médio, então 9 candidatos acabam em 4 rodadas (9, 5, 3, 2).
+# ============================================================
+
+METODOS_CORRIDA = ("friedman", "halving")
+
+NIVEL_PADRAO = 0.05
+BLOCOS_MINIMOS = 5
+
+
+def postos(valores):
+    """Postos de 1 (menor) a k, com a média dos postos nos empates."""
+    ordem = sorted(range(len(valores)), key=valores.__getitem__)
+    saida = [0.0] * len(valores)
+    i = 0
+    while i < len(ordem):
+        j = i
+        while j + 1 < len(ordem) and valores[ordem[j + 1]] == valores[ordem[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            saida[ordem[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return saida
+
+
+def _gama_q(a, x):
+    """Gama incompleta superior regularizada Q(a, x) (série ou fração contínua)."""
+    if x <= 0:
+        return 1.0
+    ln_frente = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        termo = soma = 1 / a
+        for n in range(1, 1000):
+            termo *= x / (a + n)
+            soma += termo
+            if abs(termo) < abs(soma) * 1e-15:
+                break
+        return max(0.0, 1 - soma * math.exp(ln_frente))
+
+    # fração contínua de Lentz
+    minusculo = 1e-300
+    b = x + 1 - a
+    c = 1 / minusculo
+    d = 1 / b
+    h = d
+    for n in range(1, 1000):
+        an = -n * (n - a)
+        b += 2
+        d = an * d + b
+        d = minusculo if abs(d) < minusculo else d
+        c = b + an / c
+        c = minusculo if abs(c) < minusculo else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(ln_frente) * h
+
+
+def p_qui2(x, gl):
+    """P(X >= x) para X ~ qui-quadrado com gl graus de liberdade."""
+    return _gama_q(gl / 2, x / 2)
+
+
+def quantil_t(p, gl):
+    """Quantil p da t de Student (Cornish-Fisher; erro < 0,01 para gl >= 4)."""
+    z = NormalDist().inv_cdf(p)
+    z3, z5 = z ** 3, z ** 5
+    return (z + (z3 + z) / (4 * gl) + (5 * z5 + 16 * z3 + 3 * z) / (96 * gl ** 2)
+            + (3 * z ** 7 + 19 * z5 + 17 * z3 - 15 * z) / (384 * gl ** 3))
+
+
+def teste_friedman(blocos):
+    """
+    blocos: b listas com os valores dos mesmos k candidatos (menor é melhor).
+    Devolve (estatistica, p, somas_de_postos, soma_postos_quadrado).
+    """
+    b, k = len(blocos), len(blocos[0])
+    linhas = [postos(bloco) for bloco in blocos]
+    somas = [sum(linha[j] for linha in linhas) for j in range(k)]
+    a = sum(r * r for linha in linhas for r in linha)
+    c = b * k * (k + 1) ** 2 / 4
+    if a - c <= 0:  # todos empatados em todos os blocos
+        return 0.0, 1.0, somas, a
+    t = (k - 1) * sum((r - b * (k + 1) / 2) ** 2 for r in somas) / (a - c)
+    return t, p_qui2(t, k - 1), somas, a
+
+
+def piores_que_o_melhor(somas, a, b, nivel=NIVEL_PADRAO):
+    """Índices dos candidatos cuja soma de postos passa a do melhor pela diferença crítica (Conover)."""
+    k = len(somas)
+    gl = (b - 1) * (k - 1)
+    critica = quantil_t(1 - nivel / 2, gl) * math.sqrt(max(0.0, 2 * (b * a - sum(r * r for r in somas)) / gl))
+    melhor = min(somas)
+    return [j for j, r in enumerate(somas) if r - melhor > critica]
+
+
+class Corrida:
+    """
+    Estado de uma corrida: candidatos vivos, blocos já rodados e o
+    histórico de rodadas (p do teste e quem saiu em cada uma).
+    metodo: "friedman" (F-race) ou "halving" (successive halving).
+    """
+
+    def __init__(self, candidatos, metodo="friedman", nivel=NIVEL_PADRAO, blocos_minimos=BLOCOS_MINIMOS):
+        if metodo not in METODOS_CORRIDA:
+            raise ValueError(f"método de corrida desconhecido: {metodo!r} (opções: {', '.join(METODOS_CORRIDA)})")
+        self.candidatos = list(candidatos)
+        self.vivos = list(candidatos)
+        self.metodo = metodo
+        self.nivel = nivel
+        self.blocos_minimos = blocos_minimos
+        self.blocos = []
+        self.rodadas = []
+        self.eliminacoes = []
+
+    def adicionar_bloco(self, valores):
+        """valores: {candidato: valor} de uma instância, com todos os vivos."""
+        faltando = [c for c in self.vivos if c not in valores]
+        if faltando:
+            raise ValueError(f"bloco sem valor para os candidatos vivos {faltando}")
+        self.blocos.append(dict(valores))
+
+    def postos_medios(self):
+        """{candidato vivo: posto médio entre os vivos} nos blocos rodados."""
+        if not self.blocos:
+            return {c: None for c in self.vivos}
+        linhas = [postos([bloco[c] for c in self.vivos]) for bloco in self.blocos]
+        return {c: sum(linha[j] for linha in linhas) / len(linhas) for j, c in enumerate(self.vivos)}
+
+    def testar(self, rodada):
+        """Fecha uma rodada: aplica o teste e elimina os piores; devolve os eliminados."""
+        registro = {"rodada": rodada, "blocos": len(self.blocos), "vivos": list(self.vivos), "p": None,
+                    "eliminados": []}
+
+        piores = set()
+        if len(self.vivos) > 1 and len(self.blocos) >= self.blocos_minimos:
+            if self.metodo == "halving":
+                ficam = set(self.vencedores()[:(len(self.vivos) + 1) // 2])
+                piores = {j for j, c in enumerate(self.vivos) if c not in ficam}
+            else:
+                matriz = [[bloco[c] for c in self.vivos] for bloco in self.blocos]
+                _, p, somas, a = teste_friedman(matriz)
+                registro["p"] = p
+                if p < self.nivel:
+                    piores = set(piores_que_o_melhor(somas, a, len(matriz), self.nivel))
+
+        if piores:
+            medios = self.postos_medios()
+            for j in sorted(piores):
+                c = self.vivos[j]
+                registro["eliminados"].append(c)
+                self.eliminacoes.append({"candidato": c, "rodada": rodada, "blocos": len(self.blocos),
+                                         "posto_medio": medios[c]})
+            self.vivos = [c for j, c in enumerate(self.vivos) if j not in piores]
+
+        self.rodadas.append(registro)
+        return registro["eliminados"]
+
+    def vencedores(self):
+        """Vivos do melhor para o pior posto médio (empates na ordem dos candidatos)."""
+        medios = self.postos_medios()
+        return sorted(self.vivos, key=lambda c: (medios[c] is None, medios[c] or 0))
+
+    def como_dict(self):
+        return {
+            "metodo": self.metodo,
+            "nivel": self.nivel,
+            "blocos_minimos": self.blocos_minimos,
+            "candidatos": self.candidatos,
+            "vencedores": self.vencedores(),
+            "eliminacoes": self.eliminacoes,
+            "rodadas": self.rodadas,
+        }
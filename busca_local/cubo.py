@@ -0,0 +1,95 @@
+import json
+
+from .exportacao import formatar_tempo_min_seg, texto_parametro
+
+# ============================================================
+# Cubo pré-agregado dos resultados (".cubo.json", ao lado do JSONL)
+#
+# Uma célula por (heuristica, m, n, parametro, parametro_texto) com, para valor, tempo e
+# iteracoes: soma, soma dos quadrados, mínimo e máximo, além do número de
+# registros. Qualquer filtro/agrupamento sobre essas chaves (médias,
+# desvios, extremos) sai somando células, sem reler as linhas brutas.
+#
+# Além de CAMPOS_CUBO, os scripts agregam as colunas numéricas extras das
+# heurísticas (ex: instrumentação); a lista gravada fica em "campos".
+# Colunas de texto (CATEGORIAS_CUBO, ex: motivo_parada) viram contagens
+# por valor, em chaves "coluna=valor"; a lista fica em "categorias".
+#
+# parametro não numérico vira null, com o valor ("NA" no BLM,
+# "adaptativo") em parametro_texto (null para alpha). O arquivo leva
+# também o tempo total do script, para o dashboard montar os KPIs só com
+# o cubo.
+# ============================================================
+
+CHAVES_CUBO = ["heuristica", "m", "n", "parametro", "parametro_texto"]
+CAMPOS_CUBO = ["valor", "tempo", "iteracoes"]
+CATEGORIAS_CUBO = ["motivo_parada"]
+
+
+def calcular_cubo(linhas, campos=CAMPOS_CUBO, categorias=()):
+    """Uma passada pelas linhas; devolve a lista de células ordenada pelas chaves."""
+    celulas = {}
+    contagens = set()
+    for linha in linhas:
+        p = linha["parametro"]
+        texto = texto_parametro(p)
+        chave = (linha["heuristica"], linha["m"], linha["n"], None if texto is not None else p, texto)
+
+        c = celulas.get(chave)
+        if c is None:
+            c = celulas[chave] = dict(zip(CHAVES_CUBO, chave), registros=0)
+            for campo in campos:
+                c[f"{campo}_soma"] = 0
+                c[f"{campo}_soma2"] = 0
+                c[f"{campo}_min"] = None
+                c[f"{campo}_max"] = None
+
+        c["registros"] += 1
+        for campo in campos:
+            v = linha[campo]
+            c[f"{campo}_soma"] += v
+            c[f"{campo}_soma2"] += v * v
+            if c[f"{campo}_min"] is None or v < c[f"{campo}_min"]:
+                c[f"{campo}_min"] = v
+            if c[f"{campo}_max"] is None or v > c[f"{campo}_max"]:
+                c[f"{campo}_max"] = v
+        for coluna in categorias:
+            v = linha.get(coluna)
+            if v is not None:
+                k = f"{coluna}={v}"
+                c[k] = c.get(k, 0) + 1
+                contagens.add(k)
+
+    # toda célula com todas as contagens (0 onde o valor não apareceu)
+    for c in celulas.values():
+        for k in sorted(contagens):
+            c.setdefault(k, 0)
+
+    def ordem(chave):
+        h, m, n, p, texto = chave
+        return (h, m, n, p is not None, p or 0, texto or "")
+
+    return [celulas[k] for k in sorted(celulas, key=ordem)]
+
+
+def exportar_cubo(caminho, cubo, tempo_total_script, campos=CAMPOS_CUBO, categorias=()):
+    """Grava o cubo em JSON, com o tempo total do script."""
+    dados = {
+        "chaves": CHAVES_CUBO,
+        "campos": list(campos),
+        "categorias": list(categorias),
+        "resumo": {
+            "tempo_total_s": tempo_total_script,
+            "tempo_total_str": formatar_tempo_min_seg(tempo_total_script),
+        },
+        "celulas": cubo,
+    }
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False)
+
+
+def ler_cubo(caminho):
+    """(células, resumo) gravados por exportar_cubo."""
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    return dados["celulas"], dados.get("resumo", {})
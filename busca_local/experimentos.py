@@ -0,0 +1,279 @@
+import os
+import random
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .heuristicas import Instancia, obter_heuristica
+from .instancias import abrir_suite
+from .resultados import gravar_metadados, ler_metadados, ler_resultados
+
+# ============================================================
+# Execução da grade de experimentos (serial ou em paralelo)
+#
+# Um job é (heuristica, instancia, replicacao, params, semente), onde
+# instancia é uma Instancia ou uma referência (caminho_suite, id).
+# Jobs consecutivos que a heurística sabe rodar juntos (agrupavel, mesmo
+# n e m) viram um lote, executado por resolver_lote em um só processo.
+# Cada linha de resultado é um dict com as colunas exportadas:
+#   heuristica, n, m, replicacao, tempo, iteracoes, valor, parametro,
+#   instancia + colunas_extras da heurística
+#
+# O caminho da suíte vai para o .meta.json relativo à raiz do repositório,
+# para o experimento poder ser retomado em outro clone ou máquina.
+# ============================================================
+
+RAIZ_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def derivar_semente(semente_base, *chave):
+    """Semente determinística de um job, derivada da semente base e da chave do job."""
+    texto = ":".join(str(x) for x in (semente_base, *chave))
+    return random.Random(texto).getrandbits(63)
+
+
+def carregar_instancia(ref, compacto=False):
+    """
+    Instancia pronta ou referência (caminho_suite, id) lida da suíte por mmap;
+    compacto: tempos em array("i") (armazenamento "arrays").
+    """
+    if isinstance(ref, Instancia):
+        return ref
+    caminho, id_inst = ref
+    return abrir_suite(caminho).instancia(id_inst, compacto)
+
+
+def _compacto(params):
+    return params.get("armazenamento") == "arrays"
+
+
+TAMANHO_MAXIMO_LOTE = 128
+
+
+def forma_instancia(ref):
+    """(n, m) de uma Instancia ou referência, sem carregar os tempos."""
+    if isinstance(ref, Instancia):
+        return ref.n, ref.m
+    caminho, id_inst = ref
+    entrada = abrir_suite(caminho).entradas[id_inst]
+    return entrada["n"], entrada["m"]
+
+
+def _linha(heuristica, instancia, rep, params, res):
+    """Linha de resultado (colunas exportadas) de uma execução."""
+    linha = {
+        "heuristica": heuristica.rotulo(params),
+        "n": instancia.n,
+        "m": instancia.m,
+        "replicacao": rep,
+        "tempo": res.tempo,
+        "iteracoes": res.iteracoes,
+        "valor": res.valor,
+        "parametro": heuristica.parametro(params),
+        "instancia": instancia.id or "NA",
+    }
+    linha.update(res.extras)
+    if res.rastro is not None:
+        linha["rastro"] = res.rastro.como_registro()  # sai da linha em separar_rastro
+    return linha
+
+
+def executar_job(job):
+    """Executa uma busca isolada; roda no processo trabalhador."""
+    nome, ref, rep, params, semente = job
+
+    heuristica = obter_heuristica(nome)
+    instancia = carregar_instancia(ref, _compacto(params))
+    res = heuristica.resolver(instancia, params, random.Random(semente))
+    return _linha(heuristica, instancia, rep, params, res)
+
+
+def executar_lote(lote):
+    """Executa um lote de agrupar_jobs (lista de jobs); devolve as linhas na ordem dos jobs."""
+    if len(lote) == 1:
+        return [executar_job(lote[0])]
+
+    heuristica = obter_heuristica(lote[0][0])
+    instancias = [carregar_instancia(ref, _compacto(params)) for _, ref, _, params, _ in lote]
+    resultados = heuristica.resolver_lote(
+        instancias, [params for *_, params, _ in lote], [random.Random(semente) for *_, semente in lote]
+    )
+    return [_linha(heuristica, inst, rep, params, res)
+            for inst, (_, _, rep, params, _), res in zip(instancias, lote, resultados)]
+
+
+def agrupar_jobs(jobs, tamanho_maximo=TAMANHO_MAXIMO_LOTE):
+    """
+    Divide os jobs em lotes, sem mudar a ordem: jobs consecutivos da mesma
+    heurística, agrupáveis e com instâncias de mesmo (n, m) vão para o mesmo
+    lote (até tamanho_maximo); os demais ficam sozinhos.
+    """
+    lotes = []
+    chave_anterior = None
+    for job in jobs:
+        nome, ref, _, params, _ = job
+        chave = (nome, forma_instancia(ref)) if obter_heuristica(nome).agrupavel(params) else None
+
+        if chave is not None and chave == chave_anterior and len(lotes[-1]) < tamanho_maximo:
+            lotes[-1].append(job)
+        else:
+            lotes.append([job])
+        chave_anterior = chave
+    return lotes
+
+
+def chave_resultado(linha):
+    """Identifica uma execução: (heuristica, n, m, replicacao, parametro, instancia)."""
+    return (linha["heuristica"], linha["n"], linha["m"], linha["replicacao"],
+            linha["parametro"], linha["instancia"])
+
+
+def separar_rastro(linha):
+    """
+    Tira da linha o rastro de convergência (se a execução foi rastreada) e
+    o devolve pronto para o .rastro.jsonl, com a chave da execução.
+    """
+    rastro = linha.pop("rastro", None)
+    if rastro is None:
+        return None
+    return {"chave": list(chave_resultado(linha)), **rastro}
+
+
+def chave_job(job):
+    """Mesma chave de chave_resultado, calculada antes de executar o job."""
+    nome, ref, rep, params, _ = job
+    heuristica = obter_heuristica(nome)
+
+    n, m = forma_instancia(ref)
+    id_inst = (ref.id or "NA") if isinstance(ref, Instancia) else ref[1]
+
+    return (heuristica.rotulo(params), n, m, rep, heuristica.parametro(params), id_inst)
+
+
+def filtrar_pendentes(jobs, caminho_resultados):
+    """Jobs que ainda não têm linha no arquivo de resultados (todos, se ele não existe)."""
+    if not os.path.exists(caminho_resultados):
+        return list(jobs)
+
+    concluidos = {chave_resultado(linha) for linha in ler_resultados(caminho_resultados)}
+    return [job for job in jobs if chave_job(job) not in concluidos]
+
+
+def _relativo_a_raiz(caminho):
+    """Caminho relativo à raiz do repositório (absoluto se estiver em outro disco)."""
+    if caminho is None or not os.path.isabs(caminho):
+        return caminho
+    try:
+        return os.path.relpath(caminho, RAIZ_REPO)
+    except ValueError:
+        return caminho
+
+
+def _resolver_na_raiz(caminho):
+    """Inverso de _relativo_a_raiz; caminhos absolutos (metadados antigos) ficam como estão."""
+    if caminho is None:
+        return None
+    return os.path.normpath(os.path.join(RAIZ_REPO, caminho))
+
+
+def abrir_experimento(out_dir, prefixo, experimento=None, retomar=False, semente=None, instancias=None):
+    """
+    Resolve o ID, os caminhos de saída e os metadados de um experimento.
+
+    experimento: ID usado nos nomes dos arquivos (padrão: timestamp atual)
+    retomar: continua um experimento existente, reaproveitando a semente e a
+             suíte gravadas nos metadados; sem retomar, um ID já usado é erro.
+
+    Devolve um dict com id, jsonl, txt, xlsx, arrow, cubo, rastro, meta, semente, instancias e
+    tempo_anterior (segundos já gastos em sessões anteriores).
+    """
+    if experimento is None:
+        if retomar:
+            raise ValueError("para retomar, informe o ID do experimento (--experimento)")
+        experimento = time.strftime("%d-%m-%Y_%H-%M-%S")
+
+    base = os.path.join(out_dir, f"{prefixo}_{experimento}")
+    exp = {
+        "id": experimento,
+        "jsonl": base + ".jsonl",
+        "txt": base + ".txt",
+        "xlsx": base + ".xlsx",
+        "arrow": base + ".arrow",
+        "cubo": base + ".cubo.json",
+        "rastro": base + ".rastro.jsonl",
+        "meta": base + ".meta.json",
+        "tempo_anterior": 0.0,
+    }
+
+    meta = ler_metadados(exp["meta"])
+    if retomar:
+        if meta is None:
+            raise ValueError(f"experimento {experimento!r} não encontrado em {out_dir}")
+        if semente is not None and semente != meta["semente"]:
+            raise ValueError(f"semente {semente} difere da gravada no experimento ({meta['semente']})")
+        semente = meta["semente"]
+        instancias = instancias or _resolver_na_raiz(meta["instancias"])
+        exp["tempo_anterior"] = meta.get("tempo_total", 0.0)
+    elif meta is not None or os.path.exists(exp["jsonl"]):
+        raise ValueError(f"experimento {experimento!r} já existe; use --retomar para continuar")
+
+    if semente is None:
+        semente = random.SystemRandom().getrandbits(63)
+
+    exp["semente"] = semente
+    exp["instancias"] = instancias
+    return exp
+
+
+def versao_codigo():
+    """Versão do código (git describe, com -dirty se houver alterações), ou None fora do git."""
+    try:
+        saida = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return saida.stdout.strip() or None
+
+
+def salvar_experimento(exp, tempo_total, **extras):
+    """Grava os metadados do experimento (chamado no início e ao fim de cada sessão)."""
+    dados = {
+        "id": exp["id"],
+        "semente": exp["semente"],
+        "instancias": _relativo_a_raiz(exp["instancias"]),
+        "tempo_total": tempo_total,
+        "versao": versao_codigo(),
+    }
+    dados.update(extras)
+    gravar_metadados(exp["meta"], dados)
+
+
+def executar_grade(jobs, workers=None):
+    """
+    Gerador: executa os jobs sob demanda (nada roda antes da primeira
+    iteração) e produz as linhas de resultado uma a uma, na ordem dos jobs;
+    com processos, uma linha pronta espera as dos jobs anteriores. Quem
+    chama grava cada linha sem esperar a grade inteira.
+
+    workers: número de processos (padrão: os.cpu_count()); 1 roda serialmente.
+    Cada job carrega sua própria semente, então o resultado não depende
+    de quantos processos foram usados, da ordem em que terminaram nem de
+    como foram agrupados em lotes.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    lotes = agrupar_jobs(jobs)
+
+    if workers <= 1 or len(lotes) <= 1:
+        for lote in lotes:
+            yield from executar_lote(lote)
+        return
+
+    chunksize = max(1, len(lotes) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for linhas in executor.map(executar_lote, lotes, chunksize=chunksize):
+            yield from linhas
@@ -0,0 +1,243 @@
+from collections import defaultdict
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Alignment, Font
+from openpyxl.utils import get_column_letter
+
+# ============================================================
+# Exportações (TXT + XLSX) compartilhadas por BLM e BLNM
+#
+# linhas: iterável de dicts (uma por execução), ver experimentos.executar_job;
+#         pode ser percorrido mais de uma vez (ex: resultados.ArquivoResultados),
+#         e nenhuma função guarda todas as linhas em memória
+# colunas: ordem das colunas exportadas (COLUNAS_BASE + extras da heurística)
+# ============================================================
+
+COLUNAS_BASE = ["heuristica", "n", "m", "replicacao", "tempo", "iteracoes", "valor", "parametro", "instancia"]
+
+
+def colunas_resultados(heuristica):
+    """Colunas exportadas para uma heurística: base + colunas_extras."""
+    return COLUNAS_BASE + list(heuristica.colunas_extras)
+
+
+def texto_parametro(valor):
+    """parametro não numérico ("NA" no BLM, "adaptativo") como texto; None para alpha."""
+    return None if isinstance(valor, (int, float)) else str(valor)
+
+
+def formatar_campo_txt(coluna, valor):
+    """tempo (e tempo_*) com 4 casas; parametro numérico (alpha) com 1 casa; resto como está."""
+    if coluna == "tempo" or coluna.startswith("tempo_"):
+        return f"{valor:.4f}"
+    if coluna == "parametro" and isinstance(valor, float):
+        return f"{valor:.1f}"
+    return str(valor)
+
+
+def exportar_txt(caminho, linhas, colunas):
+    """Exporta no formato CSV-like (TXT) exigido."""
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(",".join(colunas) + "\n")
+        for linha in linhas:
+            f.write(",".join(formatar_campo_txt(c, linha[c]) for c in colunas) + "\n")
+
+
+def formatar_tempo_min_seg(segundos):
+    """Converte segundos (float) para string 'Xm Ys'."""
+    total = int(round(segundos))
+    mm = total // 60
+    ss = total % 60
+    return f"{mm}m {ss}s"
+
+
+def medias_por(linhas, chaves, campos):
+    """
+    Agrupa as linhas pelas colunas `chaves` e devolve, em ordem de chave,
+    pares (valores_da_chave, {campo: média}).
+    """
+    somas = defaultdict(lambda: defaultdict(float))
+    contagens = defaultdict(int)
+    for linha in linhas:
+        k = tuple(linha[c] for c in chaves)
+        contagens[k] += 1
+        for campo in campos:
+            somas[k][campo] += linha[campo]
+
+    return [
+        (k, {campo: somas[k][campo] / contagens[k] for campo in campos})
+        for k in sorted(contagens)
+    ]
+
+
+def estatisticas(linhas, campos):
+    """
+    Uma passada pelas linhas: {"registros": total, campo: {"soma", "min", "max"}}.
+    """
+    est = {"registros": 0}
+    for campo in campos:
+        est[campo] = {"soma": 0, "min": None, "max": None}
+
+    for linha in linhas:
+        est["registros"] += 1
+        for campo in campos:
+            v = linha[campo]
+            e = est[campo]
+            e["soma"] += v
+            if e["min"] is None or v < e["min"]:
+                e["min"] = v
+            if e["max"] is None or v > e["max"]:
+                e["max"] = v
+
+    return est
+
+
+CINZA_CLARO = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+NEGRITO = Font(bold=True)
+FONTE_TITULO = Font(bold=True, size=13)
+CENTRO = Alignment(horizontal="center", vertical="center")
+
+LARGURA_MAXIMA = 35
+
+
+def celula(ws, valor, **estilo):
+    """WriteOnlyCell com estilo (fill, font, alignment, number_format...)."""
+    c = WriteOnlyCell(ws, value=valor)
+    for atributo, v in estilo.items():
+        setattr(c, atributo, v)
+    return c
+
+
+def cabecalho_estilizado(ws, cabecalho):
+    """Células de cabeçalho: cinza claro, negrito, centralizadas."""
+    return [celula(ws, v, fill=CINZA_CLARO, font=NEGRITO, alignment=CENTRO) for v in cabecalho]
+
+
+def medir_larguras(larguras, valores):
+    """Atualiza `larguras` (lista, por coluna) com o tamanho de `valores` (None não conta)."""
+    for i, v in enumerate(valores):
+        if v is not None:
+            larguras[i] = max(larguras[i], len(str(v)))
+
+
+def aplicar_larguras(ws, larguras):
+    """
+    Define a largura das colunas (maior conteúdo + 2, até LARGURA_MAXIMA).
+    No modo write-only precisa ser chamado antes da primeira linha.
+    """
+    for i, tam in enumerate(larguras, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = min(tam + 2, LARGURA_MAXIMA)
+
+
+def criar_aba_resumo(wb, linhas, tempo_total_script, resumo, est=None):
+    """
+    Aba resumo:
+    - tempo total (m/s + segundos)
+    - contagens e parâmetros do experimento
+    - estatísticas rápidas
+    - seção de médias agrupadas (por instância no BLM, por alpha no BLNM)
+
+    resumo (dict):
+    - titulo: título da aba
+    - esperado_registros: total de execuções da grade
+    - itens: pares (item, valor) com a configuração do experimento
+    - itens_estatisticas: pares (item, valor) extras, após as iterações
+    - secao: (titulo, cabecalho, linhas) da seção de médias
+
+    est: estatisticas(linhas, ["tempo", "iteracoes", "valor"]), se já calculadas.
+    A aba é pequena: as linhas são montadas em memória, as larguras medidas
+    nelas e só então gravadas (a aba é write-only, como a de resultados).
+    """
+    ws = wb.create_sheet("resumo")
+
+    if est is None:
+        est = estatisticas(linhas, ["tempo", "iteracoes", "valor"])
+    total_registros = est["registros"]
+    tempos = est["tempo"]
+    iteracoes = est["iteracoes"]
+    valores = est["valor"]
+
+    itens = [
+        ("Tempo total do script", formatar_tempo_min_seg(tempo_total_script)),
+        ("Tempo total do script (s)", f"{tempo_total_script:.2f}"),
+        ("Total de registros", total_registros),
+        ("Registros esperados", resumo["esperado_registros"]),
+        *resumo["itens"],
+        ("Tempo médio por execução (s)", f"{(tempos['soma'] / total_registros):.4f}"),
+        ("Tempo mínimo por execução (s)", f"{tempos['min']:.4f}"),
+        ("Tempo máximo por execução (s)", f"{tempos['max']:.4f}"),
+        ("Iterações médias", int(iteracoes["soma"] / total_registros)),
+        ("Iterações mínimas", iteracoes["min"]),
+        ("Iterações máximas", iteracoes["max"]),
+        *resumo.get("itens_estatisticas", []),
+        ("Melhor valor (menor makespan)", valores["min"]),
+        ("Pior valor (maior makespan)", valores["max"]),
+    ]
+
+    # Seção de médias, uma linha em branco após os itens acima
+    titulo_secao, cabecalho, linhas_secao = resumo["secao"]
+    linhas_secao = [list(linha) for linha in linhas_secao]
+
+    larguras = [0] * max(2, len(cabecalho))
+    for valores_linha in [[resumo["titulo"]], ["Item", "Valor"], *itens, [titulo_secao], cabecalho, *linhas_secao]:
+        medir_larguras(larguras, valores_linha)
+    aplicar_larguras(ws, larguras)
+
+    ws.append([celula(ws, resumo["titulo"], font=FONTE_TITULO, alignment=CENTRO)])
+    ws.merged_cells.add("A1:D1")
+    ws.append(cabecalho_estilizado(ws, ["Item", "Valor"]))
+    for item, valor in itens:
+        ws.append([celula(ws, item, font=NEGRITO), valor])
+
+    ws.append([])
+    linha_secao = len(itens) + 4
+    ws.append([celula(ws, titulo_secao, font=FONTE_TITULO, alignment=CENTRO)])
+    ws.merged_cells.add(f"A{linha_secao}:D{linha_secao}")
+
+    ws.append(cabecalho_estilizado(ws, cabecalho))
+    for linha in linhas_secao:
+        ws.append(linha)
+
+
+def exportar_xlsx(caminho, linhas, colunas, tempo_total_script, resumo):
+    """
+    XLSX com as abas 'resultados' (dados brutos) e 'resumo'.
+
+    Usa o modo write-only do openpyxl: as linhas vão direto para o arquivo,
+    sem montar a planilha célula a célula em memória. Como as larguras das
+    colunas precisam ser definidas antes da primeira linha, uma passada
+    prévia pelos dados mede as larguras e já calcula as estatísticas do
+    resumo; a segunda passada grava as linhas.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("resultados")
+
+    larguras = [len(c) for c in colunas]
+
+    def medindo(linhas):
+        for linha in linhas:
+            medir_larguras(larguras, [linha[c] for c in colunas])
+            yield linha
+
+    est = estatisticas(medindo(linhas), ["tempo", "iteracoes", "valor"])
+
+    aplicar_larguras(ws, larguras)
+    ws.freeze_panes = "A2"
+    ws.append(cabecalho_estilizado(ws, colunas))
+
+    cols_tempo = [i for i, c in enumerate(colunas) if c == "tempo" or c.startswith("tempo_")]
+    col_param = colunas.index("parametro")
+    for linha in linhas:
+        valores = [linha[c] for c in colunas]
+        for i in cols_tempo:
+            valores[i] = celula(ws, valores[i], number_format="0.0000")
+        if isinstance(valores[col_param], float):
+            valores[col_param] = celula(ws, valores[col_param], number_format="0.0")  # alpha
+        ws.append(valores)
+
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(colunas))}{est['registros'] + 1}"
+
+    criar_aba_resumo(wb, linhas, tempo_total_script, resumo, est)
+
+    wb.save(caminho)
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+
+# ============================================================
+# Interface comum das heurísticas + registro por nome
+#
+# Cada heurística implementa resolver(instancia, params, rng) -> Resultado
+# e se registra com @registrar; os scripts e o executor da grade
+# a encontram por nome com obter_heuristica(nome).
+# ============================================================
+
+
+@dataclass
+class Instancia:
+    """
+    Instância do problema: tempos de processamento das n tarefas e m máquinas.
+    id: identificador estável na suíte de instâncias (None se gerada avulsa).
+    """
+    tempos: list
+    m: int
+    id: str | None = None
+
+    @property
+    def n(self):
+        return len(self.tempos)
+
+
+@dataclass
+class Resultado:
+    """
+    Resultado de uma execução.
+    extras: colunas adicionais específicas da heurística (ex: iteracoes_efetivas).
+    rastro: convergencia.RastroConvergencia, quando a execução foi rastreada.
+    """
+    valor: int
+    iteracoes: int
+    tempo: float
+    extras: dict = field(default_factory=dict)
+    rastro: object = None
+
+
+class Heuristica:
+    """
+    Base das heurísticas de busca local.
+
+    nome: identificador no registro (e, via rotulo, na coluna "heuristica")
+    colunas_extras: chaves de Resultado.extras que viram colunas nos resultados
+    """
+    nome = None
+    colunas_extras = ()
+
+    def resolver(self, instancia, params, rng):
+        """Executa a busca na instância; rng é a fonte de aleatoriedade da execução."""
+        raise NotImplementedError
+
+    def parametro(self, params):
+        """Valor exportado na coluna "parametro" (ex: alpha no BLNM)."""
+        return "NA"
+
+    def rotulo(self, params):
+        """
+        Valor exportado na coluna "heuristica": o nome, mais a variante
+        quando params escolhem uma (ex: vizinhança diferente da padrão).
+        """
+        return self.nome
+
+    def agrupavel(self, params):
+        """Se execuções com esses params podem rodar juntas, em um resolver_lote."""
+        return False
+
+    def resolver_lote(self, instancias, lista_params, rngs):
+        """
+        Várias execuções de uma vez (instâncias de mesmo n e m), uma por
+        posição das listas. Padrão: resolver para cada uma, em sequência.
+        """
+        return [self.resolver(inst, params, rng) for inst, params, rng in zip(instancias, lista_params, rngs)]
+
+
+HEURISTICAS = {}
+
+
+def registrar(cls):
+    """Decorador: registra uma subclasse de Heuristica pelo seu nome."""
+    HEURISTICAS[cls.nome] = cls()
+    return cls
+
+
+def obter_heuristica(nome):
+    """Heurística registrada com esse nome."""
+    try:
+        return HEURISTICAS[nome]
+    except KeyError:
+        raise ValueError(f"heurística desconhecida: {nome!r} (registradas: {', '.join(HEURISTICAS)})") from None
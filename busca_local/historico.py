@@ -0,0 +1,429 @@
+import glob
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .colunar import ARROW_DISPONIVEL, ERROS_ARROW, ler_arrow
+from .convergencia import decodificar_rastro
+from .cubo import CAMPOS_CUBO, CATEGORIAS_CUBO, CHAVES_CUBO, ler_cubo
+from .instrumentacao import COLUNAS_INSTRUMENTACAO
+from .resultados import gravar_metadados, ler_metadados, ler_resultados
+
+# ============================================================
+# Leitura dos resultados (e dos rastros de convergência) em DataFrames,
+# usada pelo dashboard, e histórico de todos os experimentos de uma pasta
+#
+# O histórico mantém em <pasta>/.historico/:
+#   - <prefixo>_indice.json: um registro por arquivo de resultados
+#     (arquivo, mtime, tamanho, experimento, registros, metadados)
+#   - <arquivo>.feather: o DataFrame já padronizado de cada arquivo, em
+#     Arrow (só com pyarrow; sem ele, ou se a gravação falhar, o arquivo
+#     é relido da origem a cada sessão). parametro de um XLSX mistura
+#     alpha e texto, que o Arrow não guarda numa coluna só: vai sem ele,
+#     refeito de parametro_num e parametro_texto na leitura
+# Ao atualizar, só arquivos novos ou alterados (mtime/tamanho) são lidos;
+# o DataFrame combinado em memória é estendido com eles, sem reler o resto.
+# ============================================================
+
+PASTA_CACHE = ".historico"
+ERROS_CACHE = (OSError, ValueError, *ERROS_ARROW)
+
+
+def padronizar_resultados(df):
+    """Padroniza nomes e tipos da aba 'resultados' de um XLSX."""
+    # Padroniza nomes (por garantia)
+    df.columns = [c.strip().lower() for c in df.columns]
+
+    # Tipos
+    if "n" in df: df["n"] = pd.to_numeric(df["n"], errors="coerce").astype("Int64")
+    if "m" in df: df["m"] = pd.to_numeric(df["m"], errors="coerce").astype("Int64")
+    if "replicacao" in df: df["replicacao"] = pd.to_numeric(df["replicacao"], errors="coerce").astype("Int64")
+    if "tempo" in df: df["tempo"] = pd.to_numeric(df["tempo"], errors="coerce")
+    if "iteracoes" in df: df["iteracoes"] = pd.to_numeric(df["iteracoes"], errors="coerce").astype("Int64")
+    if "valor" in df: df["valor"] = pd.to_numeric(df["valor"], errors="coerce").astype("Int64")
+
+    # parametro pode ser alpha (float), "NA" ou "adaptativo"
+    if "parametro" in df:
+        df["parametro_num"] = pd.to_numeric(df["parametro"], errors="coerce")
+        completar_parametro_texto(df, "parametro_num")
+    else:
+        df["parametro"] = None
+        df["parametro_num"] = None
+        df["parametro_texto"] = None
+
+    return df
+
+
+def completar_parametro_texto(df, numerico):
+    """
+    Acrescenta parametro_texto ("NA", "adaptativo"; nulo para alpha) a um
+    DataFrame lido de um arquivo sem essa coluna (XLSX, onde o pandas lê
+    "NA" como nulo, ou .arrow/.cubo.json antigos). Onde a coluna `numerico`
+    é nula: o texto de parametro, se houver, senão "adaptativo" para as
+    variantes com alpha adaptativo (pelo rótulo) e "NA" para o resto.
+    """
+    if "parametro_texto" in df:
+        return df
+    rotulo = df["heuristica"].str.contains("[adaptativo", regex=False).map({True: "adaptativo", False: "NA"})
+    texto = df["parametro"].where(df["parametro"].map(lambda v: isinstance(v, str)), rotulo)
+    df["parametro_texto"] = texto.where(df[numerico].isna(), None)
+    return df
+
+
+def ler_resumo(df):
+    """
+    Lê a aba 'resumo' de um XLSX (sem cabeçalho) e tenta extrair:
+    - tempo_total_str  (ex: '2m 49s' OU '0m 65s')
+    - tempo_total_s    (float em segundos, se existir)
+    """
+    # transforma em pares "Item" -> "Valor", tentando achar linhas com esses dois campos
+    resumo = {}
+    for i in range(len(df)):
+        a = df.iloc[i, 0] if df.shape[1] > 0 else None
+        b = df.iloc[i, 1] if df.shape[1] > 1 else None
+        if isinstance(a, str):
+            chave = a.strip()
+            if chave:
+                resumo[chave] = b
+
+    # tenta extrair chaves que você gerou
+    tempo_total_str = resumo.get("Tempo total do script")
+    tempo_total_s = resumo.get("Tempo total do script (s)")
+
+    # normaliza tempo_total_s
+    try:
+        if tempo_total_s is not None:
+            tempo_total_s = float(str(tempo_total_s).replace(",", "."))
+    except Exception:
+        tempo_total_s = None
+
+    return {
+        "tempo_total_str": tempo_total_str,
+        "tempo_total_s": tempo_total_s,
+    }
+
+
+def ler_arquivo_resultados(path):
+    """
+    (resultados, resumo) de um arquivo de resultados.
+    - .arrow: colunas já tipadas, lidas por mmap; resumo nos metadados
+    - .xlsx: o arquivo é aberto uma vez e as duas abas lidas dele
+    """
+    if path.endswith(".arrow"):
+        tabela, resumo = ler_arrow(path)
+        df = tabela.to_pandas()
+        df["parametro_num"] = df["parametro"]
+        completar_parametro_texto(df, "parametro_num")
+        return df, {
+            "tempo_total_str": resumo.get("tempo_total_str"),
+            "tempo_total_s": resumo.get("tempo_total_s"),
+        }
+
+    with pd.ExcelFile(path) as xl:
+        df = padronizar_resultados(xl.parse("resultados"))
+        try:
+            resumo = ler_resumo(xl.parse("resumo", header=None))
+        except ValueError:
+            resumo = {}
+    return df, resumo
+
+
+def cubo_de_frame(df):
+    """Cubo (ver cubo.py) calculado das linhas brutas, para execuções sem .cubo.json."""
+    base = df.assign(parametro=df["parametro_num"])
+    spec = {"registros": ("valor", "count")}
+    for campo in CAMPOS_CUBO + [c for c in COLUNAS_INSTRUMENTACAO if c in df]:
+        base[f"{campo}_2"] = base[campo].astype("float64") ** 2
+        spec[f"{campo}_soma"] = (campo, "sum")
+        spec[f"{campo}_soma2"] = (f"{campo}_2", "sum")
+        spec[f"{campo}_min"] = (campo, "min")
+        spec[f"{campo}_max"] = (campo, "max")
+    for coluna in [c for c in CATEGORIAS_CUBO if c in df]:
+        for valor in sorted(df[coluna].dropna().unique()):
+            base[f"{coluna}={valor}"] = (base[coluna] == valor).astype("int64")
+            spec[f"{coluna}={valor}"] = (f"{coluna}={valor}", "sum")
+    return base.groupby(CHAVES_CUBO, as_index=False, dropna=False).agg(**spec)
+
+
+def ler_cubo_resultados(path):
+    """
+    (cubo DataFrame, resumo) de um arquivo de resultados: o .cubo.json ao
+    lado dele, se existir; senão calculado das linhas brutas.
+    """
+    sidecar = os.path.splitext(path)[0] + ".cubo.json"
+    if os.path.exists(sidecar):
+        celulas, resumo = ler_cubo(sidecar)
+        return completar_parametro_texto(pd.DataFrame(celulas), "parametro"), resumo
+
+    df, resumo = ler_arquivo_resultados(path)
+    return cubo_de_frame(df), resumo
+
+
+def campos_do_cubo(cubo):
+    """Campos agregados presentes no cubo (CAMPOS_CUBO + extras gravados)."""
+    return [c[:-len("_soma")] for c in cubo.columns if c.endswith("_soma")]
+
+
+def agregar_cubo(cubo, chaves):
+    """
+    Junta as células do cubo por `chaves` ([] = uma linha com o total).
+    Por campo: {campo}_media, {campo}_desvio (populacional), {campo}_min,
+    {campo}_max; mais o número de registros e as contagens "coluna=valor".
+    """
+    campos = campos_do_cubo(cubo)
+    base = cubo if chaves else cubo.assign(_total=0)
+    spec = {"registros": "sum"}
+    spec.update({c: "sum" for c in cubo.columns if "=" in c})
+    for campo in campos:
+        spec.update({f"{campo}_soma": "sum", f"{campo}_soma2": "sum", f"{campo}_min": "min", f"{campo}_max": "max"})
+
+    agg = base.groupby(chaves or ["_total"], as_index=False, dropna=False).agg(spec)
+    for campo in campos:
+        media = agg[f"{campo}_soma"] / agg["registros"]
+        variancia = agg[f"{campo}_soma2"] / agg["registros"] - media ** 2
+        agg[f"{campo}_media"] = media
+        agg[f"{campo}_desvio"] = variancia.clip(lower=0) ** 0.5
+        agg = agg.drop(columns=[f"{campo}_soma", f"{campo}_soma2"])
+
+    return agg if chaves else agg.drop(columns=["_total"])
+
+
+CHAVE_RASTRO = ["heuristica", "n", "m", "replicacao", "parametro", "instancia"]
+
+
+def caminho_rastros(path):
+    """.rastro.jsonl do experimento de um arquivo de resultados (.arrow/.xlsx/.jsonl)."""
+    return os.path.splitext(path)[0] + ".rastro.jsonl"
+
+
+def ler_corrida(path):
+    """
+    Registro da corrida de alphas (varredura "corrida" do BLNM) gravado nos
+    metadados do experimento de um arquivo de resultados, ou None.
+    """
+    meta = ler_metadados(os.path.splitext(path)[0] + ".meta.json")
+    return (meta or {}).get("corrida")
+
+
+def _registros_rastro(path):
+    """Linhas do .rastro.jsonl por chave; um rastro repetido (execução refeita ao retomar) fica com o último."""
+    registros = {}
+    for reg in ler_resultados(path):
+        registros[tuple(reg["chave"])] = reg
+    return registros
+
+
+def _frame_longo(chaves, tamanhos, colunas, extras=()):
+    """Uma linha por ponto: a chave da execução repetida e as colunas dos arrays concatenados."""
+    base = pd.DataFrame(chaves, columns=CHAVE_RASTRO + list(extras))
+    df = base.loc[base.index.repeat(tamanhos)].reset_index(drop=True)
+    for campo, partes in colunas.items():
+        df[campo] = np.concatenate(partes) if partes else np.array([])
+    df["parametro_num"] = pd.to_numeric(df["parametro"], errors="coerce")
+    return df
+
+
+def ler_rastros(path):
+    """
+    Rastros de convergência de um .rastro.jsonl em formato longo: uma linha
+    por ponto (melhora), com as colunas da chave da execução, parametro_num,
+    limite_inferior, iteracao, tempo e valor. Um rastro repetido (execução
+    refeita ao retomar) fica só com o último.
+    """
+    chaves, tamanhos, colunas = [], [], {"iteracao": [], "tempo": [], "valor": []}
+    for chave, reg in _registros_rastro(path).items():
+        arrays = decodificar_rastro(reg)
+        chaves.append((*chave, reg.get("limite_inferior")))
+        tamanhos.append(len(arrays["valor"]))
+        for campo in colunas:
+            arr = arrays[campo]
+            colunas[campo].append(np.frombuffer(arr, dtype=arr.typecode))
+
+    df = _frame_longo(chaves, tamanhos, colunas, ["limite_inferior"])
+    df["iteracao"] = df["iteracao"].astype("int64")
+    return df
+
+
+def ler_trajetorias_alpha(path):
+    """
+    Trajetórias de alpha das execuções com alpha adaptativo de um
+    .rastro.jsonl, em formato longo: chave da execução, iteracao (a partir
+    da qual o alpha valeu) e alpha. Vazio se nenhuma execução foi adaptativa.
+    """
+    chaves, tamanhos, colunas = [], [], {"iteracao": [], "alpha": []}
+    for chave, reg in _registros_rastro(path).items():
+        if "alpha" not in reg:
+            continue
+        arrays = decodificar_rastro(reg)
+        chaves.append(chave)
+        tamanhos.append(len(arrays["alpha"]))
+        for campo, arr in (("iteracao", arrays["alpha_iteracao"]), ("alpha", arrays["alpha"])):
+            colunas[campo].append(np.frombuffer(arr, dtype=arr.typecode))
+
+    df = _frame_longo(chaves, tamanhos, colunas)
+    df["iteracao"] = df["iteracao"].astype("int64")
+    return df
+
+
+def listar_resultados(pasta, prefixo):
+    """
+    Um arquivo por experimento da pasta, do mais antigo ao mais recente:
+    o .arrow quando existe (e o pyarrow está instalado), senão o .xlsx.
+    """
+    arquivos = []
+    for xlsx in glob.glob(os.path.join(pasta, f"{prefixo}_*.xlsx")):
+        arrow = os.path.splitext(xlsx)[0] + ".arrow"
+        arquivos.append(arrow if ARROW_DISPONIVEL and os.path.exists(arrow) else xlsx)
+
+    arquivos.sort(key=os.path.getmtime)
+    return arquivos
+
+
+class HistoricoResultados:
+    """
+    Todos os experimentos de uma pasta em um único DataFrame, com as colunas
+    extras `experimento` e `arquivo`. Uma instância por pasta/prefixo; chame
+    atualizar() a cada uso para incorporar arquivos novos ou alterados.
+    """
+
+    def __init__(self, pasta, prefixo):
+        self.pasta = pasta
+        self.prefixo = prefixo
+        self.pasta_cache = os.path.join(pasta, PASTA_CACHE)
+        self.caminho_indice = os.path.join(self.pasta_cache, f"{prefixo}_indice.json")
+
+        self.indice = ler_metadados(self.caminho_indice) or {}
+        self.frame = None
+        self._no_frame = {}  # arquivo -> (mtime, tamanho) das linhas já em self.frame
+        self._trava = threading.Lock()
+
+    def _experimento(self, arquivo):
+        return os.path.splitext(arquivo)[0][len(self.prefixo) + 1:]
+
+    def _caminho_cache(self, arquivo):
+        return os.path.join(self.pasta_cache, arquivo + ".feather")
+
+    def _gravar_cache(self, arquivo, df):
+        """Grava o DataFrame em Arrow (arquivo temporário + rename); devolve se gravou."""
+        if not ARROW_DISPONIVEL:
+            return False
+        caminho = self._caminho_cache(arquivo)
+        tmp = caminho + ".tmp"
+        if df["parametro"].dtype == object:
+            df = df.drop(columns="parametro")
+        try:
+            df.reset_index(drop=True).to_feather(tmp)
+            os.replace(tmp, caminho)
+            return True
+        except ERROS_CACHE:
+            # ex: disco cheio, ou outra coluna que não cabe no esquema Arrow: fica sem cache
+            self._remover_cache(tmp)
+            return False
+
+    def _remover_cache(self, caminho):
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+
+    def _indexar(self, path, mtime, tamanho):
+        """Lê um arquivo novo ou alterado, guarda o DataFrame em cache; devolve (registro do índice, df)."""
+        arquivo = os.path.basename(path)
+        experimento = self._experimento(arquivo)
+
+        df, resumo = ler_arquivo_resultados(path)
+        df["experimento"] = experimento
+        df["arquivo"] = arquivo
+        cache = self._gravar_cache(arquivo, df)
+
+        meta = ler_metadados(os.path.join(self.pasta, f"{self.prefixo}_{experimento}.meta.json")) or {}
+        reg = {
+            "arquivo": arquivo,
+            "mtime": mtime,
+            "tamanho": tamanho,
+            "experimento": experimento,
+            "registros": len(df),
+            "semente": meta.get("semente"),
+            "instancias": os.path.basename(meta["instancias"]) if meta.get("instancias") else None,
+            "versao": meta.get("versao"),
+            "tempo_total_s": resumo.get("tempo_total_s", meta.get("tempo_total")),
+            "cache": cache,
+        }
+        return reg, df
+
+    def _ler_cache(self, arquivo, path):
+        caminho = self._caminho_cache(arquivo)
+        try:
+            if not self.indice[arquivo].get("cache"):
+                raise FileNotFoundError(caminho)
+            df = pd.read_feather(caminho)
+        except ERROS_CACHE:
+            # sem cache, ou ilegível (corrompido, outra versão do pyarrow...): relê o arquivo
+            self._remover_cache(caminho)
+            info = os.stat(path)
+            self.indice[arquivo], df = self._indexar(path, info.st_mtime, info.st_size)
+            gravar_metadados(self.caminho_indice, self.indice)
+            return df
+
+        if "parametro" not in df:
+            df["parametro"] = df["parametro_num"].astype(object).where(df["parametro_num"].notna(),
+                                                                       df["parametro_texto"])
+        return df
+
+    def atualizar(self):
+        """Incorpora arquivos novos/alterados, descarta removidos e devolve o DataFrame combinado."""
+        with self._trava:
+            os.makedirs(self.pasta_cache, exist_ok=True)
+
+            atuais = {}
+            lidos = {}  # DataFrames lidos nesta chamada (não relê o cache recém-gravado)
+            mudou_indice = False
+            for path in listar_resultados(self.pasta, self.prefixo):
+                arquivo = os.path.basename(path)
+                info = os.stat(path)
+                atuais[arquivo] = (info.st_mtime, info.st_size)
+
+                reg = self.indice.get(arquivo)
+                if (reg is None or (reg["mtime"], reg["tamanho"]) != atuais[arquivo]
+                        or (reg.get("cache") and not os.path.exists(self._caminho_cache(arquivo)))):
+                    self.indice[arquivo], lidos[arquivo] = self._indexar(path, *atuais[arquivo])
+                    mudou_indice = True
+
+            for arquivo in set(self.indice) - set(atuais):
+                del self.indice[arquivo]
+                self._remover_cache(self._caminho_cache(arquivo))
+                mudou_indice = True
+
+            if mudou_indice:
+                gravar_metadados(self.caminho_indice, self.indice)
+
+            # DataFrame combinado: tira linhas de arquivos removidos/alterados
+            # e acrescenta só os arquivos que ainda não estão nele
+            saem = [a for a, chave in self._no_frame.items() if atuais.get(a) != chave]
+            if saem and self.frame is not None:
+                self.frame = self.frame[~self.frame["arquivo"].isin(saem)]
+            for a in saem:
+                del self._no_frame[a]
+
+            entram = [a for a in atuais if a not in self._no_frame]
+            if entram:
+                novos = [lidos[a] if a in lidos else self._ler_cache(a, os.path.join(self.pasta, a))
+                         for a in entram]
+                partes = novos if self.frame is None else [self.frame, *novos]
+                self.frame = pd.concat(partes, ignore_index=True)
+                for a in entram:
+                    self._no_frame[a] = atuais[a]
+
+            if self.frame is None:
+                self.frame = pd.DataFrame(columns=["experimento", "arquivo"])
+            return self.frame
+
+    def experimentos(self):
+        """Registros do índice (um por arquivo), do mais antigo ao mais recente."""
+        regs = sorted(self.indice.values(), key=lambda r: r["mtime"])
+        return pd.DataFrame(regs, columns=[
+            "experimento", "arquivo", "mtime", "tamanho", "registros",
+            "semente", "instancias", "versao", "tempo_total_s",
+        ])
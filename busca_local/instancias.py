@@ -0,0 +1,184 @@
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+from .heuristicas import Instancia
+
+# ============================================================
+# Suíte de instâncias persistente, compartilhada por BLM e BLNM
+#
+# Formato do arquivo (.bin):
+#   MAGICO (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON
+#   | preenchimento até múltiplo de 8 | tempos de todas as instâncias (int32)
+#
+# O cabeçalho lista cada instância (id, n, m, replicacao, semente,
+# distribuicao, offset). Os tempos são lidos por mmap, sem copiar o
+# arquivo para a memória, e cada processo trabalhador abre a suíte uma vez.
+# ============================================================
+
+MAGICO = b"BLINST01"
+
+DISTRIBUICAO_PADRAO = {"tipo": "uniforme", "min": 1, "max": 100}
+SEMENTE_SUITE_PADRAO = 2026
+
+CAMINHO_SUITE_PADRAO = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Instancias", "suite_padrao.bin"
+)
+
+
+def gerar_tempos(n, distribuicao, semente):
+    """Tempos de processamento de n tarefas, determinísticos pela semente."""
+    if distribuicao["tipo"] != "uniforme":
+        raise ValueError(f"distribuição não suportada: {distribuicao['tipo']!r}")
+
+    rng = random.Random(semente)
+    lo, hi = distribuicao["min"], distribuicao["max"]
+    return [rng.randint(lo, hi) for _ in range(n)]
+
+
+def id_instancia(n, m, distribuicao, semente):
+    """ID estável: depende só dos parâmetros que definem a instância."""
+    return f"n{n}_m{m}_u{distribuicao['min']}-{distribuicao['max']}_{semente:016x}"
+
+
+def gerar_suite(caminho, especificacoes, semente=SEMENTE_SUITE_PADRAO, distribuicao=DISTRIBUICAO_PADRAO):
+    """
+    Gera e grava uma suíte de instâncias.
+
+    especificacoes: lista de (n, m, replicacao); a semente de cada instância
+    é derivada de (semente, n, m, replicacao), então a mesma especificação
+    sempre gera as mesmas instâncias (e os mesmos IDs).
+    Devolve a lista de IDs na ordem das especificações.
+    """
+    entradas = []
+    dados = array("i")
+
+    for n, m, rep in especificacoes:
+        semente_inst = random.Random(f"{semente}:instancia:{n}:{m}:{rep}").getrandbits(63)
+        entradas.append({
+            "id": id_instancia(n, m, distribuicao, semente_inst),
+            "n": n,
+            "m": m,
+            "replicacao": rep,
+            "semente": semente_inst,
+            "distribuicao": distribuicao,
+            "offset": len(dados),
+        })
+        dados.extend(gerar_tempos(n, distribuicao, semente_inst))
+
+    cabecalho = json.dumps({
+        "semente": semente,
+        "byteorder": sys.byteorder,
+        "instancias": entradas,
+    }).encode("utf-8")
+
+    inicio_dados = len(MAGICO) + 4 + len(cabecalho)
+    preenchimento = (-inicio_dados) % 8
+
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    tmp = caminho + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGICO)
+        f.write(struct.pack("<I", len(cabecalho)))
+        f.write(cabecalho)
+        f.write(b"\0" * preenchimento)
+        dados.tofile(f)
+    os.replace(tmp, caminho)
+
+    return [e["id"] for e in entradas]
+
+
+class SuiteInstancias:
+    """Suíte aberta por mmap; instâncias acessadas por ID ou por (n, m, replicacao)."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        with open(caminho, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGICO)] != MAGICO:
+            raise ValueError(f"{caminho} não é uma suíte de instâncias")
+
+        (tam,) = struct.unpack_from("<I", self._mmap, len(MAGICO))
+        inicio = len(MAGICO) + 4
+        cabecalho = json.loads(self._mmap[inicio:inicio + tam].decode("utf-8"))
+        inicio_dados = inicio + tam + (-(inicio + tam)) % 8
+
+        self.semente = cabecalho["semente"]
+        self._trocar_bytes = cabecalho["byteorder"] != sys.byteorder
+        self._tempos = memoryview(self._mmap)[inicio_dados:].cast("i")
+
+        self.entradas = {e["id"]: e for e in cabecalho["instancias"]}
+        self._por_chave = {(e["n"], e["m"], e["replicacao"]): e["id"] for e in cabecalho["instancias"]}
+
+    def ids(self):
+        return list(self.entradas)
+
+    def buscar(self, n, m, rep):
+        """ID da instância gerada para (n, m, replicacao), ou None."""
+        return self._por_chave.get((n, m, rep))
+
+    def tempos(self, id_inst, compacto=False):
+        """
+        Tempos da instância (cópia da fatia mapeada): lista de int, ou
+        array("i") com compacto=True (armazenamento "arrays", sem objeto por tarefa).
+        """
+        e = self.entradas[id_inst]
+        fatia = self._tempos[e["offset"]:e["offset"] + e["n"]]
+        if self._trocar_bytes or compacto:
+            a = array("i", fatia)
+            if self._trocar_bytes:
+                a.byteswap()
+            return a if compacto else a.tolist()
+        return fatia.tolist()
+
+    def instancia(self, id_inst, compacto=False):
+        e = self.entradas[id_inst]
+        return Instancia(self.tempos(id_inst, compacto), e["m"], id_inst)
+
+    def __getitem__(self, id_inst):
+        return self.instancia(id_inst)
+
+    def __len__(self):
+        return len(self.entradas)
+
+
+@lru_cache(maxsize=None)
+def abrir_suite(caminho):
+    """Abre a suíte uma vez por processo (reaproveitada entre jobs)."""
+    return SuiteInstancias(caminho)
+
+
+def garantir_suite(caminho, especificacoes, semente=SEMENTE_SUITE_PADRAO, distribuicao=DISTRIBUICAO_PADRAO):
+    """
+    Abre a suíte em `caminho`, gerando-a se ainda não existir.
+    Devolve (suite, ids) com os IDs na ordem das especificações.
+    """
+    if not os.path.exists(caminho):
+        gerar_suite(caminho, especificacoes, semente, distribuicao)
+
+    suite = abrir_suite(caminho)
+    ids = [suite.buscar(n, m, rep) for n, m, rep in especificacoes]
+    faltando = [esp for esp, i in zip(especificacoes, ids) if i is None]
+    if faltando:
+        raise ValueError(
+            f"a suíte {caminho} não tem instâncias para {faltando[:3]}"
+            f"{' ...' if len(faltando) > 3 else ''}; gere outra suíte com --instancias"
+        )
+    return suite, ids
+
+
+def especificacoes_grade(maquinas, rs, repeticoes):
+    """(n, m, replicacao) da grade usada pelos scripts, com n = int(m * r)."""
+    return [
+        (int(m * r), m, rep)
+        for m in maquinas
+        for r in rs
+        for rep in range(1, repeticoes + 1)
+    ]
+
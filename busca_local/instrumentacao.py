@@ -0,0 +1,43 @@
+# ============================================================
+# Instrumentação das buscas: contadores por execução
+#
+# Os laços de BLM/BLNM acumulam em variáveis locais e gravam aqui no
+# fim; os avaliadores da vizinhança só somam o número de vizinhos
+# avaliados a cada chamada (uma soma por chamada, não por vizinho).
+# Os tempos vêm de time.perf_counter em torno de cada fase da iteração.
+#
+# Viram colunas extras dos resultados (TXT/XLSX/Arrow/cubo):
+#   avaliacoes          vizinhos cujo makespan foi calculado
+#   passos_melhora      passos gulosos que aplicaram um movimento
+#   passos_sem_melhora  passos gulosos sem movimento que melhore
+#   passos_aleatorios   passos aleatórios (só BLNM)
+#   tempo_avaliacao     segundos avaliando a vizinhança
+#   tempo_movimento     segundos aplicando movimentos (cargas e índices)
+#   tempo_rng           segundos sorteando (só BLNM)
+#   iteracao_melhor     iteração em que o best final foi encontrado
+#                       (iteracoes - iteracao_melhor = cauda sem melhora)
+# ============================================================
+
+COLUNAS_INSTRUMENTACAO = (
+    "avaliacoes",
+    "passos_melhora",
+    "passos_sem_melhora",
+    "passos_aleatorios",
+    "tempo_avaliacao",
+    "tempo_movimento",
+    "tempo_rng",
+    "iteracao_melhor",
+)
+
+
+class Contadores:
+    """Contadores de uma execução (ver COLUNAS_INSTRUMENTACAO)."""
+    __slots__ = COLUNAS_INSTRUMENTACAO
+
+    def __init__(self):
+        for c in COLUNAS_INSTRUMENTACAO:
+            setattr(self, c, 0.0 if c.startswith("tempo_") else 0)
+
+    def como_dict(self, colunas=COLUNAS_INSTRUMENTACAO):
+        """Colunas pedidas, prontas para Resultado.extras."""
+        return {c: getattr(self, c) for c in colunas}
@@ -0,0 +1,276 @@
+import time
+
+from .instrumentacao import COLUNAS_INSTRUMENTACAO
+
+try:
+    import numpy as np
+except ImportError:  # motor "lote" é opcional
+    np = None
+
+# ============================================================
+# BLNM em lote: R réplicas independentes avançando juntas (lock-step)
+#
+# Estado de todas as réplicas em arrays NumPy:
+#   - sol: R x n (máquina de cada tarefa)
+#   - cargas: R x m
+# A cada iteração, a máscara "u < alpha" separa as réplicas que dão o
+# passo aleatório das que dão o passo de melhor melhora; os dois passos
+# são aplicados vetorizados sobre as réplicas de cada grupo. Quando o
+# contador sem melhora de uma réplica estoura (ou ela atinge um critério
+# de parada, ver parada.py), ela sai do lote (os arrays são compactados)
+# e as demais seguem.
+#
+# Cada réplica tem seu gerador NumPy (semente própria) e consome sempre
+# 3 sorteios por iteração, em blocos: o resultado de uma réplica depende
+# só da sua semente, não de quais outras rodam no mesmo lote. O fluxo
+# aleatório é outro que o do motor escalar (random.Random), então os
+# valores não coincidem com os dele execução a execução. Réplicas com a
+# mesma semente (e solução inicial) veem o mesmo u a cada iteração: são
+# números aleatórios comuns entre alphas, como o crn do motor escalar.
+# ============================================================
+
+BLOCO_SORTEIOS = 1024
+
+
+def _exigir_numpy():
+    if np is None:
+        raise ImportError("motor 'lote' requer o pacote numpy (pip install numpy)")
+
+
+def _melhor_melhora_lote(sol, cargas, tempos, m):
+    """
+    Melhor movimento de cada réplica: (tarefa, destino, novo_valor, avaliados), com o
+    mesmo desempate de avaliar_melhor_melhora (primeira ocorrência em
+    (tarefa, destino)) sempre que o movimento melhora o makespan.
+
+    Só movimentos que tiram uma tarefa da máquina crítica c (a primeira de
+    carga máxima L) podem melhorar; então só as tarefas de c são avaliadas:
+        max(L - p, carga_destino + p, maior carga fora de c e do destino)
+    Com 2+ máquinas críticas a terceira parcela já vale L e nada melhora.
+    Réplica cuja máquina crítica não tem tarefas (todas as cargas zero) não
+    tem movimento: sai com novo_valor = L (e tarefa = destino = 0, não aplicados).
+    """
+    k = sol.shape[0]
+    linhas = np.arange(k)
+
+    c = np.argmax(cargas, axis=1)
+    L = cargas[linhas, c]
+
+    # maior carga fora de c (e a seguinte, para quando o destino é a segunda)
+    resto = cargas.copy()
+    resto[linhas, c] = -1
+    i2 = np.argmax(resto, axis=1)
+    v2 = resto[linhas, i2]
+    resto[linhas, i2] = -1
+    v3 = resto.max(axis=1)
+    outras = np.where(np.arange(m)[None, :] == i2[:, None], v3[:, None], v2[:, None])
+
+    # pares (réplica, tarefa na máquina crítica), em ordem de réplica e tarefa
+    rep, tarefa = np.nonzero(sol == c[:, None])
+    p = tempos[rep, tarefa]
+    pares = np.arange(rep.size)
+
+    novo_ms = np.maximum(np.maximum((L[rep] - p)[:, None], cargas[rep] + p[:, None]), outras[rep])
+    novo_ms[pares, c[rep]] = np.iinfo(np.int64).max  # destino == origem
+
+    destino = np.argmin(novo_ms, axis=1)
+    valor = novo_ms[pares, destino]
+
+    # por réplica, o primeiro par de menor valor (lexsort é estável)
+    ordem = np.lexsort((valor, rep))
+    primeiro = ordem[np.flatnonzero(np.diff(rep[ordem], prepend=-1))]
+    com_par = rep[primeiro]
+    melhor_tarefa = np.zeros(k, dtype=np.int64)
+    melhor_destino = np.zeros(k, dtype=np.int64)
+    melhor_valor = L.astype(np.int64)
+    melhor_tarefa[com_par] = tarefa[primeiro]
+    melhor_destino[com_par] = destino[primeiro]
+    melhor_valor[com_par] = valor[primeiro]
+    avaliados = np.bincount(rep, minlength=k) * (m - 1)
+    return melhor_tarefa, melhor_destino, melhor_valor, avaliados
+
+
+def blnm_em_lote(tempos, m, alphas, sementes, max_sem_melhora=1000, sol_inicial=None, rastros=None,
+                 bloco=BLOCO_SORTEIOS, paradas=None):
+    """
+    Executa len(alphas) réplicas do BLNM (vizinhança "mover", melhor melhora) juntas.
+
+    - tempos: lista de n tempos (mesma instância para todas) ou R listas
+      de n tempos (instâncias diferentes do mesmo tamanho)
+    - alphas, sementes: um valor por réplica
+    - max_sem_melhora: um valor para todas ou um por réplica
+    - sol_inicial: atribuição de partida por réplica (None = aleatória)
+    - rastros: RastroConvergencia por réplica (None = não rastrear); o tempo
+      de cada ponto é a parcela acumulada da réplica, como em `tempo`
+    - bloco: iterações sorteadas de uma vez por réplica
+    - paradas: parada.CriterioParada por réplica (None = só max_sem_melhora);
+      os orçamentos de tempo e de CPU valem para a parcela da réplica, e o
+      motivo da parada de cada uma fica no seu critério
+
+    Devolve uma lista (best, iteracoes, tempo, instrumentação) por réplica,
+    na ordem dada; instrumentação é um dict com COLUNAS_INSTRUMENTACAO.
+    tempo é a parcela da réplica no tempo do lote: cada iteração divide seu
+    tempo entre as réplicas ativas nela (e cada fase, entre as réplicas
+    que passaram por ela).
+    """
+    _exigir_numpy()
+
+    total = len(alphas)
+    if len(sementes) != total:
+        raise ValueError("é preciso uma semente por réplica")
+
+    tempos = np.asarray(tempos, dtype=np.int64)
+    if tempos.ndim == 1:
+        tempos = np.broadcast_to(tempos, (total, tempos.size))
+    if tempos.shape[0] != total:
+        raise ValueError("tempos deve ter uma linha por réplica (ou ser uma única instância)")
+    n = tempos.shape[1]
+
+    geradores = [np.random.default_rng(s) for s in sementes]
+
+    # solução inicial de cada réplica: a dada ou aleatória
+    if sol_inicial is None:
+        sol_inicial = [None] * total
+    sol = np.stack([
+        g.integers(m, size=n) if s is None else np.asarray(s, dtype=np.int64)
+        for g, s in zip(geradores, sol_inicial)
+    ])
+    cargas = np.zeros((total, m), dtype=np.int64)
+    np.add.at(cargas, (np.arange(total)[:, None], sol), tempos)
+
+    ativos = np.arange(total)
+    alpha = np.asarray(alphas, dtype=np.float64)
+    best = cargas.max(axis=1)
+    limite = np.broadcast_to(np.asarray(max_sem_melhora, dtype=np.int64), (total,))
+    sem_melhora = np.zeros(total, dtype=np.int64)
+    it = np.zeros(total, dtype=np.int64)
+
+    if rastros is None or all(r is None for r in rastros):
+        rastros = None
+    else:
+        for r, rastro in enumerate(rastros):
+            if rastro is not None:
+                rastro.registrar(0, int(best[r]), 0.0)
+
+    # critérios de parada, indexados pela réplica (como tempo)
+    if paradas is None:
+        paradas = [None] * total
+    valor_parada = np.array([-1 if p is None or p.valor_parada is None else p.valor_parada for p in paradas],
+                            dtype=np.int64)
+    orcamento = np.array([np.inf if p is None or p.tempo is None else p.tempo for p in paradas])
+    orcamento_cpu = np.array([np.inf if p is None or p.tempo_cpu is None else p.tempo_cpu for p in paradas])
+    medir_cpu = bool(np.isfinite(orcamento_cpu).any())
+    cpu = np.zeros(total)
+
+    resultados = [None] * total
+    tempo = np.zeros(total)
+    cont = {c: np.zeros(total, dtype=np.float64 if c.startswith("tempo_") else np.int64)
+            for c in COLUNAS_INSTRUMENTACAO}
+    sorteios = None
+    pos = bloco
+
+    while True:
+        # réplicas que pararam (contador sem melhora, valor ou orçamento) saem do lote
+        fim = (sem_melhora >= limite) | (best <= valor_parada[ativos]) | (tempo[ativos] >= orcamento[ativos])
+        if medir_cpu:
+            fim |= cpu[ativos] >= orcamento_cpu[ativos]
+        if fim.any():
+            for j in np.flatnonzero(fim):
+                r = ativos[j]
+                resultados[r] = (int(best[j]), int(it[j]), float(tempo[r]),
+                                 {c: cont[c][r].item() for c in COLUNAS_INSTRUMENTACAO})
+                parada = paradas[r]
+                if parada is not None:
+                    parada.motivo = (parada.por_valor(int(best[j]))
+                                     or ("tempo" if tempo[r] >= orcamento[r]
+                                         else "tempo_cpu" if cpu[r] >= orcamento_cpu[r]
+                                         else "sem_melhora"))
+
+            fica = ~fim
+            ativos, alpha, limite = ativos[fica], alpha[fica], limite[fica]
+            best, sem_melhora, it = best[fica], sem_melhora[fica], it[fica]
+            sol, cargas, tempos = sol[fica], cargas[fica], tempos[fica]
+            if sorteios is not None:
+                sorteios = sorteios[fica]
+        if not ativos.size:
+            break
+
+        inicio = time.perf_counter()
+        if medir_cpu:
+            inicio_cpu = time.process_time()
+
+        if pos == bloco:
+            sorteios = np.stack([geradores[r].random((bloco, 3)) for r in ativos])
+            pos = 0
+        u = sorteios[:, pos]
+        pos += 1
+
+        k = ativos.size
+        it += 1
+        valor_atual = np.empty(k, dtype=np.int64)
+        aleatorio = u[:, 0] < alpha
+        ra = np.flatnonzero(aleatorio)
+        rb = np.flatnonzero(~aleatorio)
+
+        t0 = time.perf_counter()
+        cont["tempo_rng"][ativos] += (t0 - inicio) / k
+
+        # passo aleatório: tarefa e destino (uniforme entre as outras m - 1 máquinas)
+        if ra.size:
+            tarefa = (u[ra, 1] * n).astype(np.int64)
+            origem = sol[ra, tarefa]
+            destino = (origem + 1 + (u[ra, 2] * (m - 1)).astype(np.int64)) % m
+            t1 = time.perf_counter()
+            p = tempos[ra, tarefa]
+            cargas[ra, origem] -= p
+            cargas[ra, destino] += p
+            sol[ra, tarefa] = destino
+            valor_atual[ra] = cargas[ra].max(axis=1)
+            t2 = time.perf_counter()
+
+            fa = ativos[ra]
+            cont["passos_aleatorios"][fa] += 1
+            cont["tempo_rng"][fa] += (t1 - t0) / ra.size
+            cont["tempo_movimento"][fa] += (t2 - t1) / ra.size
+            t0 = t2
+
+        # melhor melhora: aplica só onde melhora o makespan atual
+        if rb.size:
+            tarefa, destino, novo, avaliados = _melhor_melhora_lote(sol[rb], cargas[rb], tempos[rb], m)
+            melhora = novo < cargas[rb].max(axis=1)
+            t1 = time.perf_counter()
+
+            rm, tarefa, destino = rb[melhora], tarefa[melhora], destino[melhora]
+            origem = sol[rm, tarefa]
+            p = tempos[rm, tarefa]
+            cargas[rm, origem] -= p
+            cargas[rm, destino] += p
+            sol[rm, tarefa] = destino
+            t2 = time.perf_counter()
+
+            valor_atual[rb] = np.where(melhora, novo, best[rb])
+
+            fb = ativos[rb]
+            cont["avaliacoes"][fb] += avaliados
+            cont["passos_melhora"][fb] += melhora
+            cont["passos_sem_melhora"][fb] += ~melhora
+            cont["tempo_avaliacao"][fb] += (t1 - t0) / rb.size
+            if rm.size:
+                cont["tempo_movimento"][ativos[rm]] += (t2 - t1) / rm.size
+
+        melhorou = valor_atual < best
+        best = np.where(melhorou, valor_atual, best)
+        sem_melhora = np.where(melhorou, 0, sem_melhora + 1)
+        cont["iteracao_melhor"][ativos[melhorou]] = it[melhorou]
+
+        tempo[ativos] += (time.perf_counter() - inicio) / k
+        if medir_cpu:
+            cpu[ativos] += (time.process_time() - inicio_cpu) / k
+
+        if rastros is not None:
+            for j in np.flatnonzero(melhorou):
+                rastro = rastros[ativos[j]]
+                if rastro is not None:
+                    rastro.registrar(int(it[j]), int(best[j]), float(tempo[ativos[j]]))
+
+    return resultados
@@ -0,0 +1,100 @@
+import time
+
+from .cargas import limite_inferior
+
+# ============================================================
+# Critérios de parada além de max_sem_melhora
+#
+# Combinados por "ou": a busca para no primeiro que disparar, e o motivo
+# vai para a coluna motivo_parada dos resultados:
+#   sem_melhora      max_sem_melhora iterações sem melhorar o best (padrão)
+#   limite_inferior  best == LB = max(maior tarefa, teto(soma / m)): ótimo provado
+#   alvo             best <= makespan alvo
+#   tempo            orçamento de relógio (s) desde o início da busca
+#   tempo_cpu        orçamento de CPU do processo (s)
+#
+# Nos laços, o valor só é testado quando o best melhora e o relógio
+# reaproveita a marca de tempo que a instrumentação já tira a cada
+# iteração; a CPU (chamada de sistema) só é lida quando essa marca passa
+# do prazo da próxima leitura, a cada INTERVALO_CPU segundos de relógio,
+# então o estouro do orçamento fica limitado em tempo, não em iterações.
+# ============================================================
+
+MOTIVOS_PARADA = ("sem_melhora", "limite_inferior", "alvo", "tempo", "tempo_cpu")
+
+INTERVALO_CPU = 0.01  # s
+
+
+class CriterioParada:
+    """
+    Condições de parada de uma execução; o laço de busca grava em `motivo`
+    o que a encerrou. Todas opcionais (None = desligada).
+    """
+    __slots__ = ("limite_inferior", "alvo", "tempo", "tempo_cpu", "valor_parada", "fim_tempo", "fim_cpu", "motivo")
+
+    def __init__(self, limite_inferior=None, alvo=None, tempo=None, tempo_cpu=None):
+        self.limite_inferior = limite_inferior
+        self.alvo = alvo
+        self.tempo = tempo
+        self.tempo_cpu = tempo_cpu
+        # best <= valor_parada encerra a busca (pelo LB ou pelo alvo)
+        limites = [v for v in (limite_inferior, alvo) if v is not None]
+        self.valor_parada = max(limites) if limites else None
+        self.fim_tempo = None
+        self.fim_cpu = None
+        self.motivo = "sem_melhora"
+
+    def iniciar(self, agora=None):
+        """Começa a contar os orçamentos (agora: time.perf_counter() do laço)."""
+        if self.tempo is not None:
+            self.fim_tempo = (time.perf_counter() if agora is None else agora) + self.tempo
+        if self.tempo_cpu is not None:
+            self.fim_cpu = time.process_time() + self.tempo_cpu
+
+    def por_valor(self, best):
+        """Motivo se best já encerra a busca, senão None."""
+        if self.limite_inferior is not None and best <= self.limite_inferior:
+            return "limite_inferior"
+        if self.alvo is not None and best <= self.alvo:
+            return "alvo"
+        return None
+
+    def cpu_esgotada(self):
+        return self.fim_cpu is not None and time.process_time() >= self.fim_cpu
+
+
+def criterio_de_params(params, tempos, m):
+    """
+    CriterioParada dos params de um job:
+      parar_no_limite (bool): para ao atingir o limite inferior da instância
+      alvo: makespan alvo; tempo_maximo / tempo_cpu_maximo: orçamentos (s)
+    """
+    return CriterioParada(
+        limite_inferior=limite_inferior(tempos, m) if params.get("parar_no_limite") else None,
+        alvo=params.get("alvo"),
+        tempo=params.get("tempo_maximo"),
+        tempo_cpu=params.get("tempo_cpu_maximo"),
+    )
+
+
+def descrever_parada(params):
+    """Critérios extras dos params em texto, para o resumo (ex: 'limite inferior, tempo 2s')."""
+    partes = []
+    if params.get("parar_no_limite"):
+        partes.append("limite inferior")
+    if params.get("alvo") is not None:
+        partes.append(f"alvo {params['alvo']}")
+    if params.get("tempo_maximo") is not None:
+        partes.append(f"tempo {params['tempo_maximo']}s")
+    if params.get("tempo_cpu_maximo") is not None:
+        partes.append(f"CPU {params['tempo_cpu_maximo']}s")
+    return ", ".join(partes) or "nenhum"
+
+
+def contar_motivos(linhas):
+    """'motivo: contagem, ...' das linhas de resultados, na ordem de MOTIVOS_PARADA."""
+    contagem = dict.fromkeys(MOTIVOS_PARADA, 0)
+    for linha in linhas:
+        motivo = linha.get("motivo_parada", "sem_melhora")
+        contagem[motivo] = contagem.get(motivo, 0) + 1
+    return ", ".join(f"{motivo}: {qtd}" for motivo, qtd in contagem.items() if qtd)
@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+# ============================================================
+# Gravação incremental dos resultados (JSONL, só anexa)
+#
+# Cada execução vira uma linha JSON assim que termina, então uma queda
+# ou Ctrl-C no meio da grade não perde o que já rodou. Os relatórios
+# TXT/XLSX são gerados depois, relendo o arquivo em streaming.
+# ============================================================
+
+
+class GravadorResultados:
+    """
+    Anexa linhas de resultado a um arquivo JSONL.
+
+    O arquivo é aberto com buffer de linha (cada linha vai para o SO ao ser
+    gravada) e o fsync é feito em lotes: a cada `fsync_a_cada` linhas ou
+    `fsync_intervalo` segundos, e sempre ao fechar.
+    """
+
+    def __init__(self, caminho, fsync_a_cada=50, fsync_intervalo=5.0):
+        self.caminho = caminho
+        self.fsync_a_cada = fsync_a_cada
+        self.fsync_intervalo = fsync_intervalo
+
+        _descartar_linha_incompleta(caminho)
+        self._f = open(caminho, "a", encoding="utf-8", buffering=1)
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def gravar(self, linha):
+        self._f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+        self._pendentes += 1
+
+        if (self._pendentes >= self.fsync_a_cada
+                or time.monotonic() - self._ultimo_fsync >= self.fsync_intervalo):
+            self._sincronizar()
+
+    def _sincronizar(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def fechar(self):
+        if not self._f.closed:
+            self._sincronizar()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def _descartar_linha_incompleta(caminho):
+    """
+    Remove uma última linha sem "\n" (gravação interrompida), para que as
+    linhas anexadas ao retomar um experimento não fiquem coladas nela.
+    """
+    if not os.path.exists(caminho):
+        return
+
+    with open(caminho, "rb+") as f:
+        tam = f.seek(0, os.SEEK_END)
+        pos = tam
+        while pos > 0:
+            inicio = max(0, pos - 4096)
+            f.seek(inicio)
+            bloco = f.read(pos - inicio)
+            i = bloco.rfind(b"\n")
+            if i != -1:
+                pos = inicio + i + 1
+                break
+            pos = inicio
+        if pos != tam:
+            f.truncate(pos)
+
+
+def ler_resultados(caminho):
+    """
+    Lê as linhas de um arquivo JSONL uma a uma.
+    Uma última linha incompleta (gravação interrompida) é ignorada.
+    """
+    with open(caminho, encoding="utf-8") as f:
+        for texto in f:
+            if not texto.endswith("\n"):
+                return
+            yield json.loads(texto)
+
+
+class ArquivoResultados:
+    """
+    Resultados gravados em JSONL, iteráveis quantas vezes for preciso
+    (cada iteração relê o arquivo), sem manter as linhas em memória.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+
+    def __iter__(self):
+        return ler_resultados(self.caminho)
+
+
+def ler_metadados(caminho):
+    """Metadados de um experimento (semente, suíte, tempo acumulado...), ou None."""
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def gravar_metadados(caminho, dados):
+    """Grava os metadados de forma atômica (arquivo temporário + rename)."""
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, caminho)
@@ -0,0 +1,538 @@
+import random
+from bisect import bisect_left
+from functools import partial
+from itertools import chain
+from math import gcd
+
+from .adaptacao import JANELA_PADRAO
+from .cargas import (
+    IndiceCargas,
+    TarefasPorMaquina,
+    TarefasPorMaquinaCompacta,
+    makespan,
+    maior_excluindo,
+    top3_cargas,
+    validar_armazenamento,
+)
+from .construcao import RCL_PADRAO
+
+try:
+    import numpy as np
+except ImportError:  # avaliador "numpy" é opcional
+    np = None
+
+# ============================================================
+# Avaliadores da vizinhança "mover 1 tarefa de máquina"
+# Todos devolvem (tarefa, origem, destino, novo_valor);
+# tarefa = None quando nenhum movimento melhora o makespan.
+#
+# Vizinhança "trocar" (avaliar_trocas_criticas): troca uma tarefa da
+# máquina crítica com uma tarefa de outra máquina; devolve também a
+# parceira. preparar_vizinhanca combina as duas para os laços de busca.
+#
+# Primeira melhora (PrimeiraMelhora): aplica o primeiro movimento que
+# melhora, varrendo em ordem aleatória ou rotativa.
+#
+# contadores (instrumentacao.Contadores, opcional): cada avaliador soma
+# em contadores.avaliacoes os vizinhos que avaliou na chamada.
+# ============================================================
+
+
+def avaliar_melhor_melhora(sol, cargas, tempos, m, indice=None, contadores=None):
+    """
+    Varre toda a vizinhança "mover 1 tarefa de máquina"
+    e retorna o melhor movimento que MELHORA o makespan.
+
+    Otimização:
+    novo makespan = max(nova_carga_origem, nova_carga_dest, maior_carga_das_outras)
+    onde "maior_carga_das_outras" vem do top3 (sem loop em m para cada vizinho).
+    Se `indice` (IndiceCargas) for passado, makespan e top3 saem dele em O(1).
+    """
+    if indice is not None:
+        valor_atual = indice.makespan()
+        t3 = indice.top3()
+    else:
+        valor_atual = makespan(cargas)
+        t3 = top3_cargas(cargas)
+    n = len(tempos)
+
+    melhor_valor = valor_atual
+    melhor_tarefa = None
+    melhor_origem = None
+    melhor_destino = None
+
+    for tarefa in range(n):
+        origem = sol[tarefa]
+        p = tempos[tarefa]
+
+        for destino in range(m):
+            if destino == origem:
+                continue
+
+            nova_origem = cargas[origem] - p
+            nova_dest = cargas[destino] + p
+
+            outras = maior_excluindo(t3, origem, destino)
+            novo_ms = max(nova_origem, nova_dest, outras)
+
+            if novo_ms < melhor_valor:
+                melhor_valor = novo_ms
+                melhor_tarefa = tarefa
+                melhor_origem = origem
+                melhor_destino = destino
+
+    if contadores is not None:
+        contadores.avaliacoes += n * (m - 1)
+    return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
+
+
+def avaliar_melhor_melhora_numpy(sol, cargas, tempos, m, indice=None, contadores=None):
+    """
+    Mesma vizinhança e mesmo desempate de avaliar_melhor_melhora,
+    mas calculando a matriz n x m de makespans vizinhos de uma vez com NumPy.
+
+    Para cada (tarefa, destino):
+        max(carga_origem - p, carga_destino + p, maior_carga_das_outras)
+    onde "maior_carga_das_outras" sai do top3 com máscaras sobre origem/destino.
+    O argmin na matriz achatada devolve a primeira ocorrência em ordem
+    (tarefa, destino), igual ao "<" estrito do laço em Python.
+    """
+    if np is None:
+        raise ImportError("avaliador 'numpy' requer o pacote numpy (pip install numpy)")
+
+    if indice is not None:
+        valor_atual = indice.makespan()
+        t3 = indice.top3()
+    else:
+        valor_atual = makespan(cargas)
+        t3 = top3_cargas(cargas)
+
+    sol_a = np.asarray(sol, dtype=np.int64)
+    cargas_a = np.asarray(cargas, dtype=np.int64)
+    tempos_a = np.asarray(tempos, dtype=np.int64)
+
+    origem = sol_a[:, None]
+    destino = np.arange(m)[None, :]
+
+    nova_origem = (cargas_a[sol_a] - tempos_a)[:, None]
+    nova_dest = cargas_a[None, :] + tempos_a[:, None]
+
+    # maior_excluindo vetorizado: percorre o top3 de trás para frente,
+    # de modo que o primeiro elemento válido seja o que prevalece
+    outras = np.zeros((len(tempos_a), m), dtype=np.int64)
+    for c, i in reversed(t3):
+        valido = (origem != i) & (destino != i)
+        outras = np.where(valido, c, outras)
+
+    novo_ms = np.maximum(np.maximum(nova_origem, nova_dest), outras)
+    novo_ms[np.arange(len(tempos_a)), sol_a] = np.iinfo(np.int64).max  # destino == origem
+
+    if contadores is not None:
+        contadores.avaliacoes += len(tempos_a) * (m - 1)
+
+    k = int(np.argmin(novo_ms))
+    tarefa, dest = divmod(k, m)
+    melhor_valor = int(novo_ms[tarefa, dest])
+
+    if melhor_valor >= valor_atual:
+        return None, None, None, valor_atual
+
+    return tarefa, int(sol_a[tarefa]), dest, melhor_valor
+
+
+def avaliar_vizinhanca_critica(sol, cargas, tempos, m, indice=None, tarefas_maq=None, contadores=None):
+    """
+    Melhor melhora exata restrita às máquinas críticas (carga = makespan).
+
+    Um movimento só reduz o makespan se tirar a tarefa de uma máquina crítica;
+    se houver 2+ máquinas críticas, nenhum movimento único melhora.
+    Com a única crítica c (carga L), para cada destino d o melhor p minimiza
+    max(L - p, carga_d + p), que é mínimo perto de p = (L - carga_d) / 2:
+    basta olhar os dois vizinhos desse alvo na lista ordenada de c.
+
+    Devolve um movimento com o mesmo makespan da varredura completa,
+    em O(m log n) em vez de O(n*m).
+    """
+    if indice is None:
+        indice = IndiceCargas(cargas)
+    if tarefas_maq is None:
+        tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+
+    t3 = indice.top3()
+    valor_atual, critica = t3[0]
+
+    melhor_valor = valor_atual
+    melhor_tarefa = None
+    melhor_origem = None
+    melhor_destino = None
+
+    if len(t3) > 1 and t3[1][0] == valor_atual:
+        return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
+
+    lista = tarefas_maq.listas[critica]
+    if not lista:
+        return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
+
+    avaliados = 0
+    for destino in range(m):
+        if destino == critica:
+            continue
+
+        outras = maior_excluindo(t3, critica, destino)
+        if outras >= melhor_valor:
+            continue
+
+        carga_dest = cargas[destino]
+        k = bisect_left(lista, ((valor_atual - carga_dest) / 2,))
+
+        for j in (k - 1, k):
+            if 0 <= j < len(lista):
+                p, tarefa = lista[j]
+                novo_ms = max(valor_atual - p, carga_dest + p, outras)
+                avaliados += 1
+
+                if novo_ms < melhor_valor:
+                    melhor_valor = novo_ms
+                    melhor_tarefa = tarefa
+                    melhor_origem = critica
+                    melhor_destino = destino
+
+    if contadores is not None:
+        contadores.avaliacoes += avaliados
+    return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
+
+
+def avaliar_vizinhanca_critica_compacta(sol, cargas, tempos, m, indice=None, tarefas_maq=None, contadores=None):
+    """
+    avaliar_vizinhanca_critica sobre TarefasPorMaquinaCompacta (armazenamento
+    "arrays"): mesma busca binária e mesmo desempate, nas chaves p * base + tarefa.
+
+    bisect_left por (alvo,) nos pares acha o primeiro p >= alvo; com p
+    inteiro é a primeira chave >= teto(alvo) * base.
+    """
+    if indice is None:
+        indice = IndiceCargas(cargas)
+    if tarefas_maq is None:
+        tarefas_maq = TarefasPorMaquinaCompacta(sol, tempos, m)
+
+    t3 = indice.top3()
+    valor_atual, critica = t3[0]
+
+    melhor_valor = valor_atual
+    melhor_tarefa = None
+    melhor_origem = None
+    melhor_destino = None
+
+    if len(t3) > 1 and t3[1][0] == valor_atual:
+        return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
+
+    lista = tarefas_maq.listas[critica]
+    if not lista:
+        return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
+    base = tarefas_maq.base
+    tam = len(lista)
+
+    avaliados = 0
+    for destino in range(m):
+        if destino == critica:
+            continue
+
+        outras = maior_excluindo(t3, critica, destino)
+        if outras >= melhor_valor:
+            continue
+
+        carga_dest = cargas[destino]
+        k = bisect_left(lista, (valor_atual - carga_dest + 1) // 2 * base)
+
+        for j in (k - 1, k):
+            if 0 <= j < tam:
+                chave = lista[j]
+                p = chave // base
+                novo_ms = max(valor_atual - p, carga_dest + p, outras)
+                avaliados += 1
+
+                if novo_ms < melhor_valor:
+                    melhor_valor = novo_ms
+                    melhor_tarefa = chave - p * base
+                    melhor_origem = critica
+                    melhor_destino = destino
+
+    if contadores is not None:
+        contadores.avaliacoes += avaliados
+    return melhor_tarefa, melhor_origem, melhor_destino, melhor_valor
+
+
+def avaliar_trocas_criticas(sol, cargas, tempos, m, indice=None, tarefas_maq=None, contadores=None):
+    """
+    Melhor troca que melhora o makespan: tarefa (p1) da única máquina
+    crítica c (carga L) <-> parceira (p2) de outra máquina d.
+
+    Com delta = p1 - p2, o novo makespan é max(L - delta, carga_d + delta, outras),
+    mínimo perto de delta = (L - carga_d) / 2. Para cada d e cada tarefa de c,
+    a parceira ideal tem p2 perto de p1 - (L - carga_d) / 2: basta olhar os
+    dois vizinhos desse alvo na lista ordenada de d.
+    Como no movimento simples, com 2+ máquinas críticas nenhuma troca melhora.
+
+    Custo O(|tarefas de c| * m * log n), em vez de O(n^2) pares.
+    Devolve (tarefa, origem, destino, novo_valor, parceira).
+    """
+    if indice is None:
+        indice = IndiceCargas(cargas)
+    if tarefas_maq is None:
+        tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+
+    t3 = indice.top3()
+    valor_atual, critica = t3[0]
+
+    melhor_valor = valor_atual
+    melhor = (None, None, None)
+
+    if len(t3) > 1 and t3[1][0] == valor_atual:
+        return None, None, None, melhor_valor, None
+
+    lista_c = tarefas_maq.listas[critica]
+
+    avaliados = 0
+    for destino in range(m):
+        if destino == critica:
+            continue
+
+        outras = maior_excluindo(t3, critica, destino)
+        if outras >= melhor_valor:
+            continue
+
+        lista_d = tarefas_maq.listas[destino]
+        if not lista_d:
+            continue
+
+        carga_dest = cargas[destino]
+        meio = (valor_atual - carga_dest) / 2
+
+        for p1, tarefa in lista_c:
+            k = bisect_left(lista_d, (p1 - meio,))
+
+            for j in (k - 1, k):
+                if 0 <= j < len(lista_d):
+                    p2, parceira = lista_d[j]
+                    delta = p1 - p2
+                    novo_ms = max(valor_atual - delta, carga_dest + delta, outras)
+                    avaliados += 1
+
+                    if novo_ms < melhor_valor:
+                        melhor_valor = novo_ms
+                        melhor = (tarefa, destino, parceira)
+
+    if contadores is not None:
+        contadores.avaliacoes += avaliados
+
+    tarefa, destino, parceira = melhor
+    origem = critica if tarefa is not None else None
+    return tarefa, origem, destino, melhor_valor, parceira
+
+
+ORDENS = ("aleatoria", "rotativa")
+
+
+class PrimeiraMelhora:
+    """
+    Avaliador de primeira melhora na vizinhança "mover": devolve o primeiro
+    movimento que melhora o makespan, na ordem de varredura escolhida.
+
+    ordem:
+    - "aleatoria": a cada chamada, tarefas a partir de uma sorteada, com um
+      passo sorteado entre os primos com n (visita todas, sem embaralhar a
+      lista inteira: O(1) para começar mesmo quando o primeiro movimento
+      aparece logo), e destinos a partir de um deslocamento aleatório
+    - "rotativa": recomeça logo após a tarefa (e o destino) do último
+      movimento encontrado, sem viés para o começo da lista
+
+    Só tarefas de máquinas com carga = makespan podem melhorar (tirar
+    tarefa de outra máquina não reduz o máximo); as demais são puladas
+    sem olhar destinos. Sem movimento que melhore, a varredura foi
+    completa: o ótimo local é o mesmo certificado pela melhor melhora.
+    """
+
+    def __init__(self, n, m, ordem="aleatoria", rng=random, contadores=None):
+        if ordem not in ORDENS:
+            raise ValueError(f"ordem desconhecida: {ordem!r} (opções: {', '.join(ORDENS)})")
+        self.ordem = ordem
+        self.rng = rng
+        self.contadores = contadores
+        self.n = n
+        self.passos = [a for a in range(1, n) if gcd(a, n) == 1] or [1]
+        self.proxima_tarefa = 0
+        self.proximo_destino = 0
+
+    def __call__(self, sol, cargas, tempos, m, indice=None):
+        if indice is not None:
+            valor_atual = indice.makespan()
+            t3 = indice.top3()
+        else:
+            valor_atual = makespan(cargas)
+            t3 = top3_cargas(cargas)
+        n = self.n
+
+        if self.ordem == "aleatoria":
+            inicio, passo = self.rng.randrange(n), self.rng.choice(self.passos)
+            ordem_tarefas = ((inicio + passo * i) % n for i in range(n))
+            deslocamento = self.rng.randrange(m)
+        else:
+            ordem_tarefas = chain(range(self.proxima_tarefa, n), range(self.proxima_tarefa))
+            deslocamento = self.proximo_destino
+
+        avaliados = 0
+        for tarefa in ordem_tarefas:
+            origem = sol[tarefa]
+            if cargas[origem] < valor_atual:
+                continue
+
+            p = tempos[tarefa]
+            nova_origem = cargas[origem] - p
+
+            for k in range(m):
+                destino = (deslocamento + k) % m
+                if destino == origem:
+                    continue
+
+                novo_ms = max(nova_origem, cargas[destino] + p, maior_excluindo(t3, origem, destino))
+                avaliados += 1
+                if novo_ms < valor_atual:
+                    self.proxima_tarefa = (tarefa + 1) % n
+                    self.proximo_destino = (destino + 1) % m
+                    if self.contadores is not None:
+                        self.contadores.avaliacoes += avaliados
+                    return tarefa, origem, destino, novo_ms
+
+        if self.contadores is not None:
+            self.contadores.avaliacoes += avaliados
+        return None, None, None, valor_atual
+
+
+AVALIADORES = {
+    "python": avaliar_melhor_melhora,
+    "numpy": avaliar_melhor_melhora_numpy,
+    "critica": avaliar_vizinhanca_critica,
+}
+
+
+def preparar_avaliador(avaliador, sol, tempos, m, contadores=None, armazenamento="listas"):
+    """
+    Devolve (avaliar, tempos_aval, tarefas_maq) prontos para o laço de busca:
+    - avaliar(sol, cargas, tempos_aval, m, indice) -> movimento
+    - tempos_aval: tempos no formato que o avaliador consome
+    - tarefas_maq: índice de tarefas por máquina a manter (ou None)
+    contadores, se dado, já vai amarrado ao avaliar. Com armazenamento
+    "arrays", "critica" usa o índice compacto (sem objetos por tarefa).
+    """
+    if avaliador not in AVALIADORES:
+        raise ValueError(f"avaliador desconhecido: {avaliador!r} (opções: {', '.join(AVALIADORES)})")
+
+    avaliar = AVALIADORES[avaliador]
+    tempos_aval = tempos
+    tarefas_maq = None
+    if avaliador == "numpy" and np is not None:
+        tempos_aval = np.asarray(tempos, dtype=np.int64)  # converte uma vez só
+    elif avaliador == "critica" and armazenamento == "arrays":
+        tarefas_maq = TarefasPorMaquinaCompacta(sol, tempos, m)
+        avaliar = partial(avaliar_vizinhanca_critica_compacta, tarefas_maq=tarefas_maq)
+    elif avaliador == "critica":
+        tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+        avaliar = partial(avaliar_vizinhanca_critica, tarefas_maq=tarefas_maq)
+
+    if contadores is not None:
+        avaliar = partial(avaliar, contadores=contadores)
+
+    return avaliar, tempos_aval, tarefas_maq
+
+
+VIZINHANCAS = ("mover", "trocar", "mover+trocar")
+
+
+ESTRATEGIAS = ("melhor", "primeira")
+
+
+def preparar_vizinhanca(vizinhanca, avaliador, sol, tempos, m, estrategia="melhor", ordem="aleatoria", rng=random,
+                        contadores=None, armazenamento="listas"):
+    """
+    Como preparar_avaliador, mas para a vizinhança escolhida; avaliar devolve
+    (tarefa, origem, destino, novo_valor, parceira), com parceira = None
+    quando o vizinho é um movimento simples.
+    - "mover": só movimentos, com o avaliador dado
+    - "trocar": só trocas (sempre pelas máquinas críticas; avaliador ignorado)
+    - "mover+trocar": o melhor dos dois (empate fica com o movimento)
+
+    estrategia="primeira" usa PrimeiraMelhora (com `ordem` e `rng`) no lugar
+    do avaliador; só vale para a vizinhança "mover".
+    contadores (opcional) recebe os vizinhos avaliados.
+    armazenamento "arrays" (instâncias grandes) só vale para "mover" com
+    melhor melhora: trocas e primeira melhora mantêm objetos por tarefa.
+    """
+    validar_armazenamento(armazenamento)
+    if vizinhanca not in VIZINHANCAS:
+        raise ValueError(f"vizinhança desconhecida: {vizinhanca!r} (opções: {', '.join(VIZINHANCAS)})")
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"estratégia desconhecida: {estrategia!r} (opções: {', '.join(ESTRATEGIAS)})")
+
+    if armazenamento == "arrays" and (vizinhanca != "mover" or estrategia != "melhor"):
+        raise ValueError("armazenamento 'arrays' só está disponível para a vizinhança 'mover' com melhor melhora")
+
+    if estrategia == "primeira":
+        if vizinhanca != "mover":
+            raise ValueError("estratégia 'primeira' só está disponível para a vizinhança 'mover'")
+        primeira = PrimeiraMelhora(len(tempos), m, ordem, rng, contadores)
+
+        def avaliar(sol, cargas, tempos, m, indice=None):
+            return (*primeira(sol, cargas, tempos, m, indice), None)
+
+        return avaliar, tempos, None
+
+    if vizinhanca == "trocar":
+        tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+        return partial(avaliar_trocas_criticas, tarefas_maq=tarefas_maq, contadores=contadores), tempos, tarefas_maq
+
+    avaliar_mov, tempos_aval, tarefas_maq = preparar_avaliador(avaliador, sol, tempos, m, contadores, armazenamento)
+
+    if vizinhanca == "mover":
+        def avaliar(sol, cargas, tempos_aval, m, indice=None):
+            return (*avaliar_mov(sol, cargas, tempos_aval, m, indice), None)
+
+        return avaliar, tempos_aval, tarefas_maq
+
+    if tarefas_maq is None:
+        tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+
+    def avaliar(sol, cargas, tempos_aval, m, indice=None):
+        mov = avaliar_mov(sol, cargas, tempos_aval, m, indice)
+        troca = avaliar_trocas_criticas(sol, cargas, tempos, m, indice, tarefas_maq, contadores)
+        if troca[0] is not None and (mov[0] is None or troca[3] < mov[3]):
+            return troca
+        return (*mov, None)
+
+    return avaliar, tempos_aval, tarefas_maq
+
+
+def rotulo_variante(nome, params):
+    """
+    Nome da heurística com as variantes fora do padrão, ex:
+    blm_melhor_melhora[mover+trocar], blm_melhor_melhora[primeira:rotativa],
+    blm_melhor_melhora[lpt], blnm_monotona_randomizada[grasp:0.3],
+    blnm_monotona_randomizada[lote] ou blnm_monotona_randomizada[adaptativo:bandit].
+    """
+    variantes = []
+    if params.get("vizinhanca", "mover") != "mover":
+        variantes.append(params["vizinhanca"])
+    if params.get("estrategia", "melhor") != "melhor":
+        variantes.append(f"{params['estrategia']}:{params.get('ordem', 'aleatoria')}")
+    if params.get("motor", "escalar") != "escalar":
+        variantes.append(params["motor"])
+    if params.get("crn"):
+        variantes.append("crn")
+    construcao = params.get("construcao", "aleatoria")
+    if construcao == "grasp":
+        variantes.append(f"grasp:{params.get('rcl', RCL_PADRAO)}")
+    elif construcao != "aleatoria":
+        variantes.append(construcao)
+    if params.get("alpha_adaptativo") is not None:
+        janela = params.get("janela_alpha", JANELA_PADRAO)
+        variantes.append(f"adaptativo:{params['alpha_adaptativo']}" + (f":{janela}" if janela != JANELA_PADRAO else ""))
+    return f"{nome}[{','.join(variantes)}]" if variantes else nome
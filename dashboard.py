@@ -2,10 +2,23 @@ import os
 import glob
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
+from busca_local.colunar import ARROW_DISPONIVEL
+from busca_local.historico import (
+    HistoricoResultados,
+    agregar_cubo,
+    caminho_rastros,
+    ler_arquivo_resultados,
+    ler_corrida,
+    ler_cubo_resultados,
+    ler_rastros,
+    ler_trajetorias_alpha,
+)
+
 
 # =========================
 # Config do App
@@ -36,69 +49,212 @@ def encontrar_mais_recente(pasta: str, padrao: str) -> str | None:
     return arquivos[0]
 
 
+def encontrar_resultados(pasta: str, prefixo: str) -> str | None:
+    """
+    Resultado mais recente de uma pasta: o .arrow (colunar) quando existe e
+    o pyarrow está instalado; senão o .xlsx (execuções antigas).
+    """
+    xlsx = encontrar_mais_recente(pasta, f"{prefixo}_*.xlsx")
+    if xlsx and ARROW_DISPONIVEL:
+        arrow = os.path.splitext(xlsx)[0] + ".arrow"
+        if os.path.exists(arrow):
+            return arrow
+    return xlsx
+
+
+@st.cache_data(show_spinner=False)
+def carregar_resultados(path: str) -> tuple[pd.DataFrame, dict]:
+    """(resultados, resumo) de um .arrow ou .xlsx (ver busca_local/historico.py)."""
+    return ler_arquivo_resultados(path)
+
+
 @st.cache_data(show_spinner=False)
-def ler_resultados_xlsx(path: str) -> pd.DataFrame:
-    """Lê a aba 'resultados' de um XLSX e padroniza tipos."""
-    df = pd.read_excel(path, sheet_name="resultados")
-
-    # Padroniza nomes (por garantia)
-    df.columns = [c.strip().lower() for c in df.columns]
-
-    # Tipos
-    if "n" in df: df["n"] = pd.to_numeric(df["n"], errors="coerce").astype("Int64")
-    if "m" in df: df["m"] = pd.to_numeric(df["m"], errors="coerce").astype("Int64")
-    if "replicacao" in df: df["replicacao"] = pd.to_numeric(df["replicacao"], errors="coerce").astype("Int64")
-    if "tempo" in df: df["tempo"] = pd.to_numeric(df["tempo"], errors="coerce")
-    if "iteracoes" in df: df["iteracoes"] = pd.to_numeric(df["iteracoes"], errors="coerce").astype("Int64")
-    if "valor" in df: df["valor"] = pd.to_numeric(df["valor"], errors="coerce").astype("Int64")
-
-    # parametro pode ser alpha (float) ou "NA"
-    if "parametro" in df:
-        df["parametro_num"] = pd.to_numeric(df["parametro"], errors="coerce")
+def carregar_cubo(path: str) -> tuple[pd.DataFrame, dict]:
+    """(cubo, resumo) do .cubo.json ao lado do arquivo, ou calculado dele (execuções antigas)."""
+    return ler_cubo_resultados(path)
+
+
+def medias_cubo(cubo: pd.DataFrame, chaves: list[str]) -> pd.DataFrame:
+    """Tabela de médias por `chaves`, somando as células (já filtradas) do cubo."""
+    agg = agregar_cubo(cubo, chaves).sort_values(chaves)
+    return agg[chaves + ["valor_media", "valor_desvio", "tempo_media", "iteracoes_media", "registros"]].rename(
+        columns={
+            "valor_media": "valor_medio",
+            "tempo_media": "tempo_medio",
+            "iteracoes_media": "iter_medias",
+            "registros": "execucoes",
+        }
+    )
+
+
+def metrica_tempo_total(col, resumo: dict) -> None:
+    """KPI do tempo total do experimento (resumo do arquivo/cubo)."""
+    tempo_total_str = resumo.get("tempo_total_str")
+    tempo_total_s = resumo.get("tempo_total_s")
+    if tempo_total_str:
+        if tempo_total_s is not None:
+            col.metric("Tempo total (experimento)", f"{tempo_total_str} ({tempo_total_s:.2f}s)")
+        else:
+            col.metric("Tempo total (experimento)", f"{tempo_total_str}")
+    elif tempo_total_s is not None:
+        col.metric("Tempo total (experimento)", f"{fmt_min_seg(tempo_total_s)} ({tempo_total_s:.2f}s)")
     else:
-        df["parametro"] = None
-        df["parametro_num"] = None
+        col.metric("Tempo total (experimento)", "—")
 
-    return df
 
+FASES_TEMPO = {
+    "tempo_avaliacao": "avaliação da vizinhança",
+    "tempo_movimento": "aplicação de movimentos",
+    "tempo_rng": "sorteios",
+}
+TIPOS_PASSO = {
+    "passos_melhora": "guloso com melhora",
+    "passos_sem_melhora": "guloso sem melhora",
+    "passos_aleatorios": "aleatório",
+}
 
-@st.cache_data(show_spinner=False)
-def ler_resumo_xlsx(path: str) -> dict:
+
+def mostrar_instrumentacao(cubo: pd.DataFrame, chaves: list[str], eixo: str, rotulo: str) -> None:
     """
-    Lê a aba 'resumo' (se existir) e tenta extrair:
-    - tempo_total_str  (ex: '2m 49s' OU '0m 65s')
-    - tempo_total_s    (float em segundos, se existir)
+    Contadores de instrumentação (médias do cubo por `chaves`): onde vai o
+    tempo, que tipo de passo foi dado e quanto da execução veio depois do
+    último best (cauda sem melhora). `eixo` é a coluna usada no eixo x.
     """
-    try:
-        df = pd.read_excel(path, sheet_name="resumo", header=None)
-    except Exception:
-        return {}
-
-    # transforma em pares "Item" -> "Valor", tentando achar linhas com esses dois campos
-    resumo = {}
-    for i in range(len(df)):
-        a = df.iloc[i, 0] if df.shape[1] > 0 else None
-        b = df.iloc[i, 1] if df.shape[1] > 1 else None
-        if isinstance(a, str):
-            chave = a.strip()
-            if chave:
-                resumo[chave] = b
-
-    # tenta extrair chaves que você gerou
-    tempo_total_str = resumo.get("Tempo total do script")
-    tempo_total_s = resumo.get("Tempo total do script (s)")
-
-    # normaliza tempo_total_s
-    try:
-        if tempo_total_s is not None:
-            tempo_total_s = float(str(tempo_total_s).replace(",", "."))
-    except Exception:
-        tempo_total_s = None
+    st.subheader(f"Instrumentação por {rotulo}")
+    if "avaliacoes_soma" not in cubo.columns:
+        st.info("Resultados gerados antes da instrumentação: sem contadores para mostrar.")
+        return
+
+    agg = agregar_cubo(cubo, chaves).sort_values(chaves)
+    if eixo not in agg:
+        agg[eixo] = "m=" + agg["m"].astype(str) + ", n=" + agg["n"].astype(str)
+
+    fases = {c: nome for c, nome in FASES_TEMPO.items() if f"{c}_media" in agg}
+    tempo = agg[[eixo]].copy()
+    for c, nome in fases.items():
+        tempo[nome] = agg[f"{c}_media"]
+    tempo["outros (laço)"] = (agg["tempo_media"] - agg[[f"{c}_media" for c in fases]].sum(axis=1)).clip(lower=0)
+
+    passos = agg[[eixo]].copy()
+    for c, nome in TIPOS_PASSO.items():
+        if f"{c}_media" in agg:
+            passos[nome] = agg[f"{c}_media"]
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.caption("Tempo médio por fase (s)")
+        fig = px.bar(tempo.melt(id_vars=eixo, var_name="fase", value_name="segundos"),
+                     x=eixo, y="segundos", color="fase")
+        st.plotly_chart(fig, use_container_width=True)
+    with c2:
+        st.caption("Passos médios por tipo")
+        fig = px.bar(passos.melt(id_vars=eixo, var_name="passo", value_name="passos"),
+                     x=eixo, y="passos", color="passo")
+        st.plotly_chart(fig, use_container_width=True)
+
+    cauda = agg["iteracoes_media"] - agg["iteracao_melhor_media"]
+    tabela = pd.DataFrame({
+        eixo: agg[eixo],
+        "avaliações médias": agg["avaliacoes_media"],
+        "iterações médias": agg["iteracoes_media"],
+        "iteração do best (média)": agg["iteracao_melhor_media"],
+        "cauda sem melhora (iterações)": cauda,
+        "cauda sem melhora (%)": 100 * cauda / agg["iteracoes_media"],
+    })
+    st.dataframe(tabela, use_container_width=True, hide_index=True)
 
-    return {
-        "tempo_total_str": tempo_total_str,
-        "tempo_total_s": tempo_total_s,
-    }
+
+PREFIXO_MOTIVO = "motivo_parada="
+
+
+def mostrar_paradas(cubo: pd.DataFrame, chaves: list[str], eixo: str, rotulo: str) -> None:
+    """
+    Fração das execuções encerradas por cada motivo (contagens
+    motivo_parada=... do cubo) por `chaves`. Só aparece quando algum
+    critério além de max_sem_melhora disparou.
+    """
+    motivos = [c for c in cubo.columns if c.startswith(PREFIXO_MOTIVO)]
+    extras = [c for c in motivos if c != PREFIXO_MOTIVO + "sem_melhora"]
+    if not extras or not cubo[extras].fillna(0).to_numpy().any():
+        return
+
+    st.subheader(f"Motivos de parada por {rotulo}")
+    agg = agregar_cubo(cubo, chaves).sort_values(chaves)
+    if eixo not in agg:
+        agg[eixo] = "m=" + agg["m"].astype(str) + ", n=" + agg["n"].astype(str)
+
+    fracoes = agg[[eixo]].copy()
+    for c in motivos:
+        fracoes[c[len(PREFIXO_MOTIVO):]] = 100 * agg[c] / agg["registros"]
+    fig = px.bar(fracoes.melt(id_vars=eixo, var_name="motivo", value_name="% das execuções"),
+                 x=eixo, y="% das execuções", color="motivo")
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def mostrar_corrida(corrida: dict) -> None:
+    """Varredura "corrida" do BLNM: quem saiu em cada rodada e os vencedores (do .meta.json)."""
+    st.subheader(f"Corrida de α ({corrida['metodo']})")
+    st.caption("Os α eliminados só rodaram nas primeiras rodadas: compare as médias por α "
+               "com cuidado e prefira o posto médio da tabela.")
+    eliminacoes = pd.DataFrame(corrida["eliminacoes"], columns=["candidato", "rodada", "blocos", "posto_medio"])
+    eliminacoes = eliminacoes.rename(columns={"candidato": "α", "blocos": "instâncias", "posto_medio": "posto médio"})
+    st.write("Vencedores (melhor posto médio primeiro):", ", ".join(f"{a:.1f}" for a in corrida["vencedores"]))
+    if "executadas" in corrida:
+        st.write(f"Execuções: {corrida['executadas']} feitas, {corrida['puladas']} puladas pela eliminação "
+                 f"(grade completa: {corrida['executadas'] + corrida['puladas']})")
+    st.dataframe(eliminacoes, use_container_width=True)
+
+
+def mostrar_adaptativo(fixos: pd.DataFrame, adaptativos: pd.DataFrame) -> None:
+    """
+    Execuções com α adaptativo (uma por instância) contra os α fixos da
+    mesma grade, por (m, n): makespan médio do adaptativo, do melhor α
+    fixo daquele (m, n) e da média dos fixos; tempo contra a varredura.
+    """
+    por_alpha = agregar_cubo(fixos, ["m", "n", "parametro"])
+    melhor = por_alpha.loc[por_alpha.groupby(["m", "n"])["valor_media"].idxmin(), ["m", "n", "parametro", "valor_media"]]
+    melhor = melhor.rename(columns={"parametro": "melhor α", "valor_media": "valor (melhor α fixo)"})
+    varredura = agregar_cubo(fixos, ["m", "n"])
+    varredura = varredura.assign(tempo_varredura=varredura["tempo_media"] * varredura["registros"])
+    varredura = varredura[["m", "n", "valor_media", "tempo_varredura"]].rename(
+        columns={"valor_media": "valor (média dos α fixos)", "tempo_varredura": "tempo da varredura (s)"})
+    geral = agregar_cubo(fixos, ["parametro"]).sort_values("valor_media").iloc[0]
+
+    for rotulo, cubo_a in adaptativos.groupby("heuristica"):
+        st.subheader(f"α adaptativo × α fixos ({rotulo})")
+        agg = agregar_cubo(cubo_a, ["m", "n"])
+        agg = agg.assign(tempo_total=agg["tempo_media"] * agg["registros"])
+        tabela = melhor.merge(varredura, on=["m", "n"]).merge(
+            agg[["m", "n", "valor_media", "tempo_total"]].rename(
+                columns={"valor_media": "valor (adaptativo)", "tempo_total": "tempo do adaptativo (s)"}),
+            on=["m", "n"])
+
+        total = agregar_cubo(cubo_a, []).iloc[0]
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("Valor médio (adaptativo)", f"{total['valor_media']:.2f}")
+        k2.metric(f"Valor médio (melhor α fixo: {geral['parametro']:.1f})", f"{geral['valor_media']:.2f}")
+        tempo_adaptativo = tabela["tempo do adaptativo (s)"].sum()
+        if tempo_adaptativo > 0:
+            k3.metric("Varredura ÷ adaptativo (tempo)", f"{tabela['tempo da varredura (s)'].sum() / tempo_adaptativo:.1f}×")
+        if "passos_aleatorios_media" in total:
+            k4.metric("α efetivo (passos aleatórios / iterações)",
+                      f"{total['passos_aleatorios_media'] / total['iteracoes_media']:.2f}")
+
+        tabela = tabela.assign(instancia="m=" + tabela["m"].astype(str) + ", n=" + tabela["n"].astype(str))
+        colunas = ["valor (adaptativo)", "valor (melhor α fixo)", "valor (média dos α fixos)"]
+        fig = px.bar(tabela.melt(id_vars="instancia", value_vars=colunas, var_name="execução", value_name="valor médio"),
+                     x="instancia", y="valor médio", color="execução", barmode="group")
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(tabela.drop(columns=["instancia"]), use_container_width=True)
+
+
+@st.cache_resource(show_spinner=False)
+def historico(pasta: str, prefixo: str) -> HistoricoResultados:
+    """
+    Histórico de uma pasta, compartilhado entre reruns e sessões.
+    Não é limpo pelo botão Atualizar: atualizar() só lê arquivos novos/alterados.
+    """
+    return HistoricoResultados(pasta, prefixo)
 
 
 def fmt_min_seg(segundos: float) -> str:
@@ -118,7 +274,7 @@ def info_arquivo(path: str) -> str:
 # Cabeçalho + Botão Atualizar
 # =========================
 st.title("Dashboard - BLM / BLNM (Busca Local)")
-st.caption("Lê automaticamente os XLSX mais recentes gerados pelos scripts e monta gráficos/tabelas.")
+st.caption("Lê automaticamente os resultados mais recentes gerados pelos scripts (.arrow, ou .xlsx de execuções antigas) e monta gráficos/tabelas.")
 
 # Estado para mostrar "Atualizado em..."
 if "last_refresh" not in st.session_state:
@@ -136,11 +292,227 @@ if st.session_state["last_refresh"]:
     st.success(f"✅ Dados atualizados em {st.session_state['last_refresh']}")
 
 
+# =========================
+# Modo histórico: todos os experimentos de cada pasta
+# =========================
+def mostrar_historico(nome: str, pasta: str, prefixo: str, por_alpha: bool) -> None:
+    """Tabela do índice de experimentos + médias lado a lado dos experimentos escolhidos."""
+    st.divider()
+    st.header(f"{nome} - Histórico")
+
+    if not os.path.isdir(pasta):
+        st.warning(f"Não encontrei resultados em: {pasta}")
+        return
+
+    hist = historico(pasta, prefixo)
+    df = hist.atualizar()
+    runs = hist.experimentos()
+    if runs.empty:
+        st.warning(f"Não encontrei resultados em: {pasta}")
+        return
+
+    runs["modificado"] = runs["mtime"].map(lambda t: datetime.fromtimestamp(t).strftime("%d/%m/%Y %H:%M:%S"))
+    st.dataframe(runs.drop(columns=["mtime", "tamanho"]), use_container_width=True, hide_index=True)
+
+    exps = runs["experimento"].tolist()
+    sel = st.multiselect(f"Experimentos ({nome})", exps, default=exps[-5:])
+    df_sel = df[df["experimento"].isin(sel)]
+    if df_sel.empty:
+        st.info("Selecione ao menos um experimento.")
+        return
+
+    if por_alpha:
+        chaves, x = ["experimento", "parametro_num"], "parametro_num"
+    else:
+        chaves, x = ["experimento", "m", "n"], "instancia"
+
+    agg = (
+        df_sel.groupby(chaves, as_index=False)
+        .agg(
+            valor_medio=("valor", "mean"),
+            tempo_medio=("tempo", "mean"),
+            iter_medias=("iteracoes", "mean"),
+            execucoes=("valor", "count"),
+        )
+        .sort_values(chaves)
+    )
+    if not por_alpha:
+        agg["instancia"] = "m=" + agg["m"].astype(str) + ", n=" + agg["n"].astype(str)
+
+    c1, c2 = st.columns(2)
+    for col, y, titulo in [(c1, "valor_medio", "Valor médio (makespan)"), (c2, "tempo_medio", "Tempo médio (s)")]:
+        with col:
+            st.subheader(f"{'α' if por_alpha else 'Instância'} × {titulo} por experimento")
+            if por_alpha:
+                fig = px.line(agg, x=x, y=y, color="experimento", markers=True)
+            else:
+                fig = px.bar(agg, x=x, y=y, color="experimento", barmode="group")
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.subheader("Tabela agregada por experimento")
+    st.dataframe(agg.drop(columns=["instancia"], errors="ignore"), use_container_width=True)
+
+
+# =========================
+# Modo convergência: rastros (best a cada melhora) do experimento mais recente
+# =========================
+@st.cache_data(show_spinner=False)
+def carregar_rastros(path: str, mtime: float) -> pd.DataFrame:
+    """Pontos de convergência do .rastro.jsonl (mtime só invalida o cache)."""
+    df = ler_rastros(path)
+    df["gap"] = 100 * (df["valor"] / df["limite_inferior"] - 1)
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def carregar_trajetorias_alpha(path: str, mtime: float) -> pd.DataFrame:
+    """Trajetórias de α das execuções adaptativas do .rastro.jsonl (mtime só invalida o cache)."""
+    return ler_trajetorias_alpha(path)
+
+
+CHAVE_EXECUCAO = ["heuristica", "n", "m", "replicacao", "parametro", "instancia"]
+
+
+def curvas_anytime(df: pd.DataFrame, eixo: str, grupo: str, pontos: int = 60, coluna: str = "gap") -> pd.DataFrame:
+    """
+    Média de `coluna` (padrão: gap do best-so-far) por `grupo` numa grade
+    (log) do `eixo`: cada execução vale o último ponto <= x (o best não
+    muda entre melhoras e fica no valor final depois da última; o mesmo
+    vale para o alpha adaptativo entre ajustes).
+    """
+    positivos = df.loc[df[eixo] > 0, eixo]
+    if positivos.empty:
+        return pd.DataFrame(columns=[grupo, eixo, f"{coluna}_medio"])
+    grade = np.geomspace(positivos.min(), positivos.max(), pontos)
+
+    partes = []
+    for g, dg in df.groupby(grupo):
+        gaps = []
+        for _, run in dg.groupby(CHAVE_EXECUCAO):
+            run = run.sort_values(eixo)
+            i = np.searchsorted(run[eixo].to_numpy(), grade, side="right") - 1
+            gaps.append(run[coluna].to_numpy()[np.maximum(i, 0)])
+        partes.append(pd.DataFrame({grupo: g, eixo: grade, f"{coluna}_medio": np.mean(gaps, axis=0)}))
+    return pd.concat(partes, ignore_index=True)
+
+
+def tempos_ate_alvo(df: pd.DataFrame, eixo: str, grupo: str, alvo: float) -> pd.DataFrame:
+    """
+    Distribuição empírica do `eixo` até o gap <= alvo (time-to-target), por
+    `grupo`. Execuções que não chegam ao alvo contam no total, então a
+    curva termina na fração que chegou.
+    """
+    partes = []
+    for g, dg in df.groupby(grupo):
+        execucoes = dg.groupby(CHAVE_EXECUCAO)
+        total = execucoes.ngroups
+        chegou = dg[dg["gap"] <= alvo].groupby(CHAVE_EXECUCAO)[eixo].min().sort_values().to_numpy()
+        if len(chegou):
+            partes.append(pd.DataFrame({
+                grupo: g, eixo: chegou, "fracao": np.arange(1, len(chegou) + 1) / total,
+            }))
+    if not partes:
+        return pd.DataFrame(columns=[grupo, eixo, "fracao"])
+    return pd.concat(partes, ignore_index=True)
+
+
+def mostrar_convergencia(nome: str, pasta: str, prefixo: str, por_alpha: bool) -> None:
+    """Curvas anytime e time-to-target por α (BLNM) ou instância (BLM)."""
+    st.divider()
+    st.header(f"{nome} - Convergência")
+
+    path = encontrar_resultados(pasta, prefixo)
+    rastros = caminho_rastros(path) if path else None
+    if not rastros or not os.path.exists(rastros):
+        st.info("O experimento mais recente não tem rastro de convergência (rode o script com rastrear = True).")
+        return
+    st.write("Arquivo:", info_arquivo(rastros))
+
+    df = carregar_rastros(rastros, os.path.getmtime(rastros))
+    if df.empty:
+        st.info("Rastro de convergência vazio.")
+        return
+
+    f1, f2, f3 = st.columns(3)
+    with f1:
+        m_opts = sorted(df["m"].unique().tolist())
+        m_sel = st.multiselect(f"Filtrar m ({nome})", m_opts, default=m_opts, key=f"conv_m_{nome}")
+    with f2:
+        n_opts = sorted(df["n"].unique().tolist())
+        n_sel = st.multiselect(f"Filtrar n ({nome})", n_opts, default=n_opts, key=f"conv_n_{nome}")
+    with f3:
+        eixo = st.radio("Eixo x", ["tempo", "iteracao"], horizontal=True, key=f"conv_eixo_{nome}",
+                        format_func=lambda e: "tempo (s)" if e == "tempo" else "iterações")
+
+    df = df[df["m"].isin(m_sel) & df["n"].isin(n_sel)]
+    if por_alpha:
+        # α fixo com 1 casa; execuções com alpha adaptativo pelo rótulo da variante
+        grupo = "alpha"
+        df = df.assign(alpha=df["parametro_num"].map("{:.1f}".format).where(df["parametro_num"].notna(),
+                                                                            df["heuristica"]))
+        a_opts = sorted(df[grupo].unique().tolist())
+        a_sel = st.multiselect(f"Filtrar α ({nome})", a_opts, default=a_opts, key=f"conv_a_{nome}")
+        df = df[df[grupo].isin(a_sel)]
+    else:
+        grupo = "instancia_mn"
+        df = df.assign(instancia_mn="m=" + df["m"].astype(str) + ", n=" + df["n"].astype(str))
+    if df.empty:
+        st.info("Nenhuma execução com esses filtros.")
+        return
+
+    finais = df.sort_values("iteracao").groupby(CHAVE_EXECUCAO)["gap"].last()
+    c1, c2 = st.columns(2)
+
+    with c1:
+        st.subheader("Anytime: gap médio do best-so-far (%)")
+        curvas = curvas_anytime(df, eixo, grupo)
+        fig = px.line(curvas, x=eixo, y="gap_medio", color=grupo, log_x=True, line_shape="hv")
+        st.plotly_chart(fig, use_container_width=True)
+
+    with c2:
+        st.subheader("Time-to-target: fração das execuções que atingiram o alvo")
+        alvo = st.slider(
+            "Alvo (gap % sobre o limite inferior)",
+            0.0, float(max(1.0, round(finais.max() * 2, 1))), float(round(finais.median(), 1)),
+            step=0.1, key=f"conv_alvo_{nome}",
+        )
+        ttt = tempos_ate_alvo(df, eixo, grupo, alvo)
+        fig = px.line(ttt, x=eixo, y="fracao", color=grupo, log_x=True, line_shape="hv", markers=True)
+        fig.update_yaxes(range=[0, 1.02])
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.caption(
+        f"{finais.size} execuções; gap final médio {finais.mean():.2f}% "
+        "(gap = best / limite inferior - 1, com LB = max(maior tarefa, teto(soma / m)))."
+    )
+
+    if por_alpha:
+        trajetorias = carregar_trajetorias_alpha(rastros, os.path.getmtime(rastros))
+        trajetorias = trajetorias[trajetorias["m"].isin(m_sel) & trajetorias["n"].isin(n_sel)]
+        if not trajetorias.empty:
+            st.subheader("α adaptativo: α médio ao longo da busca")
+            curvas = curvas_anytime(trajetorias, "iteracao", "heuristica", coluna="alpha")
+            fig = px.line(curvas, x="iteracao", y="alpha_medio", color="heuristica", log_x=True, line_shape="hv")
+            fig.update_yaxes(range=[0, 1])
+            st.plotly_chart(fig, use_container_width=True)
+
+
+modo = st.radio("Modo", ["Mais recente", "Histórico", "Convergência"], horizontal=True)
+if modo == "Histórico":
+    mostrar_historico("BLNM", BLNM_DIR, "resultados_blnm", por_alpha=True)
+    mostrar_historico("BLM", BLM_DIR, "resultados_blm", por_alpha=False)
+    st.stop()
+if modo == "Convergência":
+    mostrar_convergencia("BLNM", BLNM_DIR, "resultados_blnm", por_alpha=True)
+    mostrar_convergencia("BLM", BLM_DIR, "resultados_blm", por_alpha=False)
+    st.stop()
+
+
 # =========================
 # Carrega arquivos mais recentes
 # =========================
-blnm_path = encontrar_mais_recente(BLNM_DIR, "resultados_blnm_*.xlsx")
-blm_path  = encontrar_mais_recente(BLM_DIR,  "resultados_blm_*.xlsx")
+blnm_path = encontrar_resultados(BLNM_DIR, "resultados_blnm")
+blm_path  = encontrar_resultados(BLM_DIR,  "resultados_blm")
 
 
 colA, colB = st.columns(2)
@@ -149,22 +521,27 @@ with colA:
     if blnm_path:
         st.write("Arquivo:", info_arquivo(blnm_path))
     else:
-        st.warning(f"Não encontrei XLSX em: {BLNM_DIR}")
+        st.warning(f"Não encontrei resultados em: {BLNM_DIR}")
 
 with colB:
     st.subheader("BLM (Melhor Melhora)")
     if blm_path:
         st.write("Arquivo:", info_arquivo(blm_path))
     else:
-        st.warning(f"Não encontrei XLSX em: {BLM_DIR}")
+        st.warning(f"Não encontrei resultados em: {BLM_DIR}")
 
 
 # =========================
 # BLNM
 # =========================
+# Filtros, KPIs e tabelas saem do cubo pré-agregado (uma célula por
+# m × n × α); as linhas brutas só são lidas para distribuições/tabela bruta.
 if blnm_path:
-    df_blnm = ler_resultados_xlsx(blnm_path).copy()
-    resumo_blnm = ler_resumo_xlsx(blnm_path)
+    cubo_blnm, resumo_blnm = carregar_cubo(blnm_path)
+    corrida_blnm = ler_corrida(blnm_path)
+    # execuções com alpha adaptativo têm seção própria
+    adaptativo_blnm = cubo_blnm[cubo_blnm["parametro_texto"] == "adaptativo"]
+    cubo_blnm = cubo_blnm.drop(adaptativo_blnm.index)
 
     # Filtros
     st.divider()
@@ -172,64 +549,46 @@ if blnm_path:
 
     f1, f2, f3 = st.columns(3)
     with f1:
-        m_opts = sorted(df_blnm["m"].dropna().unique().tolist())
+        m_opts = sorted(cubo_blnm["m"].dropna().unique().tolist())
         m_sel = st.multiselect("Filtrar m", m_opts, default=m_opts)
     with f2:
-        n_opts = sorted(df_blnm["n"].dropna().unique().tolist())
+        n_opts = sorted(cubo_blnm["n"].dropna().unique().tolist())
         n_sel = st.multiselect("Filtrar n", n_opts, default=n_opts)
     with f3:
-        a_opts = sorted(df_blnm["parametro_num"].dropna().unique().tolist())
+        a_opts = sorted(cubo_blnm["parametro"].dropna().unique().tolist())
         a_sel = st.multiselect("Filtrar α", a_opts, default=a_opts)
 
-    df_blnm_f = df_blnm[
-        df_blnm["m"].isin(m_sel) &
-        df_blnm["n"].isin(n_sel) &
-        df_blnm["parametro_num"].isin(a_sel)
-    ].copy()
+    cubo_blnm_f = cubo_blnm[
+        cubo_blnm["m"].isin(m_sel) &
+        cubo_blnm["n"].isin(n_sel) &
+        cubo_blnm["parametro"].isin(a_sel)
+    ]
+    total = agregar_cubo(cubo_blnm_f, [])
+    execucoes = int(total["registros"].iloc[0]) if len(total) else 0
 
     # KPIs
     k1, k2, k3, k4, k5 = st.columns(5)
-    k1.metric("Execuções (filtradas)", f"{len(df_blnm_f)}")
+    k1.metric("Execuções (filtradas)", f"{execucoes}")
 
-    if len(df_blnm_f) > 0:
-        k2.metric("Melhor valor (min)", int(df_blnm_f["valor"].min()))
+    # Agregações
+    agg_alpha = medias_cubo(cubo_blnm_f, ["parametro"]).rename(columns={"parametro": "parametro_num"})
+
+    if execucoes > 0:
+        k2.metric("Melhor valor (min)", int(total["valor_min"].iloc[0]))
 
-        tempo_medio = float(df_blnm_f["tempo"].mean())
+        tempo_medio = float(total["tempo_media"].iloc[0])
         k3.metric("Tempo médio", f"{fmt_min_seg(tempo_medio)} ({tempo_medio:.3f}s)")
 
-        best_alpha = (
-            df_blnm_f.groupby("parametro_num")["valor"]
-            .mean()
-            .sort_values()
-            .index[0]
-        )
-        # renomeado para ficar incontestável
-        k4.metric("Melhor α (menor makespan médio)", f"{best_alpha:.1f}")
-
-        # Tempo total do experimento (aba resumo)
-        tempo_total_str = resumo_blnm.get("tempo_total_str")
-        tempo_total_s = resumo_blnm.get("tempo_total_s")
-        if tempo_total_str:
-            if tempo_total_s is not None:
-                k5.metric("Tempo total (experimento)", f"{tempo_total_str} ({tempo_total_s:.2f}s)")
-            else:
-                k5.metric("Tempo total (experimento)", f"{tempo_total_str}")
-        elif tempo_total_s is not None:
-            k5.metric("Tempo total (experimento)", f"{fmt_min_seg(tempo_total_s)} ({tempo_total_s:.2f}s)")
+        if corrida_blnm:
+            # médias desbalanceadas entre α: vale o vencedor da corrida
+            k4.metric("Melhor α (vencedor da corrida)", f"{corrida_blnm['vencedores'][0]:.1f}")
         else:
-            k5.metric("Tempo total (experimento)", "—")
+            best_alpha = agg_alpha.sort_values("valor_medio")["parametro_num"].iloc[0]
+            # renomeado para ficar incontestável
+            k4.metric("Melhor α (menor makespan médio)", f"{best_alpha:.1f}")
 
-    # Agregações
-    agg_alpha = (
-        df_blnm_f.groupby("parametro_num", as_index=False)
-        .agg(
-            valor_medio=("valor", "mean"),
-            tempo_medio=("tempo", "mean"),
-            iter_medias=("iteracoes", "mean"),
-            execucoes=("valor", "count"),
-        )
-        .sort_values("parametro_num")
-    )
+        # Tempo total do experimento (resumo)
+        metrica_tempo_total(k5, resumo_blnm)
 
     c1, c2 = st.columns(2)
 
@@ -253,85 +612,85 @@ if blnm_path:
         )
         st.plotly_chart(fig, use_container_width=True)
 
-    c3, c4 = st.columns(2)
+    st.subheader("Tabela agregada por α")
+    st.dataframe(agg_alpha, use_container_width=True)
 
-    with c3:
-        st.subheader("Distribuição de valores (filtrado)")
-        fig = px.histogram(df_blnm_f, x="valor")
-        st.plotly_chart(fig, use_container_width=True)
+    if corrida_blnm:
+        mostrar_corrida(corrida_blnm)
 
-    with c4:
-        st.subheader("Distribuição de tempos (filtrado)")
-        fig = px.histogram(df_blnm_f, x="tempo")
-        st.plotly_chart(fig, use_container_width=True)
+    if not adaptativo_blnm.empty and not cubo_blnm_f.empty:
+        mostrar_adaptativo(cubo_blnm_f, adaptativo_blnm[adaptativo_blnm["m"].isin(m_sel) &
+                                                        adaptativo_blnm["n"].isin(n_sel)])
 
-    st.subheader("Tabela agregada por α")
-    st.dataframe(agg_alpha, use_container_width=True)
+    mostrar_instrumentacao(cubo_blnm_f, ["parametro"], "parametro", "α")
+    mostrar_paradas(cubo_blnm_f, ["parametro"], "parametro", "α")
+
+    if st.checkbox("Mostrar distribuições e dados brutos (lê todas as linhas)", key="brutos_blnm"):
+        df_blnm, _ = carregar_resultados(blnm_path)
+        df_blnm_f = df_blnm[
+            df_blnm["m"].isin(m_sel) &
+            df_blnm["n"].isin(n_sel) &
+            df_blnm["parametro_num"].isin(a_sel)
+        ]
+
+        c3, c4 = st.columns(2)
 
-    with st.expander("Ver dados brutos (resultados)"):
-        st.dataframe(df_blnm_f, use_container_width=True)
+        with c3:
+            st.subheader("Distribuição de valores (filtrado)")
+            fig = px.histogram(df_blnm_f, x="valor")
+            st.plotly_chart(fig, use_container_width=True)
+
+        with c4:
+            st.subheader("Distribuição de tempos (filtrado)")
+            fig = px.histogram(df_blnm_f, x="tempo")
+            st.plotly_chart(fig, use_container_width=True)
+
+        with st.expander("Ver dados brutos (resultados)"):
+            st.dataframe(df_blnm_f, use_container_width=True)
 
 
 # =========================
 # BLM
 # =========================
 if blm_path:
-    df_blm = ler_resultados_xlsx(blm_path).copy()
-    resumo_blm = ler_resumo_xlsx(blm_path)
+    cubo_blm, resumo_blm = carregar_cubo(blm_path)
 
     st.divider()
     st.header("BLM - Análises")
 
     f1, f2 = st.columns(2)
     with f1:
-        m_opts = sorted(df_blm["m"].dropna().unique().tolist())
+        m_opts = sorted(cubo_blm["m"].dropna().unique().tolist())
         m_sel = st.multiselect("Filtrar m (BLM)", m_opts, default=m_opts)
     with f2:
-        n_opts = sorted(df_blm["n"].dropna().unique().tolist())
+        n_opts = sorted(cubo_blm["n"].dropna().unique().tolist())
         n_sel = st.multiselect("Filtrar n (BLM)", n_opts, default=n_opts)
 
-    df_blm_f = df_blm[
-        df_blm["m"].isin(m_sel) &
-        df_blm["n"].isin(n_sel)
-    ].copy()
+    cubo_blm_f = cubo_blm[
+        cubo_blm["m"].isin(m_sel) &
+        cubo_blm["n"].isin(n_sel)
+    ]
+    total = agregar_cubo(cubo_blm_f, [])
+    execucoes = int(total["registros"].iloc[0]) if len(total) else 0
 
     # KPIs
     k1, k2, k3, k4, k5 = st.columns(5)
-    k1.metric("Execuções (filtradas)", f"{len(df_blm_f)}")
+    k1.metric("Execuções (filtradas)", f"{execucoes}")
 
-    if len(df_blm_f) > 0:
-        k2.metric("Melhor valor (min)", int(df_blm_f["valor"].min()))
+    if execucoes > 0:
+        k2.metric("Melhor valor (min)", int(total["valor_min"].iloc[0]))
 
-        tempo_medio = float(df_blm_f["tempo"].mean())
+        tempo_medio = float(total["tempo_media"].iloc[0])
         k3.metric("Tempo médio", f"{fmt_min_seg(tempo_medio)} ({tempo_medio:.3f}s)")
 
-        k4.metric("Iterações médias", f"{df_blm_f['iteracoes'].mean():.1f}")
+        k4.metric("Iterações médias", f"{total['iteracoes_media'].iloc[0]:.1f}")
 
-        # Tempo total do experimento (aba resumo)
-        tempo_total_str = resumo_blm.get("tempo_total_str")
-        tempo_total_s = resumo_blm.get("tempo_total_s")
-        if tempo_total_str:
-            if tempo_total_s is not None:
-                k5.metric("Tempo total (experimento)", f"{tempo_total_str} ({tempo_total_s:.2f}s)")
-            else:
-                k5.metric("Tempo total (experimento)", f"{tempo_total_str}")
-        elif tempo_total_s is not None:
-            k5.metric("Tempo total (experimento)", f"{fmt_min_seg(tempo_total_s)} ({tempo_total_s:.2f}s)")
-        else:
-            k5.metric("Tempo total (experimento)", "—")
+        # Tempo total do experimento (resumo)
+        metrica_tempo_total(k5, resumo_blm)
 
     # Agregação por instância (m,n)
-    agg_inst = (
-        df_blm_f.groupby(["m", "n"], as_index=False)
-        .agg(
-            valor_medio=("valor", "mean"),
-            tempo_medio=("tempo", "mean"),
-            iter_medias=("iteracoes", "mean"),
-            execucoes=("valor", "count"),
-        )
-        .sort_values(["m", "n"])
-    )
-    agg_inst["instancia"] = agg_inst.apply(lambda r: f"m={int(r['m'])}, n={int(r['n'])}", axis=1)
+    agg_inst = medias_cubo(cubo_blm_f, ["m", "n"])
+    agg_inst["instancia"] = "m=" + agg_inst["m"].astype(str) + ", n=" + agg_inst["n"].astype(str)
 
     c1, c2 = st.columns(2)
 
@@ -348,7 +707,15 @@ if blm_path:
     st.subheader("Tabela agregada por instância (m,n)")
     st.dataframe(agg_inst.drop(columns=["instancia"]), use_container_width=True)
 
-    with st.expander("Ver dados brutos (resultados)"):
+    mostrar_instrumentacao(cubo_blm_f, ["m", "n"], "instancia", "instância (m,n)")
+    mostrar_paradas(cubo_blm_f, ["m", "n"], "instancia", "instância (m,n)")
+
+    if st.checkbox("Mostrar dados brutos (lê todas as linhas)", key="brutos_blm"):
+        df_blm, _ = carregar_resultados(blm_path)
+        df_blm_f = df_blm[
+            df_blm["m"].isin(m_sel) &
+            df_blm["n"].isin(n_sel)
+        ]
         st.dataframe(df_blm_f, use_container_width=True)
 
 
@@ -357,6 +724,6 @@ if blm_path:
 # =========================
 st.divider()
 st.caption(
-    "Dica: rode primeiro os scripts BLNM/BLM para gerar novos XLSX em 'Resultados'. "
+    "Dica: rode primeiro os scripts BLNM/BLM para gerar novos resultados em 'Resultados'. "
     "Depois, clique em 'Atualizar dados' para carregar o arquivo mais recente."
 )
\ No newline at end of file
@@ -0,0 +1,38 @@
+import argparse
+
+from busca_local.instancias import (
+    CAMINHO_SUITE_PADRAO,
+    DISTRIBUICAO_PADRAO,
+    SEMENTE_SUITE_PADRAO,
+    especificacoes_grade,
+    gerar_suite,
+)
+
+# ============================================================
+# Gera uma suíte de instâncias para BLM/BLNM (ver busca_local/instancias.py)
+#
+# Uso (na raiz do projeto):
+#   python gerar_instancias.py Instancias/outra.bin --maquinas 10 20 50 --semente 7
+# ============================================================
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma suíte de instâncias (n, m, tempos)")
+    parser.add_argument("caminho", nargs="?", default=CAMINHO_SUITE_PADRAO)
+    parser.add_argument("--maquinas", type=int, nargs="+", default=[10, 20, 50])
+    parser.add_argument("--rs", type=float, nargs="+", default=[1.5, 2.0])
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--semente", type=int, default=SEMENTE_SUITE_PADRAO)
+    parser.add_argument("--min", type=int, default=DISTRIBUICAO_PADRAO["min"])
+    parser.add_argument("--max", type=int, default=DISTRIBUICAO_PADRAO["max"])
+    args = parser.parse_args()
+
+    especificacoes = especificacoes_grade(args.maquinas, args.rs, args.repeticoes)
+    distribuicao = {"tipo": "uniforme", "min": args.min, "max": args.max}
+    ids = gerar_suite(args.caminho, especificacoes, args.semente, distribuicao)
+
+    print(f"Gerado: {args.caminho} ({len(ids)} instâncias)")
+
+
+if __name__ == "__main__":
+    main()
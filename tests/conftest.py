@@ -0,0 +1,8 @@
+import pytest
+
+from .estados import CASOS, estado_do_caso
+
+
+@pytest.fixture(params=CASOS, ids=str)
+def estado(request):
+    return estado_do_caso(request.param)
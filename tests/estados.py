@@ -0,0 +1,56 @@
+import random
+
+# ============================================================
+# Estados (sol, cargas, tempos, m) para comparar os avaliadores com a
+# varredura completa (avaliar_melhor_melhora), que é a referência:
+# casos de borda escritos à mão e estados sorteados com tempos em
+# faixas pequenas (muitos empates de carga e de makespan vizinho),
+# inclusive tarefas de duração zero.
+# ============================================================
+
+CASOS_LIMITE = {
+    "uma_maquina": ([0, 0, 0], [4, 2, 7], 1),
+    "menos_tarefas_que_maquinas": ([0, 2], [5, 3], 4),
+    "duracao_zero": ([0, 0, 1, 2], [0, 6, 0, 2], 3),
+    "critica_sem_tarefas": ([1, 1, 2], [0, 0, 0], 3),
+    "duas_criticas": ([0, 1, 2], [5, 5, 1], 3),
+    "empate_no_top3": ([0, 0, 1, 2, 3], [4, 3, 5, 5, 5], 4),
+    "empate_entre_vizinhos": ([0, 0, 0, 1], [2, 2, 2, 1], 3),
+}
+
+SEMENTES = range(40)
+
+CASOS = [*CASOS_LIMITE, *SEMENTES]
+
+
+def estado_de(sol, tempos, m):
+    """(sol, cargas, tempos, m) com as cargas calculadas (listas novas a cada chamada)."""
+    cargas = [0] * m
+    for tarefa, maq in enumerate(sol):
+        cargas[maq] += tempos[tarefa]
+    return list(sol), cargas, list(tempos), m
+
+
+def estado_aleatorio(semente):
+    rng = random.Random(semente)
+    n = rng.randint(1, 14)
+    m = rng.randint(1, 6)
+    pmax = rng.choice((1, 2, 3, 10, 100))
+    tempos = [rng.randint(0, pmax) for _ in range(n)]
+    return estado_de([rng.randrange(m) for _ in range(n)], tempos, m)
+
+
+def estado_do_caso(caso):
+    """Caso de borda (pelo nome) ou estado sorteado (pela semente)."""
+    if isinstance(caso, str):
+        return estado_de(*CASOS_LIMITE[caso])
+    return estado_aleatorio(caso)
+
+
+def makespan_apos(cargas, tempos, tarefa, origem, destino, parceira=None):
+    """Makespan depois do movimento (ou da troca com a parceira), recalculado do zero."""
+    delta = tempos[tarefa] - (0 if parceira is None else tempos[parceira])
+    novas = list(cargas)
+    novas[origem] -= delta
+    novas[destino] += delta
+    return max(novas)
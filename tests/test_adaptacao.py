@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from busca_local.adaptacao import AlphaBandit, AlphaEstagnacao, alpha_de_params
+from busca_local.blnm import blnm_monotona_randomizada
+
+
+def test_estagnacao_sobe_sem_melhora_e_volta_com_melhora():
+    ctrl = AlphaEstagnacao(alpha_min=0.1, alpha_max=0.9, passo=0.3, janela=10)
+    assert ctrl.iniciar(50) == 0.1
+    # épocas sem melhora: +passo até alpha_max
+    assert [ctrl.ajustar(10 * e, 50) for e in range(1, 5)] == [0.4, 0.7, 0.9, 0.9]
+    # uma época com melhora volta ao mínimo
+    assert ctrl.ajustar(50, 49) == 0.1
+    assert ctrl.ajustar(60, 49) == 0.4
+    # a trajetória só guarda as mudanças (alpha_max repetido fica de fora)
+    assert list(ctrl.iteracao) == [0, 10, 20, 30, 50, 60]
+    assert list(ctrl.alpha) == [0.1, 0.4, 0.7, 0.9, 0.1, 0.4]
+
+
+def test_estagnacao_passo_sem_erro_de_arredondamento():
+    ctrl = AlphaEstagnacao(passo=0.03)
+    ctrl.iniciar(50)
+    alphas = [ctrl.ajustar(e, 50) for e in range(1, 30)]
+    assert alphas[:3] == [0.13, 0.16, 0.19] and alphas[-1] == 0.9
+
+
+def test_bandit_joga_braco_novo_primeiro():
+    # mesmo com o primeiro braço premiado, os não jogados vêm antes, na ordem
+    ctrl = AlphaBandit(bracos=(0.1, 0.5, 0.9))
+    assert ctrl.iniciar(100) == 0.1
+    assert ctrl.ajustar(100, 90) == 0.5
+    assert ctrl.ajustar(200, 90) == 0.9
+
+
+def test_bandit_favorece_o_braco_premiado():
+    ctrl = AlphaBandit(bracos=(0.1, 0.5, 0.9))
+    best = 100
+    alpha = ctrl.iniciar(best)
+    escolhas = []
+    for epoca in range(1, 41):
+        if alpha == 0.5:  # só esse braço melhora o best
+            best -= 1
+        alpha = ctrl.ajustar(100 * epoca, best)
+        escolhas.append(alpha)
+
+    # depois de jogar os três, UCB fica no premiado; o desconto só faz reexplorar de vez em quando
+    assert escolhas[:2] == [0.5, 0.9] and set(escolhas[2:12]) == {0.5}
+    assert escolhas.count(0.5) >= 0.8 * len(escolhas)
+
+
+def test_alpha_de_params():
+    assert alpha_de_params({"alpha": 0.3}) is None
+    ctrl = alpha_de_params({"alpha_adaptativo": "bandit", "janela_alpha": 25})
+    assert isinstance(ctrl, AlphaBandit) and ctrl.janela == 25
+    assert isinstance(alpha_de_params({"alpha_adaptativo": "estagnacao"}), AlphaEstagnacao)
+    with pytest.raises(ValueError, match="alpha adaptativo desconhecido"):
+        alpha_de_params({"alpha_adaptativo": "gradiente"})
+
+
+def test_blnm_ajusta_alpha_a_cada_janela():
+    tempos = [(7 * i) % 23 + 1 for i in range(30)]
+    ctrl = AlphaEstagnacao(janela=10)
+    it = blnm_monotona_randomizada(tempos, 4, 0.5, 200, rng=random.Random(0), adaptacao=ctrl)[1]
+    assert ctrl.iteracao[0] == 0 and all(i % 10 == 0 and i <= it for i in ctrl.iteracao)
+    assert all(0.1 <= a <= 0.9 for a in ctrl.alpha)
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from busca_local.blm import blm_melhor_melhora
+from busca_local.cargas import limite_inferior
+from busca_local.instrumentacao import Contadores
+from busca_local.parada import CriterioParada
+
+from .estados import SEMENTES, estado_aleatorio
+
+TEMPOS = [random.Random(5).randint(1, 30) for _ in range(25)]
+
+
+def rodar(tempos, m, curto_circuito, semente, max_sem_melhora=20, **criterio):
+    parada, contadores = CriterioParada(**criterio), Contadores()
+    best, it, _, efetivas = blm_melhor_melhora(tempos, m, max_sem_melhora, curto_circuito=curto_circuito,
+                                               rng=random.Random(semente), contadores=contadores, parada=parada)
+    return best, it, efetivas, parada.motivo, contadores.iteracao_melhor
+
+
+@pytest.mark.parametrize("semente", SEMENTES)
+@pytest.mark.parametrize("criterio", ["nenhum", "limite_inferior", "alvo"])
+def test_curto_circuito_mesma_contagem_nominal(semente, criterio):
+    # sem atalho, a busca refaz a mesma varredura até max_sem_melhora (ou até o critério)
+    _, _, tempos, m = estado_aleatorio(semente)
+    extras = {"limite_inferior": {"limite_inferior": limite_inferior(tempos, m)},
+              "alvo": {"alvo": max(tempos, default=0) + sum(tempos) // (2 * m)}}.get(criterio, {})
+    best, it, efetivas, motivo, it_melhor = rodar(tempos, m, True, semente, **extras)
+    assert rodar(tempos, m, False, semente, **extras) == (best, it, it, motivo, it_melhor)
+    # com atalho: até a varredura que certificou o ótimo local (ou até o critério)
+    assert efetivas == (it_melhor + 1 if motivo == "sem_melhora" else it_melhor)
+
+
+@pytest.mark.parametrize("orcamento", [{"tempo": 0.05}, {"tempo_cpu": 0.05}])
+def test_curto_circuito_com_orcamento_de_tempo(orcamento):
+    # as varreduras repetidas gastam o orçamento: a contagem não é extrapolada até max_sem_melhora
+    for curto_circuito in (True, False):
+        best, it, efetivas, motivo, _ = rodar(TEMPOS, 4, curto_circuito, 1, 10 ** 9, **orcamento)
+        assert motivo == next(iter(orcamento)) and it == efetivas < 10 ** 9
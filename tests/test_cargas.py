@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from busca_local.blm import blm_melhor_melhora
+from busca_local.blnm import blnm_monotona_randomizada
+from busca_local.cargas import (
+    IndiceCargas,
+    TarefasPorMaquina,
+    TarefasPorMaquinaCompacta,
+    aplicar_movimento,
+    compactar_tempos,
+    solucao_de,
+)
+from busca_local.vizinhanca import avaliar_vizinhanca_critica, avaliar_vizinhanca_critica_compacta
+
+
+def pares(compacta):
+    """Listas da TarefasPorMaquinaCompacta decodificadas em pares (tempo, tarefa)."""
+    base = compacta.base
+    return [[divmod(chave, base) for chave in lista] for lista in compacta.listas]
+
+
+def test_compacta_igual_a_listas_apos_movimentos(estado):
+    sol, _, tempos, m = estado
+    listas = TarefasPorMaquina(sol, tempos, m)
+    compacta = TarefasPorMaquinaCompacta(sol, compactar_tempos(tempos), m)
+    assert pares(compacta) == listas.listas
+
+    rng = random.Random(len(sol) * m)
+    for _ in range(20):
+        tarefa = rng.randrange(len(sol))
+        origem, destino = sol[tarefa], rng.randrange(m)
+        if destino == origem:
+            continue
+        listas.mover(tarefa, tempos[tarefa], origem, destino)
+        compacta.mover(tarefa, tempos[tarefa], origem, destino)
+        sol[tarefa] = destino
+        assert pares(compacta) == listas.listas
+
+
+def test_descida_compacta_igual_a_listas(estado):
+    # mesma busca binária e mesmo desempate: o mesmo movimento a cada passo, não só o mesmo makespan
+    sol, _, tempos, m = estado
+    lados = []
+    for armazenamento, classe in (("listas", TarefasPorMaquina), ("arrays", TarefasPorMaquinaCompacta)):
+        tempos_e = compactar_tempos(tempos) if armazenamento == "arrays" else tempos
+        sol_e, cargas_e = solucao_de(sol, tempos_e, m, armazenamento)
+        lados.append((sol_e, cargas_e, tempos_e, IndiceCargas(cargas_e), classe(sol_e, tempos_e, m)))
+    (sol_l, cargas_l, tempos_l, indice_l, tm_l), (sol_a, cargas_a, tempos_a, indice_a, tm_a) = lados
+
+    while True:
+        mov = avaliar_vizinhanca_critica(sol_l, cargas_l, tempos_l, m, indice_l, tm_l)
+        assert avaliar_vizinhanca_critica_compacta(sol_a, cargas_a, tempos_a, m, indice_a, tm_a) == mov
+        if mov[0] is None:
+            break
+        aplicar_movimento(sol_l, cargas_l, tempos_l, *mov[:3], indice_l, tm_l)
+        aplicar_movimento(sol_a, cargas_a, tempos_a, *mov[:3], indice_a, tm_a)
+        assert list(sol_a) == sol_l and list(cargas_a) == cargas_l
+
+
+def test_compacta_com_tempos_na_base():
+    # chave = p * n + tarefa: a maior tarefa (n - 1) não pode invadir a faixa do próximo tempo
+    sol, tempos = [0, 0, 0, 1], [2, 1, 2, 1]
+    compacta = TarefasPorMaquinaCompacta(sol, compactar_tempos(tempos), 2)
+    assert pares(compacta) == [[(1, 1), (2, 0), (2, 2)], [(1, 3)]]
+
+
+@pytest.mark.parametrize("semente", range(5))
+@pytest.mark.parametrize("avaliador", ["python", "critica"])
+def test_execucao_arrays_igual_a_listas(semente, avaliador):
+    rng = random.Random(semente)
+    m = rng.randint(2, 8)
+    tempos = [rng.randint(1, rng.choice((3, 100))) for _ in range(rng.randint(m, 40))]
+
+    def rodar(armazenamento):
+        blm = blm_melhor_melhora(tempos, m, 50, avaliador, rng=random.Random(semente), armazenamento=armazenamento)
+        blnm = blnm_monotona_randomizada(tempos, m, 0.3, 50, avaliador, rng=random.Random(semente),
+                                         armazenamento=armazenamento)
+        return blm[:2], blnm[:2]
+
+    assert rodar("arrays") == rodar("listas")
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from busca_local.construcao import atribuicao_grasp, atribuicao_lista, atribuicao_lpt, construir_atribuicao
+
+
+def lista_ingenua(tempos, m, ordem):
+    """Referência O(n m): cada tarefa na máquina de menor carga, empate na de menor índice."""
+    sol, cargas = [0] * len(tempos), [0] * m
+    for tarefa in ordem:
+        maq = min(range(m), key=lambda i: (cargas[i], i))
+        sol[tarefa] = maq
+        cargas[maq] += tempos[tarefa]
+    return sol
+
+
+def cargas_de(sol, tempos, m):
+    cargas = [0] * m
+    for tarefa, maq in enumerate(sol):
+        cargas[maq] += tempos[tarefa]
+    return cargas
+
+
+def test_lista_igual_a_referencia(estado):
+    _, _, tempos, m = estado
+    assert atribuicao_lista(tempos, m) == lista_ingenua(tempos, m, range(len(tempos)))
+    assert construir_atribuicao("lista", tempos, m) == atribuicao_lista(tempos, m)
+
+
+def test_lpt_igual_a_referencia(estado):
+    _, _, tempos, m = estado
+    # decrescente por tempo, empates na ordem original
+    ordem = sorted(range(len(tempos)), key=lambda t: (-tempos[t], t))
+    assert atribuicao_lpt(tempos, m) == lista_ingenua(tempos, m, ordem)
+    assert construir_atribuicao("lpt", tempos, m) == atribuicao_lpt(tempos, m)
+
+
+def test_grasp_rcl_zero_e_lpt(estado):
+    # rcl = 0: só máquinas de menor carga na RCL; o desempate aleatório troca
+    # máquinas de mesma carga, então as cargas (ordenadas) são as do LPT
+    _, _, tempos, m = estado
+    lpt = sorted(cargas_de(atribuicao_lpt(tempos, m), tempos, m))
+    for semente in range(5):
+        sol = atribuicao_grasp(tempos, m, 0, random.Random(semente))
+        assert sorted(cargas_de(sol, tempos, m)) == lpt
+
+
+def test_grasp_rcl_um_aceita_qualquer_maquina():
+    # a segunda tarefa vê cargas [5, 0, 0, 0] (a menos de rótulo): com rcl = 0
+    # só as vazias entram na RCL; com rcl = 1, também a que já tem a primeira
+    tempos, m = [5, 3], 4
+    for rcl, junta in ((0, False), (1, True)):
+        sols = [atribuicao_grasp(tempos, m, rcl, random.Random(semente)) for semente in range(100)]
+        assert any(sol[0] == sol[1] for sol in sols) == junta
+
+
+@pytest.mark.parametrize("rcl", [-0.1, 1.5])
+def test_grasp_rcl_invalido(rcl):
+    with pytest.raises(ValueError, match="rcl"):
+        construir_atribuicao("grasp", [3, 1, 2], 2, random.Random(0), rcl)
+
+
+def test_construcao_desconhecida():
+    with pytest.raises(ValueError, match="construção desconhecida"):
+        construir_atribuicao("gulosa", [3, 1, 2], 2)
@@ -0,0 +1,103 @@
+import math
+
+import pytest
+
+from busca_local.corrida import (
+    Corrida,
+    _gama_q,
+    p_qui2,
+    piores_que_o_melhor,
+    postos,
+    quantil_t,
+)
+from busca_local.corrida import teste_friedman as friedman  # sem o prefixo test, que o pytest coletaria
+
+# valores de tabela (qui-quadrado e t de Student, 6-7 algarismos)
+QUI2 = [
+    (3.841459, 1, 0.05), (2.705543, 1, 0.10), (6.634897, 1, 0.01), (5.991465, 2, 0.05),
+    (9.487729, 4, 0.05), (0.710723, 4, 0.95), (15.50731, 8, 0.05), (2.732637, 8, 0.95), (20.09024, 8, 0.01),
+]
+T = [(0.975, 4, 2.776445), (0.975, 8, 2.306004), (0.975, 10, 2.228139), (0.975, 20, 2.085963),
+     (0.995, 30, 2.749996), (0.95, 60, 1.670649)]
+
+
+@pytest.mark.parametrize("x, gl, p", QUI2)
+def test_p_qui2_tabela(x, gl, p):
+    assert p_qui2(x, gl) == pytest.approx(p, rel=1e-5)
+
+
+@pytest.mark.parametrize("x", [0.3, 1.0, 2.5, 10.0])
+def test_gama_q_formas_fechadas(x):
+    # Q(1, x) = e^-x e Q(1/2, x) = erfc(sqrt(x)), nos dois ramos (série e fração contínua)
+    assert _gama_q(1, x) == pytest.approx(math.exp(-x), rel=1e-12)
+    assert _gama_q(0.5, x) == pytest.approx(math.erfc(math.sqrt(x)), rel=1e-12)
+    assert _gama_q(3, 0) == 1.0
+
+
+@pytest.mark.parametrize("p, gl, t", T)
+def test_quantil_t_tabela(p, gl, t):
+    # erro < 0,01 para gl >= 4, bem menor a partir de gl = 8
+    assert quantil_t(p, gl) == pytest.approx(t, abs=0.01 if gl < 8 else 1e-3)
+
+
+def test_postos_com_empates():
+    assert postos([3, 1, 3, 2]) == [3.5, 1.0, 3.5, 2.0]
+
+
+def test_friedman_sem_empates():
+    # mesma ordem em 4 blocos: T = 12 / (b k (k + 1)) * soma R^2 - 3 b (k + 1) = 8, P(qui2_2 >= 8) = e^-4
+    t, p, somas, a = friedman([[1, 2, 3]] * 4)
+    assert (t, somas, a) == (8.0, [4.0, 8.0, 12.0], 56.0)
+    assert p == pytest.approx(math.exp(-4))
+
+
+def test_friedman_com_empates():
+    # a forma com A é a estatística corrigida por empates: 5,1667 / (1 - 6 / 72)
+    t, p, somas, a = friedman([[1, 1, 2], [1, 2, 3], [1, 2, 3]])
+    assert (somas, a) == ([3.5, 5.5, 9.0], 41.5)
+    assert t == pytest.approx((123.5 / 3 - 36) / (1 - 6 / 72))
+    assert p == pytest.approx(math.exp(-t / 2))
+
+
+def test_friedman_tudo_empatado():
+    assert friedman([[2, 2, 2]] * 3)[:2] == (0.0, 1.0)
+
+
+def test_conover():
+    # somas (6, 10, 14), A = 70, b = 5: diferença crítica t(0,975; 8) * sqrt(2 (5 * 70 - 332) / 8) = 4,89
+    blocos = [[1, 2, 3]] * 3 + [[2, 1, 3], [1, 3, 2]]
+    t, p, somas, a = friedman(blocos)
+    assert t == pytest.approx(6.4) and p == pytest.approx(math.exp(-3.2))
+    assert piores_que_o_melhor(somas, a, len(blocos)) == [2]
+    # com nível mais exigente a diferença crítica passa de 8: ninguém sai
+    assert piores_que_o_melhor(somas, a, len(blocos), nivel=0.001) == []
+
+
+def test_corrida_elimina_candidato_dominado():
+    # "c" é o pior em todo bloco; "a" e "b" se alternam
+    corrida = Corrida(["a", "b", "c"], "friedman")
+    for i in range(5):
+        corrida.adicionar_bloco({"a": 10 + i % 2, "b": 11 - i % 2, "c": 20})
+        eliminados = corrida.testar(i + 1)
+        assert eliminados == ([] if i < 4 else ["c"])
+
+    assert corrida.vivos == ["a", "b"]
+    assert corrida.rodadas[-1]["p"] == pytest.approx(math.exp(-3.8))
+    assert corrida.eliminacoes == [{"candidato": "c", "rodada": 5, "blocos": 5, "posto_medio": 3.0}]
+    # os blocos seguintes só precisam dos vivos
+    corrida.adicionar_bloco({"a": 1, "b": 2})
+    with pytest.raises(ValueError, match="sem valor"):
+        corrida.adicionar_bloco({"a": 1})
+
+
+def test_corrida_halving_fica_com_a_metade():
+    candidatos = [0.1 * i for i in range(1, 10)]
+    corrida = Corrida(candidatos, "halving", blocos_minimos=1)
+    corrida.adicionar_bloco({c: abs(c - 0.3) for c in candidatos})
+    corrida.testar(1)
+    assert len(corrida.vivos) == 5 and corrida.vencedores()[0] == candidatos[2]
+
+
+def test_metodo_desconhecido():
+    with pytest.raises(ValueError, match="método de corrida desconhecido"):
+        Corrida([1, 2], "torneio")
@@ -0,0 +1,47 @@
+import json
+
+from busca_local.experimentos import chave_job, chave_resultado, executar_job, filtrar_pendentes
+from busca_local.heuristicas import Instancia
+from busca_local.resultados import GravadorResultados, ler_resultados
+
+
+def grade():
+    """Jobs pequenos de BLM e BLNM (alpha fixo e adaptativo) em duas instâncias, duas replicações."""
+    jobs = []
+    for i, tempos in enumerate(([5, 3, 8, 2, 7, 4], [9, 1, 6, 6, 2, 3, 5])):
+        instancia = Instancia(tempos, 3, f"m3_n{len(tempos)}_r{i}")
+        for rep in range(2):
+            jobs.append(("blm_melhor_melhora", instancia, rep, {"max_sem_melhora": 5}, 10 * i + rep))
+            for params in ({"alpha": 0.1}, {"alpha": 0.2}, {"alpha": 0.2, "alpha_adaptativo": "bandit"}):
+                jobs.append(("blnm_monotona_randomizada", instancia, rep, {**params, "max_sem_melhora": 5},
+                             10 * i + rep))
+    return jobs
+
+
+def test_sem_arquivo_todos_pendentes(tmp_path):
+    jobs = grade()
+    assert filtrar_pendentes(jobs, str(tmp_path / "res.jsonl")) == jobs
+
+
+def test_retomar_roda_exatamente_o_que_falta(tmp_path):
+    caminho = str(tmp_path / "res.jsonl")
+    jobs = grade()
+    feitos, interrompido = jobs[:7], jobs[7]
+
+    # primeira rodada: 7 jobs gravados e o 8º cortado no meio da linha
+    with GravadorResultados(caminho) as gravador:
+        for job in feitos:
+            gravador.gravar(executar_job(job))
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write(json.dumps(executar_job(interrompido))[:40])
+
+    pendentes = filtrar_pendentes(jobs, caminho)
+    assert pendentes == jobs[7:]
+
+    # retomada: só os pendentes rodam, e cada chave acaba com exatamente uma linha
+    with GravadorResultados(caminho) as gravador:
+        for job in pendentes:
+            gravador.gravar(executar_job(job))
+    chaves = [chave_resultado(linha) for linha in ler_resultados(caminho)]
+    assert chaves == [chave_job(job) for job in jobs]
+    assert filtrar_pendentes(jobs, caminho) == []
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from busca_local.lote import _melhor_melhora_lote
+from busca_local.vizinhanca import avaliar_melhor_melhora
+
+from .estados import CASOS_LIMITE, SEMENTES
+
+np = pytest.importorskip("numpy")
+
+# réplicas de um mesmo (n, m) com tempos positivos, como no motor em lote
+LOTES_LIMITE = {
+    "uma_maquina": ([[0, 0, 0], [0, 0, 0]], [[4, 2, 7], [1, 1, 1]], 1),
+    "menos_tarefas_que_maquinas": ([[0, 2], [3, 3]], [[5, 3], [1, 2]], 4),
+    "empate_no_top3": ([CASOS_LIMITE["empate_no_top3"][0]], [CASOS_LIMITE["empate_no_top3"][1]], 4),
+    "empate_entre_vizinhos": ([CASOS_LIMITE["empate_entre_vizinhos"][0]], [CASOS_LIMITE["empate_entre_vizinhos"][1]], 3),
+    "duas_criticas_e_uma_so": ([[0, 1, 2], [0, 0, 2]], [[5, 5, 1], [5, 5, 1]], 3),
+    # réplica 0 só com tarefas de duração zero: a crítica (máquina 0) fica sem tarefas
+    "critica_sem_tarefas": ([[1, 1, 2], [0, 1, 1]], [[0, 0, 0], [3, 1, 1]], 3),
+    "duracao_zero": ([[0, 0, 1, 2], [2, 2, 0, 1]], [[0, 6, 0, 2], [0, 6, 0, 2]], 3),
+}
+
+
+def lote_aleatorio(semente):
+    """k réplicas de mesmo (n, m), cada uma com seus tempos e sua atribuição."""
+    rng = random.Random(semente)
+    k, n, m = rng.randint(1, 6), rng.randint(1, 14), rng.randint(1, 6)
+    pmax = rng.choice((1, 2, 3, 10, 100))
+    sol = [[rng.randrange(m) for _ in range(n)] for _ in range(k)]
+    tempos = [[rng.randint(1, pmax) for _ in range(n)] for _ in range(k)]
+    return sol, tempos, m
+
+
+@pytest.mark.parametrize("caso", [*LOTES_LIMITE, *SEMENTES], ids=str)
+def test_lote_igual_a_varredura_em_cada_replica(caso):
+    sol, tempos, m = LOTES_LIMITE[caso] if isinstance(caso, str) else lote_aleatorio(caso)
+    cargas = [[0] * m for _ in sol]
+    for r in range(len(sol)):
+        for tarefa, maq in enumerate(sol[r]):
+            cargas[r][maq] += tempos[r][tarefa]
+
+    tarefa, destino, valor, avaliados = _melhor_melhora_lote(
+        np.array(sol, dtype=np.int64), np.array(cargas, dtype=np.int64), np.array(tempos, dtype=np.int64), m)
+
+    assert len(valor) == len(sol)
+    for r in range(len(sol)):
+        esperado = avaliar_melhor_melhora(sol[r], cargas[r], tempos[r], m)
+        if esperado[0] is not None:
+            # movimento que melhora: mesmo desempate da varredura
+            assert (tarefa[r], sol[r][tarefa[r]], destino[r], valor[r]) == esperado
+        else:
+            assert valor[r] >= max(cargas[r])
+
+        # só as tarefas da (primeira) máquina crítica são avaliadas, em m - 1 destinos
+        critica = cargas[r].index(max(cargas[r]))
+        assert avaliados[r] == sol[r].count(critica) * (m - 1)
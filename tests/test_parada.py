@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from busca_local.blm import blm_melhor_melhora
+from busca_local.blnm import blnm_monotona_randomizada
+from busca_local.cargas import limite_inferior
+from busca_local.instrumentacao import Contadores
+from busca_local.parada import CriterioParada, contar_motivos, criterio_de_params
+
+# 11 tarefas de duração 1 em 3 máquinas: LB = 4, atingível
+TEMPOS_LB = [1] * 11
+TEMPOS = [random.Random(3).randint(1, 50) for _ in range(40)]
+
+
+@pytest.mark.parametrize("limite, alvo, esperado", [(10, None, 10), (None, 12, 12), (10, 12, 12), (10, 8, 10),
+                                                    (None, None, None)])
+def test_valor_parada_e_o_maior_entre_lb_e_alvo(limite, alvo, esperado):
+    assert CriterioParada(limite_inferior=limite, alvo=alvo).valor_parada == esperado
+
+
+def test_por_valor_prefere_o_limite_inferior():
+    parada = CriterioParada(limite_inferior=10, alvo=12)
+    assert parada.por_valor(13) is None
+    assert parada.por_valor(11) == "alvo"
+    assert parada.por_valor(10) == "limite_inferior"
+
+
+def test_criterio_de_params():
+    parada = criterio_de_params({"parar_no_limite": True, "alvo": 7, "tempo_cpu_maximo": 2}, [1] * 12, 3)
+    assert (parada.limite_inferior, parada.alvo, parada.tempo, parada.tempo_cpu) == (4, 7, None, 2)
+    assert criterio_de_params({}, [1] * 12, 3).valor_parada is None
+
+
+def blm(tempos, parada, max_sem_melhora=50, contadores=None):
+    return blm_melhor_melhora(tempos, 3, max_sem_melhora, rng=random.Random(1), parada=parada, contadores=contadores)
+
+
+def blnm(tempos, parada, max_sem_melhora=50, contadores=None):
+    return blnm_monotona_randomizada(tempos, 3, 0.5, max_sem_melhora, rng=random.Random(1), parada=parada,
+                                     contadores=contadores)
+
+
+@pytest.mark.parametrize("busca", [blm, blnm])
+def test_para_no_limite_inferior(busca):
+    parada = CriterioParada(limite_inferior=limite_inferior(TEMPOS_LB, 3))
+    best, it = busca(TEMPOS_LB, parada)[:2]
+    assert best == 4 and parada.motivo == "limite_inferior"
+    # sem o critério, as iterações sem melhora depois do LB também contam
+    assert it < busca(TEMPOS_LB, CriterioParada())[1]
+
+
+@pytest.mark.parametrize("busca", [blm, blnm])
+def test_para_no_alvo(busca):
+    # alvo folgado: a primeira melhora que chega nele encerra a busca
+    sem_alvo = CriterioParada()
+    best_livre, it_livre = busca(TEMPOS, sem_alvo)[:2]
+    alvo = best_livre + 20
+    parada = CriterioParada(alvo=alvo)
+    best, it = busca(TEMPOS, parada)[:2]
+    assert parada.motivo == "alvo" and best <= alvo and it < it_livre
+    assert sem_alvo.motivo == "sem_melhora"
+
+
+@pytest.mark.parametrize("busca", [blm, blnm])
+def test_para_sem_melhora_por_iteracoes(busca):
+    parada, contadores = CriterioParada(), Contadores()
+    it = busca(TEMPOS, parada, max_sem_melhora=7, contadores=contadores)[1]
+    # a última melhora e mais max_sem_melhora iterações sem melhora
+    assert parada.motivo == "sem_melhora" and it == contadores.iteracao_melhor + 7
+
+
+def test_blnm_para_no_orcamento_de_cpu():
+    # sem o orçamento, 10^9 iterações sem melhora não acabariam
+    parada = CriterioParada(tempo_cpu=0.05)
+    tempo = blnm(TEMPOS, parada, max_sem_melhora=10 ** 9)[2]
+    assert parada.motivo == "tempo_cpu" and tempo < 5
+
+
+def test_blnm_para_no_orcamento_de_relogio():
+    parada = CriterioParada(tempo=0.05)
+    tempo = blnm(TEMPOS, parada, max_sem_melhora=10 ** 9)[2]
+    assert parada.motivo == "tempo" and 0.05 <= tempo < 5
+
+
+def test_contar_motivos():
+    linhas = [{"motivo_parada": "alvo"}, {"motivo_parada": "sem_melhora"}, {}, {"motivo_parada": "tempo_cpu"},
+              {"motivo_parada": "alvo"}]
+    assert contar_motivos(linhas) == "sem_melhora: 2, alvo: 2, tempo_cpu: 1"
+    assert contar_motivos([]) == ""
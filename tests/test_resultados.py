@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from busca_local.resultados import GravadorResultados, ler_resultados
+
+LINHAS = [{"heuristica": "blm_melhor_melhora", "replicacao": r, "valor": 100 - r, "instancia": "ação"}
+          for r in range(5)]
+
+
+def gravar(caminho, linhas):
+    with GravadorResultados(str(caminho), fsync_a_cada=2) as gravador:
+        for linha in linhas:
+            gravador.gravar(linha)
+
+
+@pytest.mark.parametrize("parcial", ['{"heuristica": "blm', '{"valor": "' + "x" * 10000])
+def test_retomar_descarta_linha_incompleta(tmp_path, parcial):
+    # queda no meio da gravação: a última linha fica sem "\n" (inclusive maior que o bloco de 4096 bytes lido)
+    caminho = tmp_path / "res.jsonl"
+    gravar(caminho, LINHAS[:3])
+    completo = caminho.read_bytes()
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write(parcial)
+
+    assert list(ler_resultados(caminho)) == LINHAS[:3]
+
+    # ao reabrir, o arquivo volta ao fim da última linha completa e as novas não grudam na parcial
+    GravadorResultados(str(caminho)).fechar()
+    assert caminho.read_bytes() == completo
+    gravar(caminho, LINHAS[3:])
+    assert [json.loads(texto) for texto in caminho.read_text(encoding="utf-8").splitlines()] == LINHAS
+
+
+def test_arquivo_so_com_linha_incompleta(tmp_path):
+    caminho = tmp_path / "res.jsonl"
+    caminho.write_text('{"heuristica": "bl', encoding="utf-8")
+    gravar(caminho, LINHAS[:1])
+    assert list(ler_resultados(caminho)) == LINHAS[:1]
+
+
+def test_arquivo_completo_fica_intacto(tmp_path):
+    caminho = tmp_path / "res.jsonl"
+    gravar(caminho, LINHAS[:2])
+    gravar(caminho, LINHAS[2:])
+    assert list(ler_resultados(caminho)) == LINHAS
@@ -0,0 +1,134 @@
+import random
+
+import pytest
+
+from busca_local.cargas import IndiceCargas, TarefasPorMaquina, aplicar_movimento
+from busca_local.experimentos import executar_job
+from busca_local.heuristicas import Instancia
+from busca_local.vizinhanca import (
+    ORDENS,
+    PrimeiraMelhora,
+    avaliar_melhor_melhora,
+    avaliar_melhor_melhora_numpy,
+    avaliar_trocas_criticas,
+    avaliar_vizinhanca_critica,
+    preparar_vizinhanca,
+)
+
+from .estados import makespan_apos
+
+
+def melhor_troca_exaustiva(sol, cargas, tempos):
+    """Menor makespan entre todas as trocas de duas tarefas de máquinas diferentes (O(n^2))."""
+    melhor = max(cargas)
+    for tarefa in range(len(sol)):
+        for parceira in range(len(sol)):
+            if sol[tarefa] != sol[parceira]:
+                melhor = min(melhor, makespan_apos(cargas, tempos, tarefa, sol[tarefa], sol[parceira], parceira))
+    return melhor
+
+
+def test_numpy_igual_a_varredura(estado):
+    np = pytest.importorskip("numpy")
+    sol, cargas, tempos, m = estado
+    esperado = avaliar_melhor_melhora(sol, cargas, tempos, m)
+
+    assert avaliar_melhor_melhora_numpy(sol, cargas, tempos, m) == esperado
+    assert avaliar_melhor_melhora_numpy(sol, cargas, np.asarray(tempos), m, IndiceCargas(cargas)) == esperado
+
+
+def test_numpy_desempata_pela_primeira_tarefa_e_destino():
+    pytest.importorskip("numpy")
+    # cargas [6, 1, 0]: qualquer tarefa de duração 2 para a máquina 1 ou 2 dá makespan 4
+    sol, tempos, cargas = [0, 0, 0, 1], [2, 2, 2, 1], [6, 1, 0]
+    assert avaliar_melhor_melhora_numpy(sol, cargas, tempos, 3) == (0, 0, 1, 4)
+
+
+def test_critica_mesmo_makespan_da_varredura(estado):
+    sol, cargas, tempos, m = estado
+    esperado = avaliar_melhor_melhora(sol, cargas, tempos, m)
+    tarefa, origem, destino, valor = avaliar_vizinhanca_critica(sol, cargas, tempos, m)
+
+    # em empate o movimento pode ser outro, mas o makespan é o mesmo e o movimento é válido
+    assert valor == esperado[3]
+    assert (tarefa is None) == (esperado[0] is None)
+    if tarefa is not None:
+        assert origem == sol[tarefa] != destino
+        assert makespan_apos(cargas, tempos, tarefa, origem, destino) == valor
+
+
+def test_critica_ao_longo_da_descida(estado):
+    # índices mantidos a cada movimento, como no laço de busca, até o ótimo local
+    sol, cargas, tempos, m = estado
+    indice = IndiceCargas(cargas)
+    tarefas_maq = TarefasPorMaquina(sol, tempos, m)
+    while True:
+        esperado = avaliar_melhor_melhora(sol, cargas, tempos, m)
+        tarefa, origem, destino, valor = avaliar_vizinhanca_critica(sol, cargas, tempos, m, indice, tarefas_maq)
+        assert valor == esperado[3]
+        if tarefa is None:
+            assert esperado[0] is None
+            break
+        aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice, tarefas_maq)
+        assert tarefas_maq.listas == TarefasPorMaquina(sol, tempos, m).listas
+
+
+def test_trocas_mesmo_makespan_da_exaustiva(estado):
+    sol, cargas, tempos, m = estado
+    esperado = melhor_troca_exaustiva(sol, cargas, tempos)
+    tarefa, origem, destino, valor, parceira = avaliar_trocas_criticas(sol, cargas, tempos, m)
+
+    assert valor == esperado
+    assert (tarefa is None) == (esperado == max(cargas))
+    if tarefa is not None:
+        assert origem == sol[tarefa] and destino == sol[parceira] != origem
+        assert makespan_apos(cargas, tempos, tarefa, origem, destino, parceira) == valor
+
+
+def test_troca_quando_nenhum_movimento_melhora():
+    # cargas [7, 5]: mover qualquer tarefa não melhora; trocar uma diferença de 1 dá [6, 6]
+    sol, tempos, cargas = [0, 0, 1, 1], [4, 3, 3, 2], [7, 5]
+    assert avaliar_melhor_melhora(sol, cargas, tempos, 2)[0] is None
+    tarefa, origem, destino, valor, parceira = avaliar_trocas_criticas(sol, cargas, tempos, 2)
+    assert (origem, destino, valor) == (0, 1, 6) and tempos[tarefa] - tempos[parceira] == 1
+
+
+def test_mover_trocar_fica_com_o_melhor_dos_dois(estado):
+    sol, cargas, tempos, m = estado
+    mov = avaliar_melhor_melhora(sol, cargas, tempos, m)
+    troca = melhor_troca_exaustiva(sol, cargas, tempos)
+    avaliar, tempos_aval, _ = preparar_vizinhanca("mover+trocar", "python", sol, tempos, m)
+    tarefa, origem, destino, valor, parceira = avaliar(sol, cargas, tempos_aval, m, IndiceCargas(cargas))
+
+    assert valor == min(mov[3], troca)
+    if troca < mov[3]:
+        assert parceira is not None
+    else:
+        # empate fica com o movimento, que é o mesmo da varredura
+        assert (tarefa, origem, destino, parceira) == (*mov[:3], None)
+
+
+@pytest.mark.parametrize("ordem", ORDENS)
+def test_primeira_melhora_ao_longo_da_descida(estado, ordem):
+    # todo movimento devolvido melhora; None só no ótimo local que a varredura completa certifica
+    sol, cargas, tempos, m = estado
+    indice = IndiceCargas(cargas)
+    primeira = PrimeiraMelhora(len(sol), m, ordem, random.Random(len(sol) * m))
+    while True:
+        tarefa, origem, destino, valor = primeira(sol, cargas, tempos, m, indice)
+        if tarefa is None:
+            assert valor == max(cargas)
+            assert avaliar_melhor_melhora(sol, cargas, tempos, m)[0] is None
+            break
+        assert origem == sol[tarefa] != destino
+        assert makespan_apos(cargas, tempos, tarefa, origem, destino) == valor < max(cargas)
+        aplicar_movimento(sol, cargas, tempos, tarefa, origem, destino, indice)
+
+
+@pytest.mark.parametrize("ordem", ORDENS)
+@pytest.mark.parametrize("nome, params", [("blm_melhor_melhora", {}), ("blnm_monotona_randomizada", {"alpha": 0.3})])
+def test_primeira_melhora_no_rotulo(nome, params, ordem):
+    instancia = Instancia([4, 7, 2, 9, 5, 3, 8, 1], 3)
+    params = {**params, "max_sem_melhora": 20, "estrategia": "primeira", "ordem": ordem}
+    linha = executar_job((nome, instancia, 0, params, 1))
+    assert linha["heuristica"] == f"{nome}[primeira:{ordem}]"